@@ -58,23 +58,23 @@ class BaseAgent(ABC):
             )
             return response.text
         except Exception as e:
-            self.logger.error(f"Error generating text: {e}")
+            self.logger.error("Error generating text: %s", e)
             raise
     
     def log_info(self, message: str):
         """Log info message."""
-        self.logger.info(f"[{self.name}] {message}")
+        self.logger.info("[%s] %s", self.name, message)
     
     def log_error(self, message: str, error: Exception = None):
         """Log error message."""
         if error:
-            self.logger.error(f"[{self.name}] {message}: {error}")
+            self.logger.error("[%s] %s: %s", self.name, message, error)
         else:
-            self.logger.error(f"[{self.name}] {message}")
+            self.logger.error("[%s] %s", self.name, message)
     
     def log_debug(self, message: str):
         """Log debug message."""
-        self.logger.debug(f"[{self.name}] {message}")
+        self.logger.debug("[%s] %s", self.name, message)
 
 class AgentResult:
     """Standard result object for agent operations."""
@@ -2,11 +2,19 @@
 
 import json
 import time
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Union
+
+from pydantic import BaseModel
 
 from app.agents.base_agent import BaseAgent, AgentResult
 
 
+def _read(source: Any, key: str, default: Any = None) -> Any:
+    """Read a field from a request model or dict, treating None as missing."""
+    value = source.get(key) if isinstance(source, dict) else getattr(source, key, None)
+    return default if value is None else value
+
+
 class CheckRubricAgent(BaseAgent):
     """Agent responsible for rubric-based evaluation of a topic proposal."""
 
@@ -66,15 +74,16 @@ class CheckRubricAgent(BaseAgent):
             },
         ]
 
-    async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def process(self, input_data: Union[BaseModel, Dict[str, Any]]) -> Dict[str, Any]:
         """Evaluate a topic proposal against the rubric.
 
-        Expected input_data keys include:
+        input_data may be a RubricEvaluationRequest (read by attribute, no dict copy) or a dict.
+        Expected keys/fields include:
         - topic_request: {title, description, objectives, methodology, expected_outcomes, requirements, supervisor_id, semester_id, ...}
         - Optional fields such as context, problem_statement, main_actors, main_flows, customers_sponsors, approach_theory, applied_technology,
           main_deliverables, scope, size_of_product, packages_breakdown, complexity, applicability, feasibility, proposal_text
         """
-        started_at = time.time()
+        started_at = time.perf_counter()
         try:
             self.log_info("Starting rubric evaluation")
 
@@ -94,7 +103,7 @@ class CheckRubricAgent(BaseAgent):
 
             # Normalize and compute overall score using our canonical weights
             normalized = self._normalize_evaluation(parsed)
-            normalized["processing_time"] = round(time.time() - started_at, 3)
+            normalized["processing_time"] = round(time.perf_counter() - started_at, 3)
 
             return AgentResult(
                 success=True,
@@ -108,27 +117,27 @@ class CheckRubricAgent(BaseAgent):
         except Exception as e:
             self.log_error("Error in rubric evaluation", e)
             # Provide a minimal fallback so API remains resilient
-            fallback = self._fallback_result(input_data, processing_time=round(time.time() - started_at, 3))
+            fallback = self._fallback_result(input_data, processing_time=round(time.perf_counter() - started_at, 3))
             return AgentResult(success=True, data=fallback).to_dict()
 
-    def _build_prompt(self, input_data: Dict[str, Any]) -> str:
-        tr = input_data.get("topic_request", {}) or {}
+    def _build_prompt(self, input_data: Union[BaseModel, Dict[str, Any]]) -> str:
+        tr = _read(input_data, "topic_request", {})
         # Optional extended fields
-        context = input_data.get("context", "") or ""
-        problem = input_data.get("problem_statement", "") or ""
-        main_actors = input_data.get("main_actors", []) or []
-        main_flows = input_data.get("main_flows", "") or ""
-        customers_sponsors = input_data.get("customers_sponsors", "") or ""
-        approach_theory = input_data.get("approach_theory", "") or ""
-        applied_technology = input_data.get("applied_technology", "") or ""
-        deliverables = input_data.get("main_deliverables", "") or ""
-        scope = input_data.get("scope", "") or ""
-        size = input_data.get("size_of_product", "") or ""
-        packages = input_data.get("packages_breakdown", []) or []
-        complexity = input_data.get("complexity", "") or ""
-        applicability = input_data.get("applicability", "") or ""
-        feasibility = input_data.get("feasibility", "") or ""
-        proposal_text = input_data.get("proposal_text", "") or ""
+        context = _read(input_data, "context") or ""
+        problem = _read(input_data, "problem_statement") or ""
+        main_actors = _read(input_data, "main_actors") or []
+        main_flows = _read(input_data, "main_flows") or ""
+        customers_sponsors = _read(input_data, "customers_sponsors") or ""
+        approach_theory = _read(input_data, "approach_theory") or ""
+        applied_technology = _read(input_data, "applied_technology") or ""
+        deliverables = _read(input_data, "main_deliverables") or ""
+        scope = _read(input_data, "scope") or ""
+        size = _read(input_data, "size_of_product") or ""
+        packages = _read(input_data, "packages_breakdown") or []
+        complexity = _read(input_data, "complexity") or ""
+        applicability = _read(input_data, "applicability") or ""
+        feasibility = _read(input_data, "feasibility") or ""
+        proposal_text = _read(input_data, "proposal_text") or ""
 
         criteria_text = "\n".join(
             [f"- {c['id']}: {c['question']} (weight={c['weight']})" for c in self.criteria]
@@ -141,12 +150,12 @@ class CheckRubricAgent(BaseAgent):
 Bạn là giảng viên phản biện đồ án Capstone ngành KTPM. Hãy ĐÁNH GIÁ đề tài dựa trên RUBRIC 10 tiêu chí dưới đây. Trả về KẾT QUẢ DUY NHẤT ở dạng JSON HỢP LỆ.
 
 === DỮ LIỆU ĐỀ XUẤT ===
-Tiêu đề: {tr.get('title','')}
-Mô tả: {tr.get('description','')}
-Mục tiêu: {tr.get('objectives','')}
-Phương pháp: {tr.get('methodology','')}
-Kết quả mong đợi: {tr.get('expected_outcomes','')}
-Yêu cầu/Kỹ thuật: {tr.get('requirements','')}
+Tiêu đề: {_read(tr, 'title', '')}
+Mô tả: {_read(tr, 'description', '')}
+Mục tiêu: {_read(tr, 'objectives', '')}
+Phương pháp: {_read(tr, 'methodology', '')}
+Kết quả mong đợi: {_read(tr, 'expected_outcomes', '')}
+Yêu cầu/Kỹ thuật: {_read(tr, 'requirements', '')}
 
 Ngữ cảnh triển khai: {context}
 Vấn đề cần giải quyết: {problem}
@@ -276,7 +285,7 @@ MẪU JSON TRẢ VỀ:
             "next_steps": list(parsed.get("next_steps") or []),
         }
 
-    def _fallback_result(self, input_data: Dict[str, Any], processing_time: float) -> Dict[str, Any]:
+    def _fallback_result(self, input_data: Union[BaseModel, Dict[str, Any]], processing_time: float) -> Dict[str, Any]:
         # Minimal safe default with zero scores but still informative
         evaluated = [
             {
@@ -1,18 +1,26 @@
 """Agent 2: Duplicate Detection Agent - Checks for topic duplicates using ChromaDB and cosine similarity."""
 
-from typing import Dict, Any, List
+from typing import Callable, Dict, Any, List, Optional
 from app.agents.base_agent import BaseAgent, AgentResult
-from app.services.chroma_service import ChromaService
+from app.services.chroma_service import ChromaService, get_chroma_service
+from app.services.detection_batcher import detection_batcher
+from app.services.semantic_query_cache import semantic_query_cache
 from app.schemas.schemas import DuplicateCheckResult, DuplicationStatus, SimilaritySearchResult
 from config import config
+import asyncio
+import json
+import time
 
 class DuplicateDetectionAgent(BaseAgent):
     """Agent responsible for detecting duplicate topics using ChromaDB and cosine similarity."""
     
-    def __init__(self):
+    def __init__(self, chroma_service: Optional[ChromaService] = None):
         super().__init__("DuplicateDetectionAgent", "gemini-2.0-flash")
-        self.chroma_service = ChromaService()
+        self.chroma_service = chroma_service or get_chroma_service()
         self.similarity_threshold = config.SIMILARITY_THRESHOLD
+        # Near-identical resubmissions reuse earlier results; dropped on index writes
+        self.query_cache = semantic_query_cache
+        self.chroma_service.add_write_listener(self.query_cache.clear)
     
     async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process request to check for topic duplicates.
@@ -24,8 +32,7 @@ class DuplicateDetectionAgent(BaseAgent):
             Dict containing duplicate check results
         """
         try:
-            import time
-            started_at = time.time()
+            started_at = time.perf_counter()
             self.log_info("Starting duplicate detection process")
             
             # Extract input data
@@ -45,10 +52,34 @@ class DuplicateDetectionAgent(BaseAgent):
                 methodology=topic_methodology
             )
             
-            # Search for similar topics in ChromaDB
             where_filter = input_data.get("where")
+
+            # Reuse the result of a near-identical recent query with the same search scope
+            query_embedding = None
+            cache_bucket = None
+            if self.query_cache.enabled:
+                query_embedding = await asyncio.to_thread(self.chroma_service.get_embedding, full_content)
+                cache_bucket = (
+                    json.dumps(where_filter, sort_keys=True, default=str),
+                    semester_id, exclude_topic_id, threshold
+                )
+                cached_result = self.query_cache.lookup(query_embedding, cache_bucket)
+                if cached_result is not None:
+                    self.log_info("Duplicate check served from semantic query cache")
+                    cached_result["processing_time"] = round(time.perf_counter() - started_at, 3)
+                    return AgentResult(
+                        success=True,
+                        data=cached_result,
+                        metadata={
+                            "candidates_found": len(cached_result.get("similar_topics", [])),
+                            "threshold_used": threshold,
+                            "cache": "semantic"
+                        }
+                    ).to_dict()
+
+            # Search for similar topics in ChromaDB
             self.log_info(f"Searching for similar topics with where filter: {where_filter}")
-            similar_topics = self.chroma_service.search_similar_topics(
+            similar_topics = await self._search_similar_topics(
                 query_content=full_content,
                 n_results=3,
                 similarity_threshold=0.8,
@@ -98,11 +129,14 @@ class DuplicateDetectionAgent(BaseAgent):
             duplicate_result = await self._analyze_similarity_results(
                 similar_topics=similar_topics,
                 threshold=threshold,
-                original_content=full_content
+                original_content=full_content,
+                on_verdict=input_data.get("on_verdict")
             )
             # Ensure required processing_time is present
             if "processing_time" not in duplicate_result:
-                duplicate_result["processing_time"] = round(time.time() - started_at, 3)
+                duplicate_result["processing_time"] = round(time.perf_counter() - started_at, 3)
+            if query_embedding is not None:
+                self.query_cache.put(query_embedding, cache_bucket, duplicate_result)
             
             self.log_info(f"Duplicate check completed - Status: {duplicate_result.get('status')}")
             
@@ -122,6 +156,25 @@ class DuplicateDetectionAgent(BaseAgent):
                 error=str(e)
             ).to_dict()
     
+    async def _search_similar_topics(
+        self,
+        query_content: str,
+        n_results: int,
+        similarity_threshold: float,
+        where: Dict[str, Any] = None
+    ) -> List[Dict[str, Any]]:
+        """Search ChromaDB, coalescing with concurrent requests when the batcher is running."""
+        if self.chroma_service is detection_batcher.chroma_service and detection_batcher.is_running:
+            return await detection_batcher.submit(query_content, n_results, similarity_threshold, where)
+        # Chroma queries block, so keep them off the event loop
+        return await asyncio.to_thread(
+            self.chroma_service.search_similar_topics,
+            query_content=query_content,
+            n_results=n_results,
+            similarity_threshold=similarity_threshold,
+            where=where
+        )
+    
     def _combine_topic_content(
         self, 
         title: str, 
@@ -130,25 +183,21 @@ class DuplicateDetectionAgent(BaseAgent):
         methodology: str = ""
     ) -> str:
         """Combine topic content using a label-free concatenation to match Chroma indexing."""
-        content_parts: List[str] = []
-        if title:
-            content_parts.append(title)
-        if description:
-            content_parts.append(description)
-        if objectives:
-            content_parts.append(objectives)
-        if methodology:
-            content_parts.append(methodology)
-        return " ".join([part for part in content_parts if part])
+        return " ".join(filter(None, (title, description, objectives, methodology)))
     
     async def _analyze_similarity_results(
         self,
         similar_topics: List[Dict[str, Any]],
         threshold: float,
-        original_content: str
+        original_content: str,
+        on_verdict: Optional[Callable[[Dict[str, Any]], None]] = None
     ) -> Dict[str, Any]:
         """Analyze similarity results and determine duplication status.
         Returns a plain dict; the caller will enrich with processing_time and wrap as needed.
+
+        on_verdict, if given, is called with the status, top score and formatted similar
+        topics as soon as they are known, before the slower AI enhanced analysis (which
+        only adds message text and recommendations).
         """
         
         if not similar_topics:
@@ -194,19 +243,6 @@ class DuplicateDetectionAgent(BaseAgent):
                 status = DuplicationStatus.NO_DUPLICATE
                 message = f"Đề tài có tính độc đáo tốt. Độ tương tự cao nhất: {max_similarity:.2%}."
         
-        # Enhanced analysis using AI for contextual understanding
-        recommendations = []
-        if duplicate_candidates:
-            enhanced_analysis = await self._perform_enhanced_analysis(
-                original_content, duplicate_candidates
-            )
-            if enhanced_analysis:
-                message += f" {enhanced_analysis}"
-                # Extract recommendations from analysis
-                recommendations = await self._extract_recommendations_from_analysis(
-                    enhanced_analysis, duplicate_candidates
-                )
-        
         # Format similar topics for response (align keys with new Chroma metadata)
         formatted_similar_topics = []
         for topic in similar_topics[:5]:  # Top 5 most similar
@@ -239,6 +275,27 @@ class DuplicateDetectionAgent(BaseAgent):
                 "similarity_score": topic.get("similarity_score", 0.0)
             }
             formatted_similar_topics.append(formatted_topic)
+
+        if on_verdict is not None:
+            on_verdict({
+                "status": status,
+                "similarity_score": max_similarity,
+                "similar_topics": list(formatted_similar_topics),
+                "threshold": threshold
+            })
+        
+        # Enhanced analysis using AI for contextual understanding
+        recommendations = []
+        if duplicate_candidates:
+            enhanced_analysis = await self._perform_enhanced_analysis(
+                original_content, duplicate_candidates
+            )
+            if enhanced_analysis:
+                message += f" {enhanced_analysis}"
+                # Extract recommendations from analysis
+                recommendations = await self._extract_recommendations_from_analysis(
+                    enhanced_analysis, duplicate_candidates
+                )
         
         return {
             "status": status,
@@ -1,6 +1,8 @@
 """Main Agent - Orchestrates the 3 sub-agents for topic submission support."""
 
+import asyncio
 import time
+from itertools import islice
 from typing import Dict, Any, List, Optional
 from app.agents.base_agent import BaseAgent, AgentResult
 from app.agents.topic_suggestion_agent import TopicSuggestionAgent
@@ -14,6 +16,9 @@ from app.repositories.topic_repository import TopicRepository
 from app.models.database import get_db
 from sqlalchemy.orm import Session
 
+# Rows fetched from the database and embedded per ChromaDB batch when (re)building the index
+INDEX_CHUNK_SIZE = 500
+
 class MainAgent(BaseAgent):
     """Main orchestrating agent that coordinates all sub-agents for topic submission support."""
     
@@ -63,18 +68,30 @@ class MainAgent(BaseAgent):
                 "processing_time": 0.0
             }
             
-            # Step 1: Get trending suggestions if requested (must run before duplicate check)
+            # Steps 1-2 are independent: fetch suggestions and check duplicates concurrently
+            suggestions_task = (
+                asyncio.create_task(self._get_trending_suggestions(request))
+                if request.get_suggestions else None
+            )
+            duplicate_task = (
+                asyncio.create_task(self._check_duplicates(request.topic_request))
+                if request.check_duplicates else None
+            )
+            suggestions_result, duplicate_result = await asyncio.gather(
+                suggestions_task or asyncio.sleep(0),
+                duplicate_task or asyncio.sleep(0)
+            )
+
+            # Step 1: Record trending suggestions if requested
             if request.get_suggestions:
-                suggestions_result = await self._get_trending_suggestions(request)
                 if suggestions_result["success"]:
                     response_data["suggestions"] = suggestions_result["data"]
                     response_data["messages"].append("Đã tạo gợi ý đề tài dựa trên xu hướng nghiên cứu hiện tại")
                 else:
                     response_data["messages"].append(f"Lỗi khi tạo gợi ý: {suggestions_result.get('error', 'Unknown error')}")
             
-            # Step 2: Check for duplicates if requested
+            # Step 2: Analyze duplicate check if requested
             if request.check_duplicates:
-                duplicate_result = await self._check_duplicates(request.topic_request)
                 if duplicate_result["success"]:
                     response_data["duplicate_check"] = duplicate_result["data"]
                     
@@ -250,7 +267,7 @@ class MainAgent(BaseAgent):
             self.log_info("Modifying topic to reduce duplicates")
             
             modification_input = {
-                "original_topic": topic_request.dict(),
+                "original_topic": topic_request.model_dump(exclude_none=True),
                 "duplicate_results": duplicate_results,
                 "modification_preferences": {},
                 "preserve_core_idea": True
@@ -383,15 +400,16 @@ class MainAgent(BaseAgent):
             try:
                 repository = TopicRepository(db)
                 
-                # Get all topics with content
-                topics_data = repository.get_topics_with_content()
+                # Stream topics with content and index them chunk by chunk
+                topics_data = repository.iter_approved_topic_versions_with_content(INDEX_CHUNK_SIZE)
+                fetched_count = indexed_count = 0
+                while chunk := list(islice(topics_data, INDEX_CHUNK_SIZE)):
+                    fetched_count += len(chunk)
+                    indexed_count += await self.duplicate_agent.index_topics_batch(chunk)
                 
-                if not topics_data:
+                if not fetched_count:
                     return {"success": True, "message": "No topics to index", "count": 0}
                 
-                # Index topics in batch
-                indexed_count = await self.duplicate_agent.index_topics_batch(topics_data)
-                
                 self.log_info(f"Successfully indexed {indexed_count} topics")
                 
                 return {
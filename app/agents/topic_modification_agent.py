@@ -1,6 +1,8 @@
 """Agent 3: Topic Modification Agent - Suggests modifications when duplicates are found."""
 
 import json
+import re
+import time
 from typing import Dict, Any, List
 from app.agents.base_agent import BaseAgent, AgentResult
 from app.schemas.schemas import (
@@ -24,8 +26,7 @@ class TopicModificationAgent(BaseAgent):
             Dict containing modified topic and explanation
         """
         try:
-            import time
-            started_at = time.time()
+            started_at = time.perf_counter()
             self.log_info("Starting topic modification process")
             
             # Extract input data
@@ -64,7 +65,7 @@ class TopicModificationAgent(BaseAgent):
                 modifications_made=modified_topic.get("modifications_made", []),
                 rationale=modified_topic.get("rationale", ""),
                 similarity_improvement=similarity_improvement,
-                processing_time=round(time.time() - started_at, 3)
+                processing_time=round(time.perf_counter() - started_at, 3)
             )
             
             self.log_info("Topic modification completed successfully")
@@ -496,7 +497,6 @@ QUAN TRỌNG:
 
     def _generate_abbreviation(self, title: str) -> str:
         try:
-            import re
             words = re.findall(r"[A-Za-zÀ-Ỹà-ỹ0-9]+", title)
             letters = [w[0].upper() for w in words if w]
             abbr = "".join(letters)[:10]
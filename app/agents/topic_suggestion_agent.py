@@ -7,6 +7,7 @@ from app.agents.base_agent import BaseAgent, AgentResult
 from app.schemas.schemas import TopicSuggestion, TopicSuggestionsResponse, TrendingTopicData
 from app.models.database import SessionLocal, Semester
 import re
+import time
 
 class TopicSuggestionAgent(BaseAgent):
     """Agent responsible for suggesting topic ideas based on trending research areas."""
@@ -24,8 +25,7 @@ class TopicSuggestionAgent(BaseAgent):
             Dict containing topic suggestions and trending areas
         """
         try:
-            import time
-            started_at = time.time()
+            started_at = time.perf_counter()
             self.log_info("Starting topic suggestion generation")
             
             # Extract input parameters
@@ -53,7 +53,7 @@ class TopicSuggestionAgent(BaseAgent):
             )
             
             # Format response with required processing_time
-            processing_time = round(time.time() - started_at, 3)
+            processing_time = round(time.perf_counter() - started_at, 3)
             response = TopicSuggestionsResponse(
                 suggestions=suggestions,
                 trending_areas=[data.area for data in trending_data],
@@ -81,9 +81,8 @@ class TopicSuggestionAgent(BaseAgent):
         Only allows current semester or the immediate next semester.
         """
         try:
-            from datetime import datetime as dt
             db = SessionLocal()
-            now = dt.utcnow()
+            now = datetime.utcnow()
 
             # Determine current and next semester
             current = db.query(Semester).filter(
@@ -414,7 +413,6 @@ QUAN TRỌNG:
         """Fix common JSON formatting issues from AI responses."""
         try:
             # Remove any trailing commas before closing braces/brackets
-            import re
             json_text = re.sub(r',(\s*[}\]])', r'\1', json_text)
             
             # Fix missing commas between object properties
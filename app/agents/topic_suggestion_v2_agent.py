@@ -7,6 +7,7 @@ from app.agents.base_agent import BaseAgent, AgentResult
 from app.schemas.schemas import TopicSuggestionV2, TopicSuggestionsV2Response, TrendingTopicData
 from app.models.database import SessionLocal, Semester
 import re
+import time
 
 class TopicSuggestionV2Agent(BaseAgent):
     """Agent responsible for suggesting topic ideas with additional fields (eN_Title, abbreviation, vN_title, etc.)."""
@@ -24,8 +25,7 @@ class TopicSuggestionV2Agent(BaseAgent):
             Dict containing topic suggestions v2 and trending areas
         """
         try:
-            import time
-            started_at = time.time()
+            started_at = time.perf_counter()
             self.log_info("Starting topic suggestion v2 generation")
             
             # Extract input parameters
@@ -53,7 +53,7 @@ class TopicSuggestionV2Agent(BaseAgent):
             )
             
             # Format response with required processing_time
-            processing_time = round(time.time() - started_at, 3)
+            processing_time = round(time.perf_counter() - started_at, 3)
             response = TopicSuggestionsV2Response(
                 suggestions=suggestions,
                 trending_areas=[data.area for data in trending_data],
@@ -81,9 +81,8 @@ class TopicSuggestionV2Agent(BaseAgent):
         Only allows current semester or the immediate next semester.
         """
         try:
-            from datetime import datetime as dt
             db = SessionLocal()
-            now = dt.utcnow()
+            now = datetime.utcnow()
 
             # Determine current and next semester
             current = db.query(Semester).filter(
@@ -366,7 +365,6 @@ Bạn PHẢI trả về CHÍNH XÁC format JSON này với TẤT CẢ các field
     async def _parse_ai_suggestions_v2(self, response_text: str, team_size: int) -> List[TopicSuggestionV2]:
         """Parse AI response to extract topic suggestions v2 - SIMPLIFIED ROOT FIX."""
         try:
-            import re
             import json
             
             # Step 1: Clean and extract JSON
@@ -474,7 +472,6 @@ Bạn PHẢI trả về CHÍNH XÁC format JSON này với TẤT CẢ các field
     def _aggressive_json_fix(self, json_text: str) -> str:
         """Apply aggressive JSON fixes."""
         try:
-            import re
             import json
             
             # Clean control characters
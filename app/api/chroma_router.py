@@ -3,8 +3,12 @@
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
-from app.services.chroma_service import ChromaService
+from app.services.chroma_service import get_chroma_service
 from app.services.topic_service import TopicService
+from app.models.database import get_db, Submission, Topic, TopicVersion
+from sqlalchemy.orm import Session
+from sqlalchemy import and_
+import time
 
 router = APIRouter(
     prefix="/api/v1/chroma",
@@ -15,7 +19,7 @@ router = APIRouter(
     }
 )
 
-chroma = ChromaService()
+chroma = get_chroma_service()
 topic_service = TopicService()
 
 
@@ -171,14 +175,9 @@ async def index_approved_topics_from_db(
 ):
     """Index documents based on approved Submissions (Status = 7)."""
     try:
-        import time
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         # Open DB and build payload based on approved submissions
-        from app.models.database import get_db, Submission, Topic, TopicVersion
-        from sqlalchemy.orm import Session
-        from sqlalchemy import and_
-        
         db_gen = get_db()
         db: Session = next(db_gen)
         try:
@@ -302,7 +301,7 @@ async def index_approved_topics_from_db(
                 }
             
             indexed_count = chroma.add_topics_batch(topics_to_index)
-            processing_time = time.time() - start_time
+            processing_time = time.perf_counter() - start_time
             return {
                 "message": "Successfully indexed approved submissions",
                 "indexed_count": indexed_count,
@@ -338,10 +337,6 @@ def index_single_submission(
     submission_id: int = Query(..., description="Submission ID to index")
 ):
     try:
-        from app.models.database import get_db, Submission, Topic, TopicVersion
-        from sqlalchemy.orm import Session
-        from sqlalchemy import and_
-
         db_gen = get_db()
         db: Session = next(db_gen)
         try:
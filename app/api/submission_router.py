@@ -49,7 +49,7 @@ def _check_gate(rubric: RubricEvaluationResponse, gate) -> (bool, List[BlockingC
 @router.post("/submit", response_model=SubmissionSubmitResponse, summary="Gate submit by rubric")
 async def submit_with_rubric(req: SubmissionSubmitRequest) -> SubmissionSubmitResponse:
     try:
-        result = await rubric_agent.process(req.rubric_request.dict())
+        result = await rubric_agent.process(req.rubric_request)
         if not result.get("success"):
             raise HTTPException(status_code=400, detail=result.get("error", "Rubric evaluation failed"))
         data = RubricEvaluationResponse(**result.get("data", {}))
@@ -88,7 +88,7 @@ async def submit_with_rubric(req: SubmissionSubmitRequest) -> SubmissionSubmitRe
 @router.post("/resubmit", response_model=SubmissionResubmitResponse, summary="Gate resubmit by rubric improvement")
 async def resubmit_with_rubric(req: SubmissionResubmitRequest) -> SubmissionResubmitResponse:
     try:
-        result = await rubric_agent.process(req.rubric_request.dict())
+        result = await rubric_agent.process(req.rubric_request)
         if not result.get("success"):
             raise HTTPException(status_code=400, detail=result.get("error", "Rubric evaluation failed"))
         data = RubricEvaluationResponse(**result.get("data", {}))
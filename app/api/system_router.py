@@ -1,13 +1,15 @@
 """System Management API endpoints."""
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from typing import Dict, Any
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Response
+from typing import Dict, Any, Optional
 from app.schemas.schemas import ErrorResponse
 from app.services.topic_service import TopicService
+from app.services import task_queue
+from config import config
+import asyncio
 import logging
+import orjson
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Create router with detailed metadata
@@ -23,6 +25,47 @@ router = APIRouter(
 # Initialize service
 topic_service = TopicService()
 
+# Constant health payload, encoded once
+_HEALTH_BYTES = orjson.dumps({
+    "status": "healthy",
+    "message": "AI Agent system is running",
+    "version": "2.0.0"
+})
+
+# Latest system stats, refreshed in the background so the endpoint never blocks
+_stats_snapshot: Dict[str, Any] = {}
+_stats_task: Optional[asyncio.Task] = None
+
+
+async def _refresh_stats_snapshot() -> None:
+    """Periodically recompute system stats off the event loop."""
+    global _stats_snapshot
+    while True:
+        try:
+            _stats_snapshot = await asyncio.to_thread(topic_service.get_system_stats)
+        except Exception as e:
+            logger.error("Error refreshing system stats: %s", e)
+        await asyncio.sleep(config.STATS_REFRESH_INTERVAL)
+
+
+def start_stats_refresher() -> None:
+    """Start the background stats refresher (called on app startup)."""
+    global _stats_task
+    if _stats_task is None or _stats_task.done():
+        _stats_task = asyncio.create_task(_refresh_stats_snapshot())
+
+
+async def stop_stats_refresher() -> None:
+    """Stop the background stats refresher (called on app shutdown)."""
+    global _stats_task
+    if _stats_task is not None:
+        _stats_task.cancel()
+        try:
+            await _stats_task
+        except asyncio.CancelledError:
+            pass
+        _stats_task = None
+
 @router.post(
     "/system/initialize",
     summary=" Initialize AI System",
@@ -50,7 +93,15 @@ async def initialize_system(background_tasks: BackgroundTasks) -> Dict[str, str]
     try:
         logger.info("Initializing AI system")
         
-        # Run initialization in background
+        # Prefer the persistent worker queue; fall back to in-process background task
+        job_id = await task_queue.enqueue_initialize_system()
+        if job_id:
+            return {
+                "message": "System initialization queued",
+                "status": "queued",
+                "job_id": job_id
+            }
+
         background_tasks.add_task(topic_service.initialize_system)
         
         return {
@@ -59,7 +110,7 @@ async def initialize_system(background_tasks: BackgroundTasks) -> Dict[str, str]
         }
         
     except Exception as e:
-        logger.error(f"Error initializing system: {e}")
+        logger.error("Error initializing system: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get(
@@ -113,11 +164,13 @@ async def initialize_system(background_tasks: BackgroundTasks) -> Dict[str, str]
 async def get_system_stats() -> Dict[str, Any]:
     """Get system statistics and health information."""
     try:
-        stats = topic_service.get_system_stats()
-        return stats
+        if not _stats_snapshot:
+            # Refresher has not completed a pass yet
+            return await asyncio.to_thread(topic_service.get_system_stats)
+        return _stats_snapshot
         
     except Exception as e:
-        logger.error(f"Error getting system stats: {e}")
+        logger.error("Error getting system stats: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get(
@@ -171,10 +224,6 @@ async def get_system_stats() -> Dict[str, Any]:
         }
     }
 )
-async def health_check() -> Dict[str, str]:
+async def health_check() -> Response:
     """Health check endpoint."""
-    return {
-        "status": "healthy",
-        "message": "AI Agent system is running",
-        "version": "2.0.0"
-    }
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
@@ -1,29 +1,47 @@
 """Topic Management API endpoints."""
 
-from fastapi import APIRouter, HTTPException, Query, BackgroundTasks, UploadFile, File, Form
-from typing import List, Optional, Dict, Any, Union
+from fastapi import APIRouter, HTTPException, Query, BackgroundTasks, UploadFile, File, Form, Request, Response
+from fastapi.responses import ORJSONResponse
+from typing import List, Optional, Dict, Any, Union, BinaryIO, NamedTuple, Annotated
 from app.schemas.schemas import (
     TopicRequest, TopicResponse, TopicVersionRequest, TopicVersionResponse,
     DuplicateCheckResult, TopicSuggestionsResponse, TopicSuggestionsV2Response, TopicModificationResponse,
-    AgentProcessResponse, ErrorResponse
+    AgentProcessResponse, ErrorResponse, DuplicationStatus, TopicPageResponse, TopicBulkCreateResponse
 )
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Discriminator, Field, Tag
+from cachetools import TTLCache
 from app.services.topic_service import TopicService
 from app.agents.duplicate_detection_agent import DuplicateDetectionAgent
 from app.agents.topic_modification_agent import TopicModificationAgent
 from app.agents.check_rubric_agent import CheckRubricAgent
 from app.agents.topic_suggestion_v2_agent import TopicSuggestionV2Agent
 from app.schemas.schemas import RubricEvaluationRequest, RubricEvaluationResponse
+from app.services import duplicate_cache, semester_cache
+from config import config
+from datetime import date
+from functools import lru_cache
+from itertools import chain
+import asyncio
+import hashlib
 import logging
+import tempfile
+import time
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+try:
+    from docx import Document
+    _DOCX_AVAILABLE = True
+except Exception:
+    Document = None
+    _DOCX_AVAILABLE = False
+
+# Logging is configured once in main.py
 logger = logging.getLogger(__name__)
 
 # Create router with detailed metadata
 router = APIRouter(
     prefix="/api/v1/topics",
     tags=[" Topic Management"],
+    default_response_class=ORJSONResponse,
     responses={
         404: {"description": "Topic not found", "model": ErrorResponse},
         400: {"description": "Bad request", "model": ErrorResponse},
@@ -31,14 +49,79 @@ router = APIRouter(
     }
 )
 
-# Initialize service
-topic_service = TopicService()
-duplicate_agent = DuplicateDetectionAgent()
-modification_agent = TopicModificationAgent()
-rubric_agent = CheckRubricAgent()
-suggestion_v2_agent = TopicSuggestionV2Agent()
+# Services and agents are created on first use so unused ones cost nothing at import
+@lru_cache(maxsize=1)
+def get_topic_service() -> TopicService:
+    return TopicService()
+
+
+@lru_cache(maxsize=1)
+def get_duplicate_agent() -> DuplicateDetectionAgent:
+    agent = DuplicateDetectionAgent()
+    # Cached duplicate-check responses are dropped whenever the index changes
+    agent.chroma_service.add_write_listener(duplicate_cache.clear)
+    return agent
+
+
+@lru_cache(maxsize=1)
+def get_modification_agent() -> TopicModificationAgent:
+    return TopicModificationAgent()
+
+
+@lru_cache(maxsize=1)
+def get_rubric_agent() -> CheckRubricAgent:
+    return CheckRubricAgent()
+
+
+@lru_cache(maxsize=1)
+def get_suggestion_v2_agent() -> TopicSuggestionV2Agent:
+    return TopicSuggestionV2Agent()
+
+# Statuses that trigger a modification proposal (enum members and their raw values)
+_DUP_STATUSES = frozenset({
+    DuplicationStatus.DUPLICATE_FOUND,
+    DuplicationStatus.POTENTIAL_DUPLICATE,
+    DuplicationStatus.DUPLICATE_FOUND.value,
+    DuplicationStatus.POTENTIAL_DUPLICATE.value,
+})
+
+# Combined topic text shorter than this skips duplicate detection
+_MIN_DUPLICATE_CHECK_CHARS = 20
+def _set_processing_time(data: Dict[str, Any], started: float) -> None:
+    """Fill processing_time (seconds since the perf_counter start) unless the agent set it."""
+    if "processing_time" not in data:
+        data["processing_time"] = round(time.perf_counter() - started, 3)
+
+
+# Suggestions depend only on query params and slow-moving trend data
+_SUGGESTIONS_CACHE_CONTROL = "public, max-age=3600"
+
+
+def _suggestions_etag(*params: Any) -> str:
+    """Strong ETag over the query params plus a daily bucket."""
+    raw = "|".join(
+        ",".join(map(str, p)) if isinstance(p, list) else str(p)
+        for p in (*params, date.today().isoformat())
+    )
+    return f'"{hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match lists etag (or '*')."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": _SUGGESTIONS_CACHE_CONTROL})
+
 
 class DuplicateAdvancedRequest(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore", str_strip_whitespace=True)
+
     eN_Title: Optional[str] = Field(None, description="English title")
     title: Optional[str] = Field(None, description="Alias for English title")
     abbreviation: Optional[str] = None
@@ -54,6 +137,84 @@ class DuplicateAdvancedRequest(BaseModel):
     fileId: Optional[int] = None
 
 
+# Required TopicRequest fields besides title, by alias and field name
+_TOPIC_REQUEST_KEYS = (("supervisorId", "supervisor_id"), ("semesterId", "semester_id"))
+
+
+def _duplicate_request_kind(payload: Any) -> str:
+    """Pick the request model without trial-validating both union members.
+
+    Only a payload carrying every required TopicRequest field is a TopicRequest;
+    anything else is a DuplicateAdvancedRequest (all of its fields are optional).
+    """
+    if isinstance(payload, TopicRequest):
+        return "topic"
+    if isinstance(payload, dict) and "title" in payload and all(
+        any(key in payload for key in keys) for keys in _TOPIC_REQUEST_KEYS
+    ):
+        return "topic"
+    return "advanced"
+
+
+DuplicateCheckRequest = Annotated[
+    Union[
+        Annotated[DuplicateAdvancedRequest, Tag("advanced")],
+        Annotated[TopicRequest, Tag("topic")],
+    ],
+    Discriminator(_duplicate_request_kind),
+]
+
+
+class _TopicFields(NamedTuple):
+    """Duplicate-check fields common to both accepted request shapes."""
+    en_title: str
+    vn_title: str
+    problem: str
+    context: str
+    content: str
+    description: str
+    objectives: str
+    semester_id: Optional[int]
+    category_id: Optional[int]
+
+
+def _unpack(req: Union[DuplicateAdvancedRequest, TopicRequest]) -> _TopicFields:
+    """Read the duplicate-check fields from a DuplicateAdvancedRequest or TopicRequest."""
+    if isinstance(req, DuplicateAdvancedRequest):
+        return _TopicFields(
+            req.eN_Title or req.title or "",
+            req.vN_title or "",
+            req.problem or "",
+            req.context or "",
+            req.content or "",
+            req.description or "",
+            req.objectives or "",
+            req.semesterId,
+            req.categoryId,
+        )
+    return _TopicFields(
+        req.title or "",
+        "",
+        "",
+        "",
+        "",
+        req.description or "",
+        req.objectives or "",
+        getattr(req, 'semester_id', None),
+        getattr(req, 'category_id', None),
+    )
+
+
+def _modification_input(original_topic: Dict[str, Any], duplicate_results: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the modification agent input for a normalized topic."""
+    return {
+        "original_topic": original_topic,
+        "duplicate_results": duplicate_results,
+        "modification_preferences": {},
+        "preserve_core_idea": True,
+    }
+
+
 @router.post(
     "/check-duplicate-advanced",
     summary=" Check duplicate and auto-suggest modifications",
@@ -63,123 +224,74 @@ class DuplicateAdvancedRequest(BaseModel):
     """,
 )
 async def check_duplicate_advanced(
-    req: Union[DuplicateAdvancedRequest, TopicRequest],
+    req: DuplicateCheckRequest,
     threshold: float = Query(0.8, ge=0.0, le=1.0, description="Similarity threshold to consider duplicate"),
     semester_id: Optional[int] = Query(None, description="Optional semester filter for duplicate search"),
     last_n_semesters: int = Query(3, ge=3, le=10, description="Number of recent semesters to search")
 ):
     try:
-        import time
-        t0 = time.time()
+        t0 = time.perf_counter()
        
-        if isinstance(req, DuplicateAdvancedRequest):
-            en_title = (req.eN_Title or req.title or "")
-            vn_title = req.vN_title or ""
-            problem = req.problem or ""
-            context_val = req.context or ""
-            content_section = req.content or ""
-            description = req.description or ""
-            objectives = req.objectives or ""
-            body_semester_id = req.semesterId
-            category_id = req.categoryId
-        else:
-            
-            en_title = req.title or ""
-            vn_title = ""
-            problem = ""
-            context_val = ""
-            content_section = ""
-            description = (req.description or "")
-            objectives = (req.objectives or "")
-            body_semester_id = getattr(req, 'semester_id', None)
-            category_id = getattr(req, 'category_id', None)
+        (
+            en_title, vn_title, problem, context_val, content_section,
+            description, objectives, body_semester_id, category_id
+        ) = _unpack(req)
 
         # Build combined content exactly like indexing logic (same field order)
-        combined_description = " ".join([
-            part for part in [
-                en_title,
-                vn_title,
-                problem,
-                context_val,
-                content_section,
-                description,
-                objectives,
-            ] if part
-        ])
-        # Determine semesters to search (current or provided + last_n_semesters)
-        from app.models.database import get_db, Semester
-        from sqlalchemy.orm import Session
-        from sqlalchemy import desc, and_
-        from datetime import datetime
-        db_gen = get_db()
-        db: Session = next(db_gen)
-        try:
+        combined_description = " ".join(filter(None, (
+            en_title,
+            vn_title,
+            problem,
+            context_val,
+            content_section,
+            description,
+            objectives,
+        )))
+
+        # Too little text to embed meaningfully -> report no duplicate without any I/O
+        if len(combined_description) < _MIN_DUPLICATE_CHECK_CHARS:
+            return {
+                "duplicate_check": {
+                    "status": DuplicationStatus.NO_DUPLICATE.value,
+                    "similarity_score": 0.0,
+                    "similar_topics": [],
+                    "threshold": threshold,
+                    "message": "Nội dung đề tài quá ngắn để kiểm tra trùng lặp.",
+                    "recommendations": [],
+                    "processing_time": round(time.perf_counter() - t0, 3)
+                }
+            }
+
+        supervisor_id = getattr(req, 'supervisor_id', None) or getattr(req, 'supervisorId', None) or 1
+        max_students = getattr(req, 'max_students', 1)
+
+        # Same content + search parameters within the TTL -> reuse previous response
+        cache_key = duplicate_cache.make_key((
+            en_title, vn_title, problem, context_val, content_section, description, objectives,
+            semester_id, body_semester_id, last_n_semesters, threshold,
+            category_id, supervisor_id, max_students,
+        ))
+        cached_response = duplicate_cache.lookup(cache_key)
+        if cached_response is not None:
+            return cached_response
+
+        async def _detect_and_propose() -> Dict[str, Any]:
+            # Determine semesters to search (current or provided + last_n_semesters)
             # Prefer explicit query param; fallback to body.semesterId; else detect current
             base_semester_id = semester_id if semester_id is not None else body_semester_id
-            semester_ids: List[int] = []
-
-            # Resolve base semester by id or current date
-            base_semester = None
-            if base_semester_id is not None:
-                base_semester = db.query(Semester).filter(Semester.Id == base_semester_id).first()
-            if base_semester is None:
-                now = datetime.utcnow()
-                base_semester = db.query(Semester).filter(
-                    and_(Semester.StartDate <= now, Semester.EndDate >= now)
-                ).first()
-
-            if base_semester is not None:
-                semesters = (
-                    db.query(Semester)
-                    .filter(Semester.StartDate <= base_semester.StartDate)
-                    .order_by(desc(Semester.StartDate))
-                    .limit(last_n_semesters)
-                    .all()
-                )
-                semester_ids = [s.Id for s in semesters]
-            else:
-                # Fallback: latest N by StartDate up to now
-                now = datetime.utcnow()
-                semesters = (
-                    db.query(Semester)
-                    .filter(Semester.StartDate <= now)
-                    .order_by(desc(Semester.StartDate))
-                    .limit(last_n_semesters)
-                    .all()
-                )
-                semester_ids = [s.Id for s in semesters]
-        finally:
-            db.close()
-
-        where = {"semesterId": {"$in": semester_ids}} if semester_ids else None
-        detection_input = {
-            # Use title for better matching and pass combined content in description
-            "topic_title": (en_title or vn_title or ""),
-            "topic_description": combined_description,
-            "topic_objectives": "",
-            "topic_methodology": "",
-            "semester_id": base_semester_id,
-            "threshold": threshold,
-            "where": where,
-        }
-        detection_result = await duplicate_agent.process(detection_input)
-
-        if not detection_result.get("success"):
-            raise HTTPException(500, detail=detection_result.get("error", "Duplicate detection failed"))
-
-        dup_data = detection_result.get("data", {})
-        if "processing_time" not in dup_data:
-            dup_data["processing_time"] = round(time.time() - t0, 3)
-        status = dup_data.get("status")
-        # Normalize to lowercase string to handle Enum/string cases uniformly
-        status = str(getattr(status, "value", status)).lower() if status is not None else ""
-
-        response: Dict[str, Any] = {
-            "duplicate_check": dup_data
-        }
-
-        # If duplicate or potential duplicate -> propose modifications
-        if status in ("duplicate_found", "potential_duplicate"):
+            semester_ids = await semester_cache.get_semester_ids(base_semester_id, last_n_semesters)
+
+            where = {"semesterId": {"$in": semester_ids}} if semester_ids else None
+            detection_input = {
+                # Use title for better matching and pass combined content in description
+                "topic_title": (en_title or vn_title or ""),
+                "topic_description": combined_description,
+                "topic_objectives": "",
+                "topic_methodology": "",
+                "semester_id": base_semester_id,
+                "threshold": threshold,
+                "where": where,
+            }
             # Normalize the original topic to new schema format
             normalized_original_topic = {
                 "title": en_title,
@@ -188,30 +300,69 @@ async def check_duplicate_advanced(
                 "problem": problem,
                 "context": context_val,
                 "content": content_section,
-                "supervisor_id": getattr(req, 'supervisor_id', None) or getattr(req, 'supervisorId', None) or 1,
+                "supervisor_id": supervisor_id,
                 "semester_id": body_semester_id or 1,
                 "category_id": category_id or 0,
-                "max_students": getattr(req, 'max_students', 1)
-            }
-            
-            modification_input = {
-                "original_topic": normalized_original_topic,
-                "duplicate_results": dup_data,
-                "modification_preferences": {},
-                "preserve_core_idea": True,
+                "max_students": max_students
             }
-            modification_result = await modification_agent.process(modification_input)
-            if modification_result.get("success"):
-                response["modification_proposal"] = modification_result.get("data")
-            else:
-                response["modification_error"] = modification_result.get("error", "Modification failed")
 
-        return response
+            # Optionally start the modification as soon as detection knows the verdict, so it
+            # runs alongside the AI enhanced analysis; it sees the same status, score and
+            # similar topics as the final result (the analysis only adds message text)
+            modification_task: Optional[asyncio.Task] = None
+
+            def _start_modification(verdict: Dict[str, Any]) -> None:
+                nonlocal modification_task
+                if verdict.get("status") in _DUP_STATUSES:
+                    modification_task = asyncio.create_task(get_modification_agent().process(
+                        _modification_input(normalized_original_topic, verdict)
+                    ))
+
+            if config.SPECULATIVE_MODIFICATION:
+                detection_input["on_verdict"] = _start_modification
+
+            try:
+                detection_result = await get_duplicate_agent().process(detection_input)
+
+                if not detection_result.get("success"):
+                    raise HTTPException(500, detail=detection_result.get("error", "Duplicate detection failed"))
+
+                dup_data = detection_result.get("data", {})
+                _set_processing_time(dup_data, t0)
+                status = dup_data.get("status")
+
+                response: Dict[str, Any] = {
+                    "duplicate_check": dup_data
+                }
+
+                # If duplicate or potential duplicate -> propose modifications
+                if status in _DUP_STATUSES:
+                    if modification_task is not None:
+                        modification_result = await modification_task
+                    else:
+                        modification_result = await get_modification_agent().process(
+                            _modification_input(normalized_original_topic, dup_data)
+                        )
+                    if modification_result.get("success"):
+                        response["modification_proposal"] = modification_result.get("data")
+                    else:
+                        response["modification_error"] = modification_result.get("error", "Modification failed")
+            finally:
+                if modification_task is not None and not modification_task.done():
+                    modification_task.cancel()
+
+            if "modification_error" not in response:
+                duplicate_cache.store(cache_key, response)
+
+            return response
+
+        # Identical checks already in flight share one detection run
+        return await duplicate_cache.coalesce(cache_key, _detect_and_propose)
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error in check_duplicate_advanced: {e}")
+        logger.error("Error in check_duplicate_advanced: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -221,26 +372,93 @@ async def check_duplicate_advanced(
     summary=" Đánh giá đề tài theo rubric 10 tiêu chí",
     description="Đánh giá đề tài theo các tiêu chí: tiêu đề, ngữ cảnh, vấn đề, người dùng, luồng/chức năng, khách hàng/tài trợ, hướng tiếp cận & công nghệ & deliverables, phạm vi & packages & khả thi 14 tuần, độ phức tạp kỹ thuật, tính ứng dụng & khả thi công nghệ.",
 )
-async def check_rubric(req: RubricEvaluationRequest) -> RubricEvaluationResponse:
+async def check_rubric(req: RubricEvaluationRequest) -> Dict[str, Any]:
     try:
-        import time
-        t0 = time.time()
-        result = await rubric_agent.process(req.dict())
+        t0 = time.perf_counter()
+        result = await get_rubric_agent().process(req)
         if not result.get("success"):
             raise HTTPException(status_code=400, detail=result.get("error", "Rubric evaluation failed"))
 
         data = result.get("data", {})
-        # Ensure processing_time exists
-        if "processing_time" not in data:
-            data["processing_time"] = round(time.time() - t0, 3)
-        return RubricEvaluationResponse(**data)
+        _set_processing_time(data, t0)
+        # FastAPI validates the dict against response_model; building the model here would validate twice
+        return data
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error in check_rubric: {e}")
+        logger.error("Error in check_rubric: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+_UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+_UPLOAD_SPOOL_MAX_SIZE = 8 << 20  # keep uploads up to 8 MiB in memory
+_UPLOAD_MAX_SIZE = 25 << 20  # reject larger uploads with 413
+
+# Rubric results for uploaded files, keyed by SHA-256 of the file plus the form fields
+_rubric_file_cache: TTLCache = TTLCache(
+    maxsize=config.RUBRIC_FILE_CACHE_MAXSIZE, ttl=config.RUBRIC_FILE_CACHE_TTL
+)
+
+
+_W_NS = {"w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"}
+
+try:
+    from lxml import etree
+    # Compiled once; evaluated directly on the document XML
+    _XP_PARAGRAPHS = etree.XPath("./w:p", namespaces=_W_NS)
+    _XP_TABLE_ROWS = etree.XPath("./w:tbl/w:tr", namespaces=_W_NS)
+    _XP_ROW_CELLS = etree.XPath("./w:tc", namespaces=_W_NS)
+    _XP_TEXT = etree.XPath(".//w:t/text()", namespaces=_W_NS)
+except Exception:
+    etree = None  # Optional; python-docx traversal is used instead
+
+
+def _extract_docx_text(stream: BinaryIO) -> str:
+    """Extract paragraph and table text from a .docx stream (CPU-bound; run in a thread).
+
+    Raises:
+        ValueError: If the stream is not a valid .docx document
+    """
+    try:
+        document = Document(stream)
+    except Exception as ex:
+        raise ValueError(f"Failed to parse .docx: {ex}")
+
+    try:
+        return _extract_docx_text_xpath(document.element.body)
+    except Exception as ex:
+        logger.warning("XPath .docx extraction failed, using python-docx traversal: %s", ex)
+        return _extract_docx_text_python(document)
+
+
+def _extract_docx_text_xpath(body) -> str:
+    """Extract text by evaluating XPath directly on the document body XML."""
+    if etree is None:
+        raise RuntimeError("lxml is not available")
+    # Body paragraphs first, then tables one row per line (same layout as the python-docx path)
+    paragraphs = ("".join(_XP_TEXT(p)).strip() for p in _XP_PARAGRAPHS(body))
+    table_rows = (
+        " | ".join(filter(None, (
+            "\n".join("".join(_XP_TEXT(cp)) for cp in _XP_PARAGRAPHS(tc)).strip()
+            for tc in _XP_ROW_CELLS(tr)
+        )))
+        for tr in _XP_TABLE_ROWS(body)
+    )
+    return "\n".join(filter(None, chain(paragraphs, table_rows)))
+
+
+def _extract_docx_text_python(document) -> str:
+    """Extract text through the python-docx object model (fallback)."""
+    # Paragraphs first, then tables appended linearly (one row per line)
+    paragraphs = ((p.text or "").strip() for p in document.paragraphs)
+    table_rows = (
+        " | ".join(filter(None, (cell.text.strip() for cell in row.cells if cell and cell.text)))
+        for tbl in (getattr(document, "tables", None) or [])
+        for row in tbl.rows
+    )
+    return "\n".join(filter(None, chain(paragraphs, table_rows)))
+
+
 @router.post(
     "/check-rubric-file",
     response_model=RubricEvaluationResponse,
@@ -254,40 +472,40 @@ async def check_rubric_file(
     semester_id: int = Form(1, description="Mã học kỳ (tùy chọn)"),
     category_id: int = Form(0, description="Danh mục (tùy chọn)"),
     max_students: int = Form(4, description="Số SV tối đa (tùy chọn)")
-) -> RubricEvaluationResponse:
+) -> Dict[str, Any]:
     try:
-        import time
-        import io
-        try:
-            from docx import Document
-        except Exception:
+        if not _DOCX_AVAILABLE:
             raise HTTPException(status_code=500, detail="Missing dependency: python-docx. Please install and restart the server.")
-        t0 = time.time()
+        t0 = time.perf_counter()
 
         if not file.filename.lower().endswith(".docx"):
             raise HTTPException(status_code=400, detail="Only .docx files are supported")
 
-        # Read file into memory and parse with python-docx
-        content = await file.read()
-        try:
-            document = Document(io.BytesIO(content))
-        except Exception as ex:
-            raise HTTPException(status_code=400, detail=f"Failed to parse .docx: {ex}")
-
-        # Extract text with simple paragraph join. Tables are appended linearly.
-        parts: list[str] = []
-        for p in document.paragraphs:
-            txt = (p.text or "").strip()
-            if txt:
-                parts.append(txt)
-        # Tables
-        for tbl in getattr(document, "tables", []) or []:
-            for row in tbl.rows:
-                row_text = [cell.text.strip() for cell in row.cells if cell and cell.text]
-                if any(row_text):
-                    parts.append(" | ".join(row_text))
-
-        extracted_text = "\n".join(parts)
+        # Stream the upload into a spooled temp file (spills to disk for large files)
+        # and hash it on the way so repeat uploads are answered from the cache
+        file_hash = hashlib.sha256()
+        with tempfile.SpooledTemporaryFile(max_size=_UPLOAD_SPOOL_MAX_SIZE) as spool:
+            size = 0
+            while chunk := await file.read(_UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > _UPLOAD_MAX_SIZE:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File too large (max {_UPLOAD_MAX_SIZE // (1 << 20)} MB)"
+                    )
+                file_hash.update(chunk)
+                spool.write(chunk)
+
+            cache_key = (file_hash.hexdigest(), title.strip(), supervisor_id, semester_id, category_id, max_students)
+            cached_data = _rubric_file_cache.get(cache_key)
+            if cached_data is not None:
+                return cached_data
+
+            spool.seek(0)
+            try:
+                extracted_text = await asyncio.to_thread(_extract_docx_text, spool)
+            except ValueError as ex:
+                raise HTTPException(status_code=400, detail=str(ex))
 
         # Build minimal topic_request. If title is blank, attempt a heuristic from first line.
         inferred_title = title.strip()
@@ -311,18 +529,18 @@ async def check_rubric_file(
             "proposal_text": extracted_text,
         }
 
-        result = await rubric_agent.process(rubric_payload)
+        result = await get_rubric_agent().process(rubric_payload)
         if not result.get("success"):
             raise HTTPException(status_code=400, detail=result.get("error", "Rubric evaluation failed"))
 
         data = result.get("data", {})
-        if "processing_time" not in data:
-            data["processing_time"] = round(time.time() - t0, 3)
-        return RubricEvaluationResponse(**data)
+        _set_processing_time(data, t0)
+        _rubric_file_cache[cache_key] = data
+        return data
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error in check_rubric_file: {e}")
+        logger.error("Error in check_rubric_file: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 @router.post(
     "/submit-with-ai",
@@ -379,9 +597,9 @@ async def submit_topic_with_ai(
     auto_modify: bool = Query(True, description="Auto-modify topic if duplicates found")
 ) -> AgentProcessResponse:
     try:
-        logger.info(f"Submitting topic with AI: {topic_request.title}")
+        logger.info("Submitting topic with AI: %s", topic_request.title)
         
-        result = await topic_service.submit_topic_with_ai_support(
+        result = await get_topic_service().submit_topic_with_ai_support(
             topic_request=topic_request,
             check_duplicates=check_duplicates,
             get_suggestions=get_suggestions,
@@ -397,15 +615,40 @@ async def submit_topic_with_ai(
             )
             
     except Exception as e:
-        logger.error(f"Error in submit_topic_with_ai: {e}")
+        logger.error("Error in submit_topic_with_ai: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post(
+    "/bulk",
+    response_model=TopicBulkCreateResponse,
+    summary=" Bulk Create Topics",
+    description="""
+    ## Import many topics at once
+    
+    - Each topic is created with its initial version (status Submitted)
+    - Rows are written with batched INSERTs (`batch_size` rows per statement) and a single commit
+    - Duplicate title checks and AI processing are skipped; use `/submit-with-ai` for single submissions
+    """
+)
+def bulk_create_topics(
+    topic_requests: List[TopicRequest],
+    batch_size: int = Query(250, ge=1, le=1000, description="Rows per INSERT statement")
+) -> TopicBulkCreateResponse:
+    if not topic_requests:
+        return TopicBulkCreateResponse()
+    
+    result = get_topic_service().bulk_create_topics(topic_requests, batch_size)
+    if not result.get("success"):
+        raise HTTPException(status_code=400, detail=result.get("error", "Failed to create topics"))
+    return TopicBulkCreateResponse(**result["data"])
+
+
 async def create_topic_simple(topic_request: TopicRequest) -> TopicResponse:
     try:
-        logger.info(f"Creating simple topic: {topic_request.title}")
+        logger.info("Creating simple topic: %s", topic_request.title)
         
-        result = topic_service.create_topic_simple(topic_request)
+        result = get_topic_service().create_topic_simple(topic_request)
         
         if result.get("success"):
             return TopicResponse(**result["data"]["topic"])
@@ -416,22 +659,20 @@ async def create_topic_simple(topic_request: TopicRequest) -> TopicResponse:
             )
             
     except Exception as e:
-        logger.error(f"Error in create_topic_simple: {e}")
+        logger.error("Error in create_topic_simple: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 async def check_topic_duplicates(topic_request: TopicRequest) -> DuplicateCheckResult:
     try:
-        logger.info(f"Checking duplicates for: {topic_request.title}")
-        import time
-        t0 = time.time()
+        logger.info("Checking duplicates for: %s", topic_request.title)
+        t0 = time.perf_counter()
         
-        result = await topic_service.check_topic_duplicates(topic_request)
+        result = await get_topic_service().check_topic_duplicates(topic_request)
         
         if result.get("success"):
             data = result.get("data", {})
-            if "processing_time" not in data:
-                data["processing_time"] = round(time.time() - t0, 3)
+            _set_processing_time(data, t0)
             return DuplicateCheckResult(**data)
         else:
             raise HTTPException(
@@ -440,7 +681,7 @@ async def check_topic_duplicates(topic_request: TopicRequest) -> DuplicateCheckR
             )
             
     except Exception as e:
-        logger.error(f"Error in check_topic_duplicates: {e}")
+        logger.error("Error in check_topic_duplicates: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get(
@@ -482,21 +723,32 @@ async def check_topic_duplicates(topic_request: TopicRequest) -> DuplicateCheckR
     }
 )
 async def get_trending_suggestions(
+    request: Request,
+    response: Response,
     semester_id: int = Query(..., description="Target semester ID for suggestions"),
     category_preference: str = Query("", description="Preferred topic category (e.g., 'AI', 'Web Development')"),
     keywords: List[str] = Query([], description="Keywords of interest for customization"),
     supervisor_expertise: List[str] = Query([], description="Supervisor's expertise areas"),
     student_level: str = Query("undergraduate", description="Student level: undergraduate or graduate"),
     team_size: int = Query(4, description="Team size (only 4 or 5 supported)")
-) -> TopicSuggestionsResponse:
+) -> Dict[str, Any]:
     try:
-        logger.info(f"Getting trending suggestions for semester: {semester_id}")
+        logger.info("Getting trending suggestions for semester: %s", semester_id)
         
         # Enforce only 4 or 5
         if team_size not in (4, 5):
             team_size = 4
+
+        etag = _suggestions_etag(
+            "get_trending_suggestions", semester_id, category_preference, keywords,
+            supervisor_expertise, student_level, team_size
+        )
+        if _etag_matches(request, etag):
+            return _not_modified(etag)
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = _SUGGESTIONS_CACHE_CONTROL
         
-        result = await topic_service.get_trending_suggestions(
+        result = await get_topic_service().get_trending_suggestions(
             semester_id=semester_id,
             category_preference=category_preference,
             keywords=keywords,
@@ -507,11 +759,10 @@ async def get_trending_suggestions(
         
         if result.get("success"):
             # Ensure processing_time exists
-            import time
             data = result.get("data", {})
             if "processing_time" not in data:
                 data["processing_time"] = round(0.001, 3)  # minimal placeholder if agent didn't set
-            return TopicSuggestionsResponse(**data)
+            return data
         else:
             raise HTTPException(
                 status_code=400,
@@ -519,7 +770,7 @@ async def get_trending_suggestions(
             )
             
     except Exception as e:
-        logger.error(f"Error in get_trending_suggestions: {e}")
+        logger.error("Error in get_trending_suggestions: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -566,19 +817,30 @@ async def get_trending_suggestions(
     }
 )
 async def get_trending_suggestions_v2(
+    request: Request,
+    response: Response,
     semester_id: int = Query(..., description="Target semester ID for suggestions"),
     category_preference: str = Query("", description="Preferred topic category (e.g., 'AI', 'Web Development')"),
     keywords: List[str] = Query([], description="Keywords of interest for customization"),
     supervisor_expertise: List[str] = Query([], description="Supervisor's expertise areas"),
     student_level: str = Query("undergraduate", description="Student level (undergraduate/graduate)"),
     team_size: int = Query(4, description="Team size (only 4 or 5 supported)")
-) -> TopicSuggestionsV2Response:
+) -> Dict[str, Any]:
     try:
-        logger.info(f"Getting trending suggestions v2 for semester: {semester_id}")
+        logger.info("Getting trending suggestions v2 for semester: %s", semester_id)
         
         # Enforce only 4 or 5
         if team_size not in (4, 5):
             team_size = 4
+
+        etag = _suggestions_etag(
+            "get_trending_suggestions_v2", semester_id, category_preference, keywords,
+            supervisor_expertise, student_level, team_size
+        )
+        if _etag_matches(request, etag):
+            return _not_modified(etag)
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = _SUGGESTIONS_CACHE_CONTROL
         
         # Prepare input data for the agent
         input_data = {
@@ -591,10 +853,10 @@ async def get_trending_suggestions_v2(
         }
         
         # Process using the v2 agent
-        result = await suggestion_v2_agent.process(input_data)
+        result = await get_suggestion_v2_agent().process(input_data)
         
         if result.get("success"):
-            return TopicSuggestionsV2Response(**result["data"])
+            return result["data"]
         else:
             raise HTTPException(
                 status_code=400,
@@ -602,7 +864,7 @@ async def get_trending_suggestions_v2(
             )
             
     except Exception as e:
-        logger.error(f"Error in get_trending_suggestions_v2: {e}")
+        logger.error("Error in get_trending_suggestions_v2: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -612,9 +874,9 @@ async def modify_topic_for_uniqueness(
     preserve_core_idea: bool = Query(True, description="Preserve the core idea while modifying")
 ) -> TopicModificationResponse:
     try:
-        logger.info(f"Modifying topic for uniqueness: {topic_request.title}")
+        logger.info("Modifying topic for uniqueness: %s", topic_request.title)
         
-        result = await topic_service.modify_topic_for_uniqueness(
+        result = await get_topic_service().modify_topic_for_uniqueness(
             topic_request=topic_request,
             duplicate_results=duplicate_results,
             preserve_core_idea=preserve_core_idea
@@ -629,14 +891,14 @@ async def modify_topic_for_uniqueness(
             )
             
     except Exception as e:
-        logger.error(f"Error in modify_topic_for_uniqueness: {e}")
+        logger.error("Error in modify_topic_for_uniqueness: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 async def get_topic_by_id(topic_id: int) -> TopicResponse:
     """Get a topic by its ID."""
     try:
-        topic = topic_service.get_topic_by_id(topic_id)
+        topic = get_topic_service().get_topic_by_id(topic_id)
         
         if not topic:
             raise HTTPException(status_code=404, detail="Topic not found")
@@ -646,28 +908,36 @@ async def get_topic_by_id(topic_id: int) -> TopicResponse:
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting topic {topic_id}: {e}")
+        logger.error("Error getting topic %s: %s", topic_id, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _topic_page(topics: List[TopicResponse], limit: int) -> TopicPageResponse:
+    """Wrap a page of topics with the cursor for the next page (None on the last page)."""
+    next_cursor = topics[-1].id if len(topics) == limit else None
+    return TopicPageResponse(items=topics, next_cursor=next_cursor)
+
+
 async def get_topics(
     semester_id: Optional[int] = Query(None, description="Filter by semester ID"),
-    limit: int = Query(100, description="Maximum number of topics to return"),
-    approved_only: bool = Query(False, description="Return only approved topics")
-) -> List[TopicResponse]:
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of topics to return"),
+    approved_only: bool = Query(False, description="Return only approved topics"),
+    after_id: Optional[int] = Query(None, description="Cursor: return topics with ID greater than this"),
+    include_versions: bool = Query(False, description="Include each topic's latest and approved versions")
+) -> TopicPageResponse:
     """Get topics, optionally filtered by semester and approval status."""
     try:
         if semester_id:
-            topics = topic_service.get_topics_by_semester(semester_id, limit, approved_only)
+            topics = get_topic_service().get_topics_by_semester(semester_id, limit, approved_only, after_id, include_versions)
         else:
             # For simplicity, if no semester_id provided, return empty list
             # In a real implementation, you might want to get all topics
             topics = []
         
-        return topics
+        return _topic_page(topics, limit)
         
     except Exception as e:
-        logger.error(f"Error getting topics: {e}")
+        logger.error("Error getting topics: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -677,23 +947,24 @@ async def search_topics(
 ) -> List[TopicResponse]:
     """Search topics by title keywords."""
     try:
-        topics = topic_service.search_topics(keywords, semester_id)
+        topics = get_topic_service().search_topics(keywords, semester_id)
         return topics
         
     except Exception as e:
-        logger.error(f"Error searching topics: {e}")
+        logger.error("Error searching topics: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 async def get_approved_topics(
     semester_id: Optional[int] = Query(None, description="Filter by semester ID"),
-    limit: int = Query(100, description="Maximum number of topics to return")
-) -> List[TopicResponse]:
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of topics to return"),
+    after_id: Optional[int] = Query(None, description="Cursor: return topics with ID greater than this")
+) -> TopicPageResponse:
     """Get only approved topics for indexing and duplicate checking."""
     try:
-        topics = topic_service.get_topics_by_semester(semester_id or 0, limit, approved_only=True)
-        return topics
+        topics = get_topic_service().get_topics_by_semester(semester_id or 0, limit, approved_only=True, after_id=after_id)
+        return _topic_page(topics, limit)
         
     except Exception as e:
-        logger.error(f"Error getting approved topics: {e}")
+        logger.error("Error getting approved topics: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,21 +1,28 @@
 """Topic Version Management API endpoints."""
 
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Optional, Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from typing import List, Optional, Dict, Any, Tuple
+from datetime import datetime
+from pydantic import BaseModel, TypeAdapter
 from app.schemas.schemas import (
-    TopicVersionRequest, TopicVersionResponse, ErrorResponse
+    TopicVersionRequest, TopicVersionResponse, TopicVersionListItem, TopicVersionPageResponse,
+    TopicVersionSummaryResponse, ErrorResponse
 )
 from app.services.topic_service import TopicService
+from app.models.database import get_db
+from sqlalchemy.orm import Session
+import hashlib
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Create router with detailed metadata
 router = APIRouter(
     prefix="/api/v1",
     tags=["📋 Topic Version Management"],
+    default_response_class=ORJSONResponse,
     responses={
         404: {"description": "Version not found", "model": ErrorResponse},
         400: {"description": "Bad request", "model": ErrorResponse},
@@ -23,8 +30,54 @@ router = APIRouter(
     }
 )
 
-# Initialize service
-topic_service = TopicService()
+# One service and session per request: sync handlers run concurrently in the
+# threadpool, and a Session must not be shared between threads
+def get_topic_service(db: Session = Depends(get_db)) -> TopicService:
+    return TopicService(db)
+
+
+# Built once at import; list endpoints serialize with these instead of FastAPI's per-request response_model pass
+_versions_adapter = TypeAdapter(List[TopicVersionResponse])
+_version_history_adapter = TypeAdapter(List[TopicVersionListItem])
+
+
+def _encode_version_cursor(version: TopicVersionResponse) -> str:
+    """Keyset cursor for the approved-version listing: '<created_at ISO>_<version id>'."""
+    return f"{version.created_at.isoformat()}_{version.id}"
+
+
+def _decode_version_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        created_at, version_id = cursor.rsplit("_", 1)
+        return datetime.fromisoformat(created_at), int(version_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+# Versions change only on create/approve/reject; let clients reuse them briefly and revalidate
+_VERSIONS_CACHE_CONTROL = "private, max-age=30"
+
+
+def _versions_etag(*versions: BaseModel) -> str:
+    """Strong ETag over the serialized versions, so status changes produce a new tag."""
+    digest = hashlib.blake2b(digest_size=16)
+    for version in versions:
+        digest.update(version.model_dump_json().encode("utf-8"))
+    return f'"{digest.hexdigest()}"'
+
+
+def _conditional_get(request: Request, response: Response, *versions: BaseModel) -> Optional[Response]:
+    """Return a 304 if the client's If-None-Match is current, else tag the response."""
+    etag = _versions_etag(*versions)
+    header = request.headers.get("if-none-match")
+    if header:
+        candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+        if etag in candidates or "*" in candidates:
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": _VERSIONS_CACHE_CONTROL})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = _VERSIONS_CACHE_CONTROL
+    return None
+
 
 @router.get(
     "/topics/{topic_id}/versions",
@@ -71,15 +124,41 @@ topic_service = TopicService()
         }
     }
 )
-async def get_topic_versions(topic_id: int) -> List[TopicVersionResponse]:
+def get_topic_versions(
+    topic_id: int,
+    request: Request,
+    topic_service: TopicService = Depends(get_topic_service)
+) -> Response:
     """Get all versions of a topic."""
-    try:
-        versions = topic_service.get_topic_versions(topic_id)
-        return versions
-        
-    except Exception as e:
-        logger.error(f"Error getting topic versions for topic {topic_id}: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    versions = topic_service.get_topic_versions(topic_id)
+    response = Response(content=_versions_adapter.dump_json(versions), media_type="application/json")
+    return _conditional_get(request, response, *versions) or response
+
+@router.get(
+    "/topics/{topic_id}/versions/history",
+    response_model=List[TopicVersionListItem],
+    summary="🗂️ Get Topic Version History",
+    description="""
+    ## Get a lightweight version history of a topic
+    
+    ### 📊 Version History:
+    - One row per version: id, version number, title, status and creation time
+    - Content columns (description, methodology, ...) are not loaded from the database
+    - Fetch a single version for its full content
+    
+    ### 🔍 Use Cases:
+    - Version history lists and pickers
+    """
+)
+def get_topic_version_history(
+    topic_id: int,
+    request: Request,
+    topic_service: TopicService = Depends(get_topic_service)
+) -> Response:
+    """Get the version history of a topic."""
+    versions = topic_service.get_topic_version_history(topic_id)
+    response = Response(content=_version_history_adapter.dump_json(versions), media_type="application/json")
+    return _conditional_get(request, response, *versions) or response
 
 @router.get(
     "/topics/{topic_id}/versions/latest",
@@ -123,19 +202,17 @@ async def get_topic_versions(topic_id: int) -> List[TopicVersionResponse]:
         }
     }
 )
-async def get_latest_topic_version(topic_id: int) -> TopicVersionResponse:
+def get_latest_topic_version(
+    topic_id: int,
+    request: Request,
+    response: Response,
+    topic_service: TopicService = Depends(get_topic_service)
+) -> TopicVersionResponse:
     """Get latest version of a topic."""
-    try:
-        version = topic_service.get_latest_topic_version(topic_id)
-        if not version:
-            raise HTTPException(status_code=404, detail="Topic version not found")
-        return version
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error getting latest topic version for topic {topic_id}: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    version = topic_service.get_latest_topic_version(topic_id)
+    if not version:
+        raise HTTPException(status_code=404, detail="Topic version not found")
+    return _conditional_get(request, response, version) or version
 
 @router.get(
     "/topics/{topic_id}/versions/approved",
@@ -180,19 +257,46 @@ async def get_latest_topic_version(topic_id: int) -> TopicVersionResponse:
         }
     }
 )
-async def get_approved_topic_version(topic_id: int) -> TopicVersionResponse:
+def get_approved_topic_version(
+    topic_id: int,
+    request: Request,
+    response: Response,
+    topic_service: TopicService = Depends(get_topic_service)
+) -> TopicVersionResponse:
     """Get approved version of a topic."""
-    try:
-        version = topic_service.get_approved_topic_version(topic_id)
-        if not version:
-            raise HTTPException(status_code=404, detail="No approved version found for this topic")
-        return version
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error getting approved topic version for topic {topic_id}: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    version = topic_service.get_approved_topic_version(topic_id)
+    if not version:
+        raise HTTPException(status_code=404, detail="No approved version found for this topic")
+    return _conditional_get(request, response, version) or version
+
+@router.get(
+    "/topics/{topic_id}/versions/summary",
+    response_model=TopicVersionSummaryResponse,
+    summary="🧾 Get Latest and Approved Versions",
+    description="""
+    ## Get the latest and the approved version of a topic together
+    
+    ### 📊 Summary:
+    - `latest`: newest version by version number
+    - `approved`: newest version with status = 4 (Approved), or null
+    - Both come from a single database query
+    
+    ### 🔍 Use Cases:
+    - Version comparison screens that show current and approved content side by side
+    """
+)
+def get_topic_version_summary(
+    topic_id: int,
+    request: Request,
+    response: Response,
+    topic_service: TopicService = Depends(get_topic_service)
+) -> TopicVersionSummaryResponse:
+    """Get latest and approved versions of a topic."""
+    summary = topic_service.get_topic_version_summary(topic_id)
+    if not summary:
+        raise HTTPException(status_code=404, detail="Topic version not found")
+    versions = [summary.latest] + ([summary.approved] if summary.approved else [])
+    return _conditional_get(request, response, *versions) or summary
 
 @router.post(
     "/topics/{topic_id}/versions",
@@ -244,22 +348,42 @@ async def get_approved_topic_version(topic_id: int) -> TopicVersionResponse:
         }
     }
 )
-async def create_topic_version(
+def create_topic_version(
     topic_id: int,
-    version_request: TopicVersionRequest
+    version_request: TopicVersionRequest,
+    topic_service: TopicService = Depends(get_topic_service)
 ) -> TopicVersionResponse:
     """Create a new version of an existing topic."""
-    try:
-        version = topic_service.create_topic_version(topic_id, version_request)
-        if not version:
-            raise HTTPException(status_code=400, detail="Failed to create topic version")
-        return version
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error creating topic version for topic {topic_id}: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    version = topic_service.create_topic_version(topic_id, version_request)
+    if not version:
+        raise HTTPException(status_code=400, detail="Failed to create topic version")
+    return version
+
+@router.post(
+    "/topics/{topic_id}/versions/bulk",
+    response_model=List[TopicVersionResponse],
+    summary="📚 Create Topic Versions in Bulk",
+    description="""
+    ## Create several versions of a topic in one request
+    
+    ### 📝 Bulk Creation:
+    - Versions are numbered in request order after the topic's latest version
+    - All rows are written with a single batched INSERT and committed together
+    - Intended for imports and migrations; use the single-version endpoint from the UI
+    """
+)
+def create_topic_versions_bulk(
+    topic_id: int,
+    version_requests: List[TopicVersionRequest],
+    topic_service: TopicService = Depends(get_topic_service)
+) -> List[TopicVersionResponse]:
+    """Create several versions of an existing topic."""
+    if not version_requests:
+        return []
+    versions = topic_service.create_topic_versions(topic_id, version_requests)
+    if not versions:
+        raise HTTPException(status_code=400, detail="Failed to create topic versions")
+    return versions
 
 @router.put(
     "/versions/{version_id}/approve",
@@ -297,20 +421,16 @@ async def create_topic_version(
         }
     }
 )
-async def approve_topic_version(version_id: int) -> Dict[str, str]:
+def approve_topic_version(
+    version_id: int,
+    topic_service: TopicService = Depends(get_topic_service)
+) -> Dict[str, str]:
     """Approve a topic version."""
-    try:
-        success = topic_service.approve_topic_version(version_id)
-        if not success:
-            raise HTTPException(status_code=400, detail="Failed to approve topic version")
-        
-        return {"message": "Topic version approved successfully"}
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error approving topic version {version_id}: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    success = topic_service.approve_topic_version(version_id)
+    if not success:
+        raise HTTPException(status_code=400, detail="Failed to approve topic version")
+    
+    return {"message": "Topic version approved successfully"}
 
 @router.put(
     "/versions/{version_id}/reject",
@@ -350,23 +470,17 @@ async def approve_topic_version(version_id: int) -> Dict[str, str]:
         }
     }
 )
-async def reject_topic_version(
+def reject_topic_version(
     version_id: int,
-    reason: str = Query(None, description="Optional rejection reason")
+    reason: str = Query(None, description="Optional rejection reason"),
+    topic_service: TopicService = Depends(get_topic_service)
 ) -> Dict[str, str]:
     """Reject a topic version."""
-    try:
-        success = topic_service.reject_topic_version(version_id, reason)
-        if not success:
-            raise HTTPException(status_code=400, detail="Failed to reject topic version")
-        
-        return {"message": "Topic version rejected successfully"}
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error rejecting topic version {version_id}: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    success = topic_service.reject_topic_version(version_id, reason)
+    if not success:
+        raise HTTPException(status_code=400, detail="Failed to reject topic version")
+    
+    return {"message": "Topic version rejected successfully"}
 
 @router.get(
     "/versions/approved",
@@ -417,15 +531,71 @@ async def reject_topic_version(
         }
     }
 )
-async def get_all_approved_versions(
+def get_all_approved_versions(
     semester_id: Optional[int] = Query(None, description="Filter by semester ID"),
-    limit: int = Query(100, description="Maximum number of versions to return")
+    limit: int = Query(100, description="Maximum number of versions to return"),
+    topic_service: TopicService = Depends(get_topic_service)
 ) -> List[TopicVersionResponse]:
     """Get all approved topic versions for indexing and duplicate checking."""
-    try:
-        versions = topic_service.get_approved_topic_versions(semester_id, limit)
-        return versions
-        
-    except Exception as e:
-        logger.error(f"Error getting approved versions: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    versions = topic_service.get_approved_topic_versions(semester_id, limit)
+    return versions
+
+
+@router.get(
+    "/versions/approved/page",
+    response_model=TopicVersionPageResponse,
+    summary="📑 Page Through Approved Versions",
+    description="""
+    ## Get approved topic versions one page at a time
+    
+    ### 📊 Keyset Pagination:
+    - Newest first, ordered by creation time then version ID
+    - Pass `next_cursor` from the previous page as `cursor`; it is null on the last page
+    - Each page is an index seek from the cursor, so deep pages cost the same as the first
+    """
+)
+def get_approved_versions_page(
+    semester_id: Optional[int] = Query(None, description="Filter by semester ID"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of versions per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    topic_service: TopicService = Depends(get_topic_service)
+) -> TopicVersionPageResponse:
+    """Get one page of approved topic versions."""
+    after = _decode_version_cursor(cursor) if cursor else None
+    versions = topic_service.get_approved_topic_versions(semester_id, limit, after)
+    next_cursor = _encode_version_cursor(versions[-1]) if len(versions) == limit else None
+    return TopicVersionPageResponse(items=versions, next_cursor=next_cursor)
+
+
+@router.get(
+    "/versions/approved/stream",
+    summary="📤 Stream All Approved Versions",
+    description="""
+    ## Stream every approved topic version as NDJSON
+    
+    ### 📊 Streaming:
+    - One JSON object per line, same fields as `/versions/approved`
+    - Rows are fetched from the database in batches, so memory stays flat
+    - No `limit`: intended for full re-indexing jobs
+    
+    ### ⚙️ Filtering Options:
+    - `semester_id`: Filter by specific semester
+
+    ### ⚠️ Errors:
+    - A failure mid-stream ends with an `{"error": ...}` line and an aborted body
+    """,
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}}
+)
+def stream_all_approved_versions(
+    semester_id: Optional[int] = Query(None, description="Filter by semester ID"),
+    topic_service: TopicService = Depends(get_topic_service)
+) -> StreamingResponse:
+    """Stream all approved topic versions for indexing jobs."""
+    stream = topic_service.stream_approved_topic_versions(semester_id)
+    # Closing runs the generator's finally (session close) even if the client disconnects
+    return StreamingResponse(
+        stream,
+        media_type="application/x-ndjson",
+        background=BackgroundTask(stream.close)
+    )
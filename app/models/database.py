@@ -1,19 +1,138 @@
 """Database models and connection setup."""
 
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Boolean, Numeric, ForeignKey
+from sqlalchemy import create_engine, text, Column, Integer, String, Text, DateTime, Boolean, Numeric, ForeignKey, Index
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
-from datetime import datetime
+from sqlalchemy.orm import sessionmaker, relationship, scoped_session
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
 from config import config
 
-# Create database engine
-engine = create_engine(config.DATABASE_URL)
+# Create database engine with a sized connection pool
+engine = create_engine(
+    config.DATABASE_URL,
+    pool_size=config.DB_POOL_SIZE,
+    max_overflow=config.DB_MAX_OVERFLOW,
+    pool_timeout=config.DB_POOL_TIMEOUT,
+    pool_pre_ping=True,
+    pool_recycle=config.DB_POOL_RECYCLE
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Thread-local sessions for sync helpers run in the threadpool; call SessionScoped.remove() when done
+SessionScoped = scoped_session(SessionLocal)
+
+# Optional async engine (e.g. mssql+aioodbc) for hot-path reads that should not use the threadpool
+async_engine = create_async_engine(
+    config.ASYNC_DATABASE_URL,
+    pool_size=config.DB_POOL_SIZE,
+    max_overflow=config.DB_MAX_OVERFLOW,
+    pool_timeout=config.DB_POOL_TIMEOUT,
+    pool_pre_ping=True,
+    pool_recycle=config.DB_POOL_RECYCLE
+) if config.ASYNC_DATABASE_URL else None
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False) if async_engine is not None else None
+
+
+def warm_up_pool(connections: int = config.DB_POOL_WARMUP) -> None:
+    """Open and return pooled connections so early requests skip connect/login."""
+    opened = []
+    try:
+        for _ in range(min(connections, config.DB_POOL_SIZE)):
+            conn = engine.connect()
+            opened.append(conn)
+            conn.execute(text("SELECT 1"))
+    finally:
+        for conn in opened:
+            conn.close()
+
+
+async def warm_up_async_pool(connections: int = config.DB_POOL_WARMUP) -> None:
+    """Async engine counterpart of warm_up_pool (no-op without ASYNC_DATABASE_URL)."""
+    if async_engine is None:
+        return
+    opened = []
+    try:
+        for _ in range(min(connections, config.DB_POOL_SIZE)):
+            conn = await async_engine.connect()
+            opened.append(conn)
+            await conn.execute(text("SELECT 1"))
+    finally:
+        for conn in opened:
+            await conn.close()
+
+
+async def dispose_engines() -> None:
+    """Close all pooled connections (call on application shutdown)."""
+    if async_engine is not None:
+        await async_engine.dispose()
+    engine.dispose()
+
+# Timestamp columns use utcnow() as the client-side default, which renders inline in every
+# INSERT; existing tables have no column default, so server_default only covers create_all
+class utcnow(FunctionElement):
+    """Current UTC timestamp, evaluated by the database instead of per row in Python."""
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"  # UTC on SQLite
+
+
+@compiles(utcnow, "mssql")
+def _utcnow_mssql(element, compiler, **kw):
+    return "GETUTCDATE()"
+
+
+@compiles(utcnow, "postgresql")
+def _utcnow_postgresql(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+class isoformat(FunctionElement):
+    """ISO 8601 text of a timestamp, rendered by the database instead of datetime.isoformat() per row."""
+    type = String()
+    inherit_cache = True
+
+
+@compiles(isoformat)
+def _isoformat_default(element, compiler, **kw):
+    return "STRFTIME('%%Y-%%m-%%dT%%H:%%M:%%f', %s)" % compiler.process(element.clauses, **kw)  # SQLite
+
+
+@compiles(isoformat, "mssql")
+def _isoformat_mssql(element, compiler, **kw):
+    return "CONVERT(VARCHAR(33), %s, 126)" % compiler.process(element.clauses, **kw)
+
+
+@compiles(isoformat, "postgresql")
+def _isoformat_postgresql(element, compiler, **kw):
+    return "TO_CHAR(%s, 'YYYY-MM-DD\"T\"HH24:MI:SS.US')" % compiler.process(element.clauses, **kw)
+
+
 Base = declarative_base()
 
 class Topic(Base):
     """Topic model based on the database schema."""
     __tablename__ = "topics"
+    __table_args__ = (
+        # Exact-title existence check within a semester
+        Index("ix_topics_semester_title_active", "SemesterId", "EN_Title", "IsActive"),
+        # Semester listing and duplicate-check candidates; the clustered Id key follows for keyset paging
+        Index("ix_topics_semester_active_approved", "SemesterId", "IsActive", "IsApproved"),
+        # Duplicate-check candidates (active and approved only), newest first; filtered so it holds just those rows
+        Index(
+            "ix_topics_approved_semester_created", "SemesterId", "CreatedAt",
+            mssql_where=text("IsActive = 1 AND IsApproved = 1"),
+            postgresql_where=text('"IsActive" AND "IsApproved"')
+        ),
+        Index(
+            "ix_topics_approved_created", "CreatedAt",
+            mssql_where=text("IsActive = 1 AND IsApproved = 1"),
+            postgresql_where=text('"IsActive" AND "IsApproved"')
+        ),
+    )
 
     Id = Column(Integer, primary_key=True, index=True)
     Title = Column("EN_Title", String(500), nullable=False)
@@ -25,10 +144,10 @@ class Topic(Base):
     MaxStudents = Column(Integer, default=1)
     IsLegacy = Column(Boolean, default=False)
     IsApproved = Column(Boolean, default=True)
-    CreatedAt = Column(DateTime, default=datetime.utcnow)
+    CreatedAt = Column(DateTime, default=utcnow(), server_default=utcnow())
     CreatedBy = Column(Text)
     DeletedAt = Column(DateTime)
-    LastModifiedAt = Column(DateTime)
+    LastModifiedAt = Column(DateTime, onupdate=utcnow())
     LastModifiedBy = Column(Text)
     IsActive = Column(Boolean, default=False)
     Abbreviation = Column(Text)
@@ -37,16 +156,30 @@ class Topic(Base):
     Problem = Column(Text)
     VN_title = Column("VN_title", Text)
 
-    # Relationships
-    versions = relationship("TopicVersion", back_populates="topic")
-    submissions = relationship("Submission", back_populates="topic")
+    # Relationships; collections are never loaded implicitly, opt in per query with selectinload/joinedload.
+    # Versions are removed by the ON DELETE CASCADE on topic_versions.TopicId, not loaded and deleted one by one.
+    versions = relationship("TopicVersion", back_populates="topic", lazy="raise", passive_deletes=True)
+    submissions = relationship("Submission", back_populates="topic", lazy="raise")
 
 class TopicVersion(Base):
     """Topic version model."""
     __tablename__ = "topic_versions"
+    __table_args__ = (
+        # Every lookup also filters IsActive = 1, so it is part of each key to keep the seeks exact
+        # Per-topic history / latest version, newest first
+        Index("ix_topic_versions_topic_active_version", "TopicId", "IsActive", "VersionNumber"),
+        # Approved version of a topic
+        Index("ix_topic_versions_topic_status_active", "TopicId", "Status", "IsActive", "VersionNumber"),
+        # Approved-version listing ordered by creation time; filtered to the approved, active rows
+        Index(
+            "ix_topic_versions_approved_created", "CreatedAt",
+            mssql_where=text("IsActive = 1 AND Status = 4"),
+            postgresql_where=text('"IsActive" AND "Status" = 4')
+        ),
+    )
 
     Id = Column(Integer, primary_key=True, index=True)
-    TopicId = Column(Integer, ForeignKey("topics.Id"), nullable=False)
+    TopicId = Column(Integer, ForeignKey("topics.Id", ondelete="CASCADE"), nullable=False)
     VersionNumber = Column(Integer, nullable=False)
     Title = Column("EN_Title", String(500), nullable=False)
     Description = Column(Text)
@@ -58,10 +191,10 @@ class TopicVersion(Base):
     Status = Column(Integer, default=1)
     SubmittedAt = Column(DateTime)
     SubmittedBy = Column(Integer, ForeignKey("users.Id"))
-    CreatedAt = Column(DateTime, default=datetime.utcnow)
+    CreatedAt = Column(DateTime, default=utcnow(), server_default=utcnow())
     CreatedBy = Column(Text)
     DeletedAt = Column(DateTime)
-    LastModifiedAt = Column(DateTime)
+    LastModifiedAt = Column(DateTime, onupdate=utcnow())
     LastModifiedBy = Column(Text)
     IsActive = Column(Boolean, default=False)
     Content = Column(Text)
@@ -79,7 +212,7 @@ class TopicCategory(Base):
     Id = Column(Integer, primary_key=True, index=True)
     Name = Column(String(100), nullable=False)
     Description = Column(Text)
-    CreatedAt = Column(DateTime, default=datetime.utcnow)
+    CreatedAt = Column(DateTime, default=utcnow(), server_default=utcnow())
     IsActive = Column(Boolean, default=False)
 
 class Semester(Base):
@@ -91,7 +224,7 @@ class Semester(Base):
     StartDate = Column(DateTime, nullable=False)
     EndDate = Column(DateTime, nullable=False)
     IsActive = Column(Boolean, nullable=False)
-    CreatedAt = Column(DateTime, default=datetime.utcnow)
+    CreatedAt = Column(DateTime, default=utcnow(), server_default=utcnow())
     Description = Column(Text)
 
 class User(Base):
@@ -101,7 +234,7 @@ class User(Base):
     Id = Column(Integer, primary_key=True, index=True)
     UserName = Column(String)
     Email = Column(String)
-    CreatedAt = Column(DateTime, default=datetime.utcnow)
+    CreatedAt = Column(DateTime, default=utcnow(), server_default=utcnow())
     LastModifiedAt = Column(DateTime)
 
 class Submission(Base):
@@ -121,7 +254,7 @@ class Submission(Base):
     AiCheckDetails = Column(Text)
     Status = Column(Integer, default=1)
     SubmittedAt = Column(DateTime)
-    CreatedAt = Column(DateTime, default=datetime.utcnow)
+    CreatedAt = Column(DateTime, default=utcnow(), server_default=utcnow())
     IsActive = Column(Boolean, default=False)
 
     # Relationships
@@ -139,7 +272,7 @@ class Phase(Base):
     EndDate = Column(DateTime, nullable=False)
     SubmissionDeadline = Column(DateTime)
     IsActive = Column(Boolean, default=True)
-    CreatedAt = Column(DateTime, default=datetime.utcnow)
+    CreatedAt = Column(DateTime, default=utcnow(), server_default=utcnow())
 
 class PhaseType(Base):
     """Phase type model."""
@@ -148,7 +281,7 @@ class PhaseType(Base):
     Id = Column(Integer, primary_key=True, index=True)
     Name = Column(String(50), nullable=False)
     Description = Column(Text)
-    CreatedAt = Column(DateTime, default=datetime.utcnow)
+    CreatedAt = Column(DateTime, default=utcnow(), server_default=utcnow())
     IsActive = Column(Boolean, default=False)
 
 def get_db():
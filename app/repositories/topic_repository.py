@@ -1,12 +1,86 @@
 """Repository layer for topic data access."""
 
-from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc
-from app.models.database import Topic, TopicVersion, TopicCategory, Semester, User
-from app.schemas.schemas import TopicRequest
+from typing import List, Optional, Dict, Any, Iterator, Tuple
+from sqlalchemy.orm import Session, aliased, load_only, raiseload
+from sqlalchemy import Boolean, Select, and_, or_, bindparam, case, desc, func, insert, literal, literal_column, select, true
+from app.models.database import Topic, TopicVersion, TopicCategory, Semester, User, isoformat, utcnow
+from app.schemas.schemas import TopicRequest, TopicVersionRequest, TopicVersionStatus
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from config import config
 from datetime import datetime
 
+# List queries only read columns; fail fast if a relationship is ever lazy-loaded per row
+_NO_LAZY_LOADS = raiseload("*")
+# Rendered as a SQL literal, not a bind parameter, so SQL Server can match the filtered
+# "approved" indexes (IsActive == True already renders as a literal 1)
+_APPROVED_STATUS = literal_column(str(TopicVersionStatus.APPROVED.value))
+# Topic listings only build TopicResponse; skip Content/Context/Problem/VN_title and audit TEXT columns
+_TOPIC_LIST_COLUMNS = load_only(
+    Topic.Id, Topic.Title, Topic.Abbreviation, Topic.Description, Topic.Objectives,
+    Topic.SupervisorId, Topic.CategoryId, Topic.SemesterId, Topic.MaxStudents,
+    Topic.IsApproved, Topic.CreatedAt
+)
+
+
+# Hot single-row lookups built once at import; each call only binds parameters and hits the compiled cache
+_TOPIC_BY_ID_STMT = select(Topic).where(
+    and_(Topic.Id == bindparam("topic_id"), Topic.IsActive == True)
+)
+_TOPIC_VERSION_BY_ID_STMT = select(TopicVersion).where(
+    and_(TopicVersion.Id == bindparam("version_id"), TopicVersion.IsActive == True)
+)
+_TOPIC_TITLE_EXISTS_STMT = select(literal(1)).where(
+    and_(
+        Topic.Title == bindparam("title"),
+        Topic.SemesterId == bindparam("semester_id"),
+        Topic.IsActive == True
+    )
+).limit(1)
+_TOPIC_TITLE_EXISTS_EXCLUDING_STMT = _TOPIC_TITLE_EXISTS_STMT.where(Topic.Id != bindparam("exclude_id"))
+
+
+def _full_content(*columns) -> Any:
+    """Space-join non-empty text columns in SQL (CONCAT_WS skips NULLs; NULLIF drops empty strings)."""
+    return func.concat_ws(" ", *(func.nullif(column, "") for column in columns)).label("full_content")
+
+class title_contains(FunctionElement):
+    """Title matches any keyword: full-text CONTAINS word-prefix on SQL Server.
+
+    Other dialects (e.g. SQLite for local runs) fall back to ILIKE '%keyword%'.
+    """
+    type = Boolean()
+    # A predicate already; don't let non-native-boolean dialects append "= 1"
+    _is_implicitly_boolean = True
+    inherit_cache = True
+
+    def __init__(self, column: Any, keywords: List[str]):
+        super().__init__(
+            column,
+            literal(_fulltext_any_prefix(keywords)),
+            *(literal(f"%{keyword}%") for keyword in keywords)
+        )
+
+
+@compiles(title_contains)
+def _title_contains_default(element, compiler, **kw):
+    column, _, *patterns = element.clauses
+    # Parenthesized so the OR binds inside any surrounding AND
+    return "(%s)" % compiler.process(or_(*(column.ilike(pattern) for pattern in patterns)), **kw)
+
+
+@compiles(title_contains, "mssql")
+def _title_contains_mssql(element, compiler, **kw):
+    column, condition, *_ = element.clauses
+    return "CONTAINS(%s, %s)" % (compiler.process(column, **kw), compiler.process(condition, **kw))
+
+
+def _fulltext_any_prefix(keywords: List[str]) -> str:
+    """Build a CONTAINS condition matching any keyword as a word prefix: "kw1*" OR "kw2*"."""
+    terms = (keyword.replace('"', "").strip() for keyword in keywords)
+    return " OR ".join(f'"{term}*"' for term in terms if term)
+
+
 class TopicRepository:
     """Repository for topic data access operations."""
 
@@ -23,26 +97,42 @@ class TopicRepository:
             CategoryId=topic_data.category_id,
             SemesterId=topic_data.semester_id,
             MaxStudents=topic_data.max_students,
-            CreatedAt=datetime.utcnow(),
             IsActive=True,
             IsApproved=False  # Topic approval is now based on versions
         )
         
-        self.db.add(db_topic)
-        self.db.commit()
-        self.db.refresh(db_topic)
-        
-        # Create initial topic version
-        self.create_topic_version(
-            topic_id=db_topic.Id,
-            version_data=topic_data,
-            version_number=1
-        )
+        try:
+            # Flush for the generated Id, then commit topic and initial version together
+            self.db.add(db_topic)
+            self.db.flush()
+            
+            self.create_topic_version(
+                topic_id=db_topic.Id,
+                version_data=topic_data,
+                version_number=1,
+                commit=False
+            )
+            
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
         
+        self.db.refresh(db_topic)
         return db_topic
 
-    def create_topic_version(self, topic_id: int, version_data: TopicRequest, version_number: int, status: int = 2) -> TopicVersion:
-        """Create a new version of a topic."""
+    def create_topic_version(
+        self,
+        topic_id: int,
+        version_data: TopicRequest,
+        version_number: int,
+        status: int = 2,
+        commit: bool = True
+    ) -> TopicVersion:
+        """Create a new version of a topic.
+
+        With commit=False the version is only flushed, so callers can include it in a larger transaction.
+        """
         db_version = TopicVersion(
             TopicId=topic_id,
             VersionNumber=version_number,
@@ -53,24 +143,129 @@ class TopicRepository:
             ExpectedOutcomes=getattr(version_data, 'expected_outcomes', None),
             Requirements=getattr(version_data, 'requirements', None),
             Status=status,  # 1=Draft, 2=Submitted, 3=Under Review, 4=Approved, 5=Rejected
-            SubmittedAt=datetime.utcnow() if status >= 2 else None,
-            CreatedAt=datetime.utcnow(),
+            SubmittedAt=utcnow() if status >= 2 else None,
             IsActive=True
         )
         
         self.db.add(db_version)
+        if not commit:
+            self.db.flush()
+            return db_version
+        
         self.db.commit()
         self.db.refresh(db_version)
         return db_version
 
+    def create_topic_versions(self, topic_id: int, versions: List[TopicVersionRequest]) -> List[Any]:
+        """Create several versions of a topic with one batched INSERT ... RETURNING.
+
+        Version numbers continue after the topic's highest existing version.
+        Returns the inserted rows in request order.
+        """
+        last_number = self.db.query(func.max(TopicVersion.VersionNumber)).filter(
+            TopicVersion.TopicId == topic_id
+        ).scalar() or 0
+
+        rows = [
+            {
+                "TopicId": topic_id,
+                "VersionNumber": last_number + offset,
+                "Title": version.title,
+                "Description": version.description,
+                "Objectives": version.objectives,
+                "Methodology": version.methodology,
+                "ExpectedOutcomes": version.expected_outcomes,
+                "Requirements": version.requirements,
+                "Status": version.status,  # 1=Draft, 2=Submitted, 3=Under Review, 4=Approved, 5=Rejected
+                "submitted": version.status >= 2,
+                "IsActive": True
+            }
+            for offset, version in enumerate(versions, start=1)
+        ]
+
+        # Plain rows (not ORM objects) so nothing is expired and reloaded after commit
+        # SubmittedAt comes from the database clock, like create_topic_version
+        inserted = self.db.execute(
+            insert(TopicVersion).values(
+                # Compared explicitly: SQL Server has no bare boolean predicates
+                SubmittedAt=case((bindparam("submitted", type_=Boolean) == true(), utcnow()), else_=None)
+            ).returning(
+                TopicVersion.Id, TopicVersion.TopicId, TopicVersion.VersionNumber, TopicVersion.Title,
+                TopicVersion.Description, TopicVersion.Objectives, TopicVersion.Methodology,
+                TopicVersion.ExpectedOutcomes, TopicVersion.Requirements, TopicVersion.Status,
+                TopicVersion.SubmittedAt, TopicVersion.SubmittedBy, TopicVersion.CreatedAt,
+                sort_by_parameter_order=True
+            ),
+            rows
+        ).all()
+
+        self.db.commit()
+        return inserted
+
+    def bulk_create_topics(self, topics: List[TopicRequest], batch_size: int = 250) -> List[int]:
+        """Create topics with their initial versions using batched INSERTs and one commit.
+
+        Each batch issues one INSERT ... RETURNING for the topics and one INSERT for their
+        version 1 rows. Returns the new topic Ids in request order.
+        """
+        topic_ids: List[int] = []
+        try:
+            for start in range(0, len(topics), batch_size):
+                batch = topics[start:start + batch_size]
+                batch_ids = self.db.execute(
+                    insert(Topic).returning(Topic.Id, sort_by_parameter_order=True),
+                    [
+                        {
+                            "Title": topic.title,
+                            "Description": topic.description,
+                            "Objectives": topic.objectives,
+                            "SupervisorId": topic.supervisor_id,
+                            "CategoryId": topic.category_id,
+                            "SemesterId": topic.semester_id,
+                            "MaxStudents": topic.max_students,
+                            "IsActive": True,
+                            "IsApproved": False  # Topic approval is now based on versions
+                        }
+                        for topic in batch
+                    ]
+                ).scalars().all()
+
+                self.db.execute(
+                    insert(TopicVersion).values(SubmittedAt=utcnow()),
+                    [
+                        {
+                            "TopicId": topic_id,
+                            "VersionNumber": 1,
+                            "Title": topic.title,
+                            "Description": topic.description,
+                            "Objectives": topic.objectives,
+                            "Status": 2,  # Submitted, as in create_topic
+                            "IsActive": True
+                        }
+                        for topic_id, topic in zip(batch_ids, batch)
+                    ]
+                )
+                topic_ids.extend(batch_ids)
+
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        return topic_ids
+
     def get_topic_by_id(self, topic_id: int) -> Optional[Topic]:
         """Get topic by ID."""
-        return self.db.query(Topic).filter(
-            and_(Topic.Id == topic_id, Topic.IsActive == True)
-        ).first()
+        return self.db.execute(_TOPIC_BY_ID_STMT, {"topic_id": topic_id}).scalars().first()
 
-    def get_topics_by_semester(self, semester_id: int, limit: int = 100, approved_only: bool = False) -> List[Topic]:
-        """Get topics by semester."""
+    def get_topics_by_semester(
+        self,
+        semester_id: int,
+        limit: int = 100,
+        approved_only: bool = False,
+        after_id: Optional[int] = None
+    ) -> List[Topic]:
+        """Get topics by semester, keyset-paginated by Id (pass the last Id seen as after_id)."""
         conditions = [
             Topic.SemesterId == semester_id,
             Topic.IsActive == True
@@ -78,61 +273,101 @@ class TopicRepository:
         
         if approved_only:
             conditions.append(Topic.IsApproved == True)
+
+        if after_id is not None:
+            conditions.append(Topic.Id > after_id)
             
-        return self.db.query(Topic).filter(
+        return self.db.query(Topic).options(_TOPIC_LIST_COLUMNS, _NO_LAZY_LOADS).filter(
             and_(*conditions)
-        ).limit(limit).all()
+        ).order_by(Topic.Id).limit(limit).all()
 
     def get_all_active_topics(self, limit: int = 1000) -> List[Topic]:
         """Get all active topics for similarity comparison (deprecated)."""
-        return self.db.query(Topic).filter(
+        return self.db.query(Topic).options(_TOPIC_LIST_COLUMNS, _NO_LAZY_LOADS).filter(
             Topic.IsActive == True
         ).order_by(desc(Topic.CreatedAt)).limit(limit).all()
     
-    def get_approved_topic_versions(self, limit: int = 1000) -> List[Dict[str, Any]]:
-        """Get approved topic versions for similarity comparison."""
-        approved_versions = self.db.query(TopicVersion, Topic).join(
+    @staticmethod
+    def _approved_version_conditions(semester_id: Optional[int] = None) -> List[Any]:
+        conditions = [
+            TopicVersion.IsActive == True,
+            TopicVersion.Status == _APPROVED_STATUS,
+            Topic.IsActive == True
+        ]
+
+        if semester_id:
+            conditions.append(Topic.SemesterId == semester_id)
+
+        return conditions
+
+    def _approved_versions_select(self, *columns: Any, semester_id: Optional[int] = None) -> Select:
+        """SELECT columns over approved active versions joined to their active topics, newest first."""
+        return select(*columns).select_from(TopicVersion).join(
             Topic, TopicVersion.TopicId == Topic.Id
-        ).filter(
-            and_(
-                TopicVersion.IsActive == True,
-                TopicVersion.Status == 4,  # APPROVED status
-                Topic.IsActive == True
-            )
-        ).order_by(desc(TopicVersion.CreatedAt)).limit(limit).all()
-        
-        result = []
-        for version, topic in approved_versions:
-            result.append({
-                "topic_id": topic.Id,
-                "version_id": version.Id,
-                "version_number": version.VersionNumber,
-                "title": version.Title,
-                "description": version.Description,
-                "objectives": version.Objectives,
-                "methodology": version.Methodology,
-                "expected_outcomes": version.ExpectedOutcomes,
-                "requirements": version.Requirements,
-                "semester_id": topic.SemesterId,
-                "category_id": topic.CategoryId,
-                "supervisor_id": topic.SupervisorId,
-                "status": version.Status,
-                "created_at": version.CreatedAt
-            })
+        ).where(
+            and_(*self._approved_version_conditions(semester_id))
+        ).order_by(desc(TopicVersion.CreatedAt))
+
+    def get_approved_topic_versions(
+        self,
+        limit: int = 1000,
+        semester_id: Optional[int] = None,
+        after: Optional[Tuple[datetime, int]] = None
+    ) -> List[Dict[str, Any]]:
+        """Get approved topic versions for similarity comparison, optionally for one semester.
+
+        Keyset-paginated newest first: pass the (created_at, version_id) of the last row seen as after.
+        """
+        # Core select labelled with the output keys: rows come back as mappings, no ORM entities
+        stmt = self._approved_versions_select(
+            Topic.Id.label("topic_id"),
+            TopicVersion.Id.label("version_id"),
+            TopicVersion.VersionNumber.label("version_number"),
+            TopicVersion.Title.label("title"),
+            TopicVersion.Description.label("description"),
+            TopicVersion.Objectives.label("objectives"),
+            TopicVersion.Methodology.label("methodology"),
+            TopicVersion.ExpectedOutcomes.label("expected_outcomes"),
+            TopicVersion.Requirements.label("requirements"),
+            Topic.SemesterId.label("semester_id"),
+            Topic.CategoryId.label("category_id"),
+            Topic.SupervisorId.label("supervisor_id"),
+            TopicVersion.Status.label("status"),
+            TopicVersion.CreatedAt.label("created_at"),
+            semester_id=semester_id
+        )
+        if after is not None:
+            # Row-value comparison spelled out; SQL Server has no (a, b) < (x, y)
+            after_created_at, after_id = after
+            stmt = stmt.where(or_(
+                TopicVersion.CreatedAt < after_created_at,
+                and_(TopicVersion.CreatedAt == after_created_at, TopicVersion.Id < after_id)
+            ))
+        stmt = stmt.order_by(desc(TopicVersion.Id)).limit(limit)
         
-        return result
+        return [dict(row) for row in self.db.execute(stmt).mappings()]
+
+    def iter_approved_topic_versions(
+        self,
+        semester_id: Optional[int] = None,
+        batch_size: int = 200
+    ) -> Iterator[TopicVersion]:
+        """Iterate all approved topic versions newest first, fetching batch_size rows at a time."""
+        stmt = self._approved_versions_select(TopicVersion, semester_id=semester_id).options(
+            _NO_LAZY_LOADS
+        ).execution_options(yield_per=batch_size)
+        return iter(self.db.execute(stmt).scalars())
 
     def search_topics_by_title(self, title_keywords: List[str], semester_id: Optional[int] = None) -> List[Topic]:
         """Search topics by title keywords."""
-        query = self.db.query(Topic).filter(Topic.IsActive == True)
+        query = self.db.query(Topic).options(_TOPIC_LIST_COLUMNS, _NO_LAZY_LOADS).filter(Topic.IsActive == True)
         
         # Add title search conditions
-        title_conditions = []
-        for keyword in title_keywords:
-            title_conditions.append(Topic.Title.ilike(f"%{keyword}%"))
-        
-        if title_conditions:
-            query = query.filter(or_(*title_conditions))
+        if config.TOPIC_SEARCH_FULLTEXT and _fulltext_any_prefix(title_keywords):
+            # One full-text index probe for all keywords
+            query = query.filter(title_contains(Topic.Title, title_keywords))
+        elif title_keywords:
+            query = query.filter(or_(*(Topic.Title.ilike(f"%{keyword}%") for keyword in title_keywords)))
         
         # Add semester filter if provided
         if semester_id:
@@ -142,52 +377,44 @@ class TopicRepository:
 
     def get_approved_topic_versions_with_content(self) -> List[Dict[str, Any]]:
         """Get approved topic versions with full content for ChromaDB indexing."""
-        # Get approved topic versions with their topics
-        approved_versions = self.db.query(TopicVersion, Topic).join(
-            Topic, TopicVersion.TopicId == Topic.Id
-        ).filter(
-            and_(
-                TopicVersion.IsActive == True,
-                TopicVersion.Status == 4,  # APPROVED status
-                Topic.IsActive == True
+        return list(self.iter_approved_topic_versions_with_content())
+
+    def iter_approved_topic_versions_with_content(self, chunk_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """Stream approved topic versions with full content, fetching chunk_size rows at a time."""
+        # Only the columns the index needs; the text fields arrive already joined
+        stmt = self._approved_versions_select(
+            TopicVersion.Id,
+            TopicVersion.VersionNumber,
+            TopicVersion.Title,
+            TopicVersion.Status,
+            isoformat(TopicVersion.CreatedAt).label("created_at"),
+            Topic.Id.label("TopicId"),
+            Topic.SemesterId,
+            Topic.CategoryId,
+            Topic.SupervisorId,
+            _full_content(
+                TopicVersion.Title, TopicVersion.Description, TopicVersion.Objectives,
+                TopicVersion.Methodology, TopicVersion.ExpectedOutcomes, TopicVersion.Requirements
             )
-        ).order_by(desc(TopicVersion.CreatedAt)).all()
+        ).execution_options(stream_results=True, yield_per=chunk_size)
+        approved_versions = self.db.execute(stmt)
         
-        result = []
-        for version, topic in approved_versions:
-            # Combine all text content from topic version
-            content_parts = []
-            
-            if version.Title:
-                content_parts.append(version.Title)
-            if version.Description:
-                content_parts.append(version.Description)
-            if version.Objectives:
-                content_parts.append(version.Objectives)
-            if version.Methodology:
-                content_parts.append(version.Methodology)
-            if version.ExpectedOutcomes:
-                content_parts.append(version.ExpectedOutcomes)
-            if version.Requirements:
-                content_parts.append(version.Requirements)
-            
-            full_content = " ".join(content_parts)
-            
-            result.append({
-                "id": f"{topic.Id}_{version.Id}",  # Unique ID combining topic and version
-                "title": version.Title,
-                "content": full_content,
-                "topic_id": topic.Id,
-                "version_id": version.Id,
-                "version_number": version.VersionNumber,
-                "semester_id": topic.SemesterId,
-                "category_id": topic.CategoryId,
-                "supervisor_id": topic.SupervisorId,
-                "created_at": version.CreatedAt.isoformat() if version.CreatedAt else None,
-                "status": version.Status
-            })
-        
-        return result
+        return (
+            {
+                "id": f"{row.TopicId}_{row.Id}",  # Unique ID combining topic and version
+                "title": row.Title,
+                "content": row.full_content,
+                "topic_id": row.TopicId,
+                "version_id": row.Id,
+                "version_number": row.VersionNumber,
+                "semester_id": row.SemesterId,
+                "category_id": row.CategoryId,
+                "supervisor_id": row.SupervisorId,
+                "created_at": row.created_at,
+                "status": row.Status
+            }
+            for row in approved_versions
+        )
 
     def get_topics_with_content(self) -> List[Dict[str, Any]]:
         """Deprecated: Use get_approved_topic_versions_with_content instead."""
@@ -203,7 +430,7 @@ class TopicRepository:
             if hasattr(topic, key) and value is not None:
                 setattr(topic, key, value)
         
-        topic.LastModifiedAt = datetime.utcnow()
+        # LastModifiedAt is set by the column's onupdate, in the database
         self.db.commit()
         self.db.refresh(topic)
         return topic
@@ -222,33 +449,56 @@ class TopicRepository:
 
     def get_current_semester(self) -> Optional[Semester]:
         """Get current active semester."""
-        now = datetime.utcnow()
+        # Compared against the database clock, not this process's
         return self.db.query(Semester).filter(
             and_(
                 Semester.IsActive == True,
-                Semester.StartDate <= now,
-                Semester.EndDate >= now
+                Semester.StartDate <= utcnow(),
+                Semester.EndDate >= utcnow()
             )
         ).first()
 
     def topic_exists_by_title(self, title: str, semester_id: int, exclude_id: Optional[int] = None) -> bool:
         """Check if topic with exact title exists in semester."""
-        query = self.db.query(Topic).filter(
-            and_(
-                Topic.Title == title,
-                Topic.SemesterId == semester_id,
-                Topic.IsActive == True
-            )
-        )
-        
+        # SELECT TOP 1 1: the index answers it without hydrating a Topic row
+        params = {"title": title, "semester_id": semester_id}
+        stmt = _TOPIC_TITLE_EXISTS_STMT
         if exclude_id:
-            query = query.filter(Topic.Id != exclude_id)
+            stmt = _TOPIC_TITLE_EXISTS_EXCLUDING_STMT
+            params["exclude_id"] = exclude_id
         
-        return query.first() is not None
+        return self.db.execute(stmt, params).first() is not None
     
     def get_approved_topics_for_duplicate_check(self, semester_id: Optional[int] = None, limit: int = 1000) -> List[Dict[str, Any]]:
         """Get approved topics with content for duplicate checking."""
-        query = self.db.query(Topic).filter(
+        # Latest active version per topic, ranked in the same query instead of one lookup per topic
+        latest_version = select(
+            TopicVersion.TopicId,
+            TopicVersion.Methodology,
+            TopicVersion.ExpectedOutcomes,
+            TopicVersion.Requirements,
+            func.row_number().over(
+                partition_by=TopicVersion.TopicId,
+                order_by=desc(TopicVersion.VersionNumber)
+            ).label("rn")
+        ).where(TopicVersion.IsActive == True).subquery()
+
+        query = self.db.query(
+            Topic.Id,
+            Topic.Title,
+            Topic.SemesterId,
+            Topic.CategoryId,
+            Topic.SupervisorId,
+            isoformat(Topic.CreatedAt).label("created_at"),
+            Topic.IsApproved,
+            _full_content(
+                Topic.Title, Topic.Description, Topic.Objectives,
+                latest_version.c.Methodology, latest_version.c.ExpectedOutcomes, latest_version.c.Requirements
+            )
+        ).outerjoin(
+            latest_version,
+            and_(latest_version.c.TopicId == Topic.Id, latest_version.c.rn == 1)
+        ).filter(
             and_(
                 Topic.IsActive == True,
                 Topic.IsApproved == True
@@ -259,58 +509,45 @@ class TopicRepository:
         if semester_id:
             query = query.filter(Topic.SemesterId == semester_id)
             
-        topics = query.order_by(desc(Topic.CreatedAt)).limit(limit).all()
-        
-        result = []
-        for topic in topics:
-            # Get latest version
-            latest_version = self.db.query(TopicVersion).filter(
-                and_(
-                    TopicVersion.TopicId == topic.Id,
-                    TopicVersion.IsActive == True
-                )
-            ).order_by(desc(TopicVersion.VersionNumber)).first()
-            
-            # Combine all text content
-            content_parts = [topic.Title or ""]
-            if topic.Description:
-                content_parts.append(topic.Description)
-            if topic.Objectives:
-                content_parts.append(topic.Objectives)
-            
-            if latest_version:
-                if latest_version.Methodology:
-                    content_parts.append(latest_version.Methodology)
-                if latest_version.ExpectedOutcomes:
-                    content_parts.append(latest_version.ExpectedOutcomes)
-                if latest_version.Requirements:
-                    content_parts.append(latest_version.Requirements)
-            
-            full_content = " ".join(content_parts)
-            
-            result.append({
-                "id": str(topic.Id),
-                "title": topic.Title,
-                "content": full_content,
-                "topic_id": topic.Id,
-                "semester_id": topic.SemesterId,
-                "category_id": topic.CategoryId,
-                "supervisor_id": topic.SupervisorId,
-                "created_at": topic.CreatedAt.isoformat() if topic.CreatedAt else None,
-                "is_approved": topic.IsApproved
-            })
+        rows = query.order_by(desc(Topic.CreatedAt)).limit(limit).all()
         
-        return result
+        return [
+            {
+                "id": str(row.Id),
+                "title": row.Title,
+                "content": row.full_content,
+                "topic_id": row.Id,
+                "semester_id": row.SemesterId,
+                "category_id": row.CategoryId,
+                "supervisor_id": row.SupervisorId,
+                "created_at": row.created_at,
+                "is_approved": row.IsApproved
+            }
+            for row in rows
+        ]
     
     def get_topic_version_by_id(self, version_id: int) -> Optional[TopicVersion]:
         """Get topic version by ID."""
-        return self.db.query(TopicVersion).filter(
-            and_(TopicVersion.Id == version_id, TopicVersion.IsActive == True)
-        ).first()
+        return self.db.execute(_TOPIC_VERSION_BY_ID_STMT, {"version_id": version_id}).scalars().first()
     
     def get_topic_versions_by_topic_id(self, topic_id: int) -> List[TopicVersion]:
         """Get all versions of a topic."""
-        return self.db.query(TopicVersion).filter(
+        return self.db.query(TopicVersion).options(_NO_LAZY_LOADS).filter(
+            and_(
+                TopicVersion.TopicId == topic_id,
+                TopicVersion.IsActive == True
+            )
+        ).order_by(desc(TopicVersion.VersionNumber)).all()
+    
+    def get_topic_version_history(self, topic_id: int) -> List[TopicVersion]:
+        """Get all versions of a topic, loading only the columns a history list shows."""
+        return self.db.query(TopicVersion).options(
+            load_only(
+                TopicVersion.Id, TopicVersion.VersionNumber, TopicVersion.Title,
+                TopicVersion.Status, TopicVersion.CreatedAt
+            ),
+            _NO_LAZY_LOADS
+        ).filter(
             and_(
                 TopicVersion.TopicId == topic_id,
                 TopicVersion.IsActive == True
@@ -336,34 +573,93 @@ class TopicRepository:
             )
         ).order_by(desc(TopicVersion.VersionNumber)).first()
     
-    def approve_topic_version(self, version_id: int) -> bool:
-        """Approve a topic version."""
+    def get_latest_and_approved_topic_versions(
+        self,
+        topic_id: int
+    ) -> Tuple[Optional[TopicVersion], Optional[TopicVersion]]:
+        """Get the latest and the approved version of a topic in one query."""
+        inner = aliased(TopicVersion)
+        inner_active = and_(inner.TopicId == topic_id, inner.IsActive == True)
+        latest_number = select(func.max(inner.VersionNumber)).where(inner_active).scalar_subquery()
+        approved_number = select(func.max(inner.VersionNumber)).where(
+            and_(inner_active, inner.Status == 4)  # APPROVED
+        ).scalar_subquery()
+
+        versions = self.db.query(TopicVersion).options(_NO_LAZY_LOADS).filter(
+            and_(
+                TopicVersion.TopicId == topic_id,
+                TopicVersion.IsActive == True,
+                TopicVersion.VersionNumber.in_([latest_number, approved_number])
+            )
+        ).order_by(desc(TopicVersion.VersionNumber)).all()
+
+        latest = versions[0] if versions else None
+        approved = next((version for version in versions if version.Status == 4), None)
+        return latest, approved
+    
+    def get_latest_and_approved_versions_for(
+        self,
+        topic_ids: List[int],
+        chunk_size: int = 1000
+    ) -> Dict[int, Tuple[Optional[TopicVersion], Optional[TopicVersion]]]:
+        """Batched get_latest_and_approved_topic_versions: topic Id -> (latest, approved), one query per chunk.
+
+        Ids are chunked to stay under SQL Server's 2100-parameter limit.
+        """
+        result: Dict[int, Tuple[Optional[TopicVersion], Optional[TopicVersion]]] = {}
+        for start in range(0, len(topic_ids), chunk_size):
+            chunk = topic_ids[start:start + chunk_size]
+            ranked = select(
+                TopicVersion,
+                func.row_number().over(
+                    partition_by=TopicVersion.TopicId,
+                    order_by=desc(TopicVersion.VersionNumber)
+                ).label("latest_rank"),
+                func.row_number().over(
+                    partition_by=(TopicVersion.TopicId, TopicVersion.Status),
+                    order_by=desc(TopicVersion.VersionNumber)
+                ).label("status_rank")
+            ).where(
+                and_(TopicVersion.TopicId.in_(chunk), TopicVersion.IsActive == True)
+            ).subquery()
+            ranked_version = aliased(TopicVersion, ranked)
+
+            versions = self.db.query(ranked_version).options(_NO_LAZY_LOADS).filter(
+                or_(
+                    ranked.c.latest_rank == 1,
+                    and_(ranked.c.Status == 4, ranked.c.status_rank == 1)  # APPROVED
+                )
+            ).all()
+
+            for version in versions:
+                latest, approved = result.get(version.TopicId, (None, None))
+                if latest is None or version.VersionNumber > latest.VersionNumber:
+                    latest = version
+                if version.Status == 4:
+                    approved = version
+                result[version.TopicId] = (latest, approved)
+        return result
+    
+    def _set_topic_version_status(self, version_id: int, status: int) -> bool:
+        """Set an active version's status with a single UPDATE; rowcount tells whether the version exists."""
         try:
-            version = self.get_topic_version_by_id(version_id)
-            if not version:
-                return False
-            
-            version.Status = 4  # APPROVED
-            version.LastModifiedAt = datetime.utcnow()
+            updated = self.db.query(TopicVersion).filter(
+                and_(TopicVersion.Id == version_id, TopicVersion.IsActive == True)
+            ).update(
+                {TopicVersion.Status: status},  # LastModifiedAt via the column's onupdate
+                synchronize_session=False
+            )
             
             self.db.commit()
-            return True
+            return updated > 0
         except Exception:
             self.db.rollback()
             return False
     
+    def approve_topic_version(self, version_id: int) -> bool:
+        """Approve a topic version."""
+        return self._set_topic_version_status(version_id, 4)  # APPROVED
+    
     def reject_topic_version(self, version_id: int, reason: str = None) -> bool:
         """Reject a topic version."""
-        try:
-            version = self.get_topic_version_by_id(version_id)
-            if not version:
-                return False
-            
-            version.Status = 5  # REJECTED
-            version.LastModifiedAt = datetime.utcnow()
-            
-            self.db.commit()
-            return True
-        except Exception:
-            self.db.rollback()
-            return False
+        return self._set_topic_version_status(version_id, 5)  # REJECTED
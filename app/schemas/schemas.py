@@ -221,6 +221,30 @@ class TopicVersionResponse(BaseModel):
         from_attributes = True
 
 
+class TopicVersionListItem(BaseModel):
+    """Schema for one row of a topic's version history (no TEXT body columns)."""
+    id: int
+    version_number: int
+    title: str
+    status: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class TopicVersionPageResponse(BaseModel):
+    """Schema for a cursor-paginated page of topic versions."""
+    items: List[TopicVersionResponse] = Field(default_factory=list)
+    next_cursor: Optional[str] = Field(None, description="Pass as cursor to fetch the next page; null when exhausted")
+
+
+class TopicVersionSummaryResponse(BaseModel):
+    """Schema for the latest and approved versions of one topic."""
+    latest: Optional[TopicVersionResponse] = None
+    approved: Optional[TopicVersionResponse] = None
+
+
 class TopicResponse(BaseModel):
     """Schema for topic response."""
     id: int
@@ -242,6 +266,17 @@ class TopicResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True, populate_by_name=True)
 
 
+class TopicBulkCreateResponse(BaseModel):
+    """Schema for the result of a bulk topic import."""
+    topic_ids: List[int] = Field(default_factory=list, description="IDs of the created topics, in request order")
+
+
+class TopicPageResponse(BaseModel):
+    """Schema for a cursor-paginated page of topics."""
+    items: List[TopicResponse] = Field(default_factory=list)
+    next_cursor: Optional[int] = Field(None, description="Pass as after_id to fetch the next page; null when exhausted")
+
+
 class DuplicateCheckResult(BaseModel):
     """Schema for duplicate check result."""
     status: DuplicationStatus = Field(
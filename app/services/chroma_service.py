@@ -2,8 +2,11 @@
 
 import chromadb
 from chromadb.config import Settings
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Callable
+from functools import lru_cache
 import numpy as np
+from app.services.embedding_cache import EmbeddingCache
+from app.services import index_events
 from config import config
 import logging
 import os
@@ -33,13 +36,48 @@ class ChromaService:
         self.embedding_backend = config.EMBEDDING_BACKEND
         self.embedding_model_name = config.EMBEDDING_MODEL_NAME
         self._init_embedding_provider()
+        self.embedding_cache = EmbeddingCache(maxsize=config.EMBEDDING_CACHE_SIZE)
         
         # Get or create collection
         self.collection = self._get_or_create_collection()
+
+        # Callbacks fired after any write to the collection (cache invalidation),
+        # including writes another process announces over index_events
+        self._write_listeners: List[Callable[[], None]] = []
+        index_events.add_remote_listener(self._run_write_listeners)
+
+    def add_write_listener(self, listener: Callable[[], None]) -> None:
+        """Register a callback invoked after the collection is modified."""
+        if listener not in self._write_listeners:
+            self._write_listeners.append(listener)
+
+    def _notify_write(self) -> None:
+        """Notify listeners in this and other processes that the collection changed."""
+        self._run_write_listeners()
+        index_events.publish_write()
+
+    def _run_write_listeners(self) -> None:
+        for listener in self._write_listeners:
+            try:
+                listener()
+            except Exception as e:
+                self.logger.error("Error in collection write listener: %s", e)
     
     def _init_client(self):
-        """Initialize ChromaDB client."""
+        """Initialize ChromaDB client (HTTP when a Chroma server is configured, else on-disk)."""
         try:
+            if config.CHROMA_SERVER_HOST:
+                # Shared server: required when the API and the arq worker both use the index
+                self.client = chromadb.HttpClient(
+                    host=config.CHROMA_SERVER_HOST,
+                    port=config.CHROMA_SERVER_PORT,
+                    settings=Settings(anonymized_telemetry=False)
+                )
+                self.logger.info(
+                    "ChromaDB HTTP client initialized for %s:%s", config.CHROMA_SERVER_HOST, config.CHROMA_SERVER_PORT
+                )
+                return
+
             # Ensure directory exists
             os.makedirs(self.db_path, exist_ok=True)
             
@@ -51,10 +89,10 @@ class ChromaService:
                     allow_reset=True
                 )
             )
-            self.logger.info(f"ChromaDB client initialized at {self.db_path}")
+            self.logger.info("ChromaDB client initialized at %s", self.db_path)
             
         except Exception as e:
-            self.logger.error(f"Error initializing ChromaDB client: {e}")
+            self.logger.error("Error initializing ChromaDB client: %s", e)
             raise
     
     def _get_or_create_collection(self):
@@ -62,7 +100,7 @@ class ChromaService:
         try:
             # Try to get existing collection
             collection = self.client.get_collection(name=self.collection_name)
-            self.logger.info(f"Using existing collection: {self.collection_name}")
+            self.logger.info("Using existing collection: %s", self.collection_name)
             return collection
             
         except Exception:
@@ -71,7 +109,7 @@ class ChromaService:
                 name=self.collection_name,
                 metadata={"description": "Topics collection for similarity search"}
             )
-            self.logger.info(f"Created new collection: {self.collection_name}")
+            self.logger.info("Created new collection: %s", self.collection_name)
             return collection
 
     def _init_embedding_provider(self):
@@ -82,7 +120,7 @@ class ChromaService:
                     raise RuntimeError("sentence-transformers is not installed")
                 self.embedding_provider = "sentence"
                 self.embedding_model = SentenceTransformer(self.embedding_model_name)
-                self.logger.info(f"Initialized SentenceTransformers model: {self.embedding_model_name}")
+                self.logger.info("Initialized SentenceTransformers model: %s", self.embedding_model_name)
             elif self.embedding_backend == "google":
                 if genai is None:
                     raise RuntimeError("google-generativeai is not installed")
@@ -91,11 +129,11 @@ class ChromaService:
                 genai.configure(api_key=config.GOOGLE_API_KEY)
                 self.embedding_provider = "google"
                 self.embedding_model = self.embedding_model_name  # model id string for genai.embed_content
-                self.logger.info(f"Initialized Google Embeddings model: {self.embedding_model_name}")
+                self.logger.info("Initialized Google Embeddings model: %s", self.embedding_model_name)
             else:
                 raise ValueError(f"Unsupported EMBEDDING_BACKEND: {self.embedding_backend}")
         except Exception as e:
-            self.logger.error(f"Error initializing embedding provider: {e}")
+            self.logger.error("Error initializing embedding provider: %s", e)
             raise
     
     def add_topic(self, topic_id: str, title: str, content: str, metadata: Dict[str, Any] = None) -> bool:
@@ -129,11 +167,12 @@ class ChromaService:
                 ids=[topic_id]
             )
             
-            self.logger.debug(f"Added topic {topic_id} to collection")
+            self._notify_write()
+            self.logger.debug("Added topic %s to collection", topic_id)
             return True
             
         except Exception as e:
-            self.logger.error(f"Error adding topic {topic_id}: {e}")
+            self.logger.error("Error adding topic %s: %s", topic_id, e)
             return False
     
     def add_topics_batch(self, topics: List[Dict[str, Any]]) -> int:
@@ -155,15 +194,15 @@ class ChromaService:
             embeddings = []
             metadatas = []
             
-            for topic in topics:
+            # Embed all contents with one backend call
+            topic_embeddings = self._create_embeddings([topic["content"] for topic in topics])
+            
+            for topic, embedding in zip(topics, topic_embeddings):
                 topic_id = str(topic["id"])
                 content = topic["content"]
                 title = topic["title"]
                 metadata = self._sanitize_metadata(topic.get("metadata", {}))
                 
-                # Create embedding
-                embedding = self._create_embedding(content)
-                
                 # Prepare metadata
                 doc_metadata = metadata.copy()
                 doc_metadata.update({
@@ -184,11 +223,12 @@ class ChromaService:
                 metadatas=metadatas
             )
             
-            self.logger.info(f"Added {len(topics)} topics to collection in batch")
+            self._notify_write()
+            self.logger.info("Added %s topics to collection in batch", len(topics))
             return len(topics)
             
         except Exception as e:
-            self.logger.error(f"Error adding topics batch: {e}")
+            self.logger.error("Error adding topics batch: %s", e)
             return 0
     
     def search_similar_topics(
@@ -219,36 +259,94 @@ class ChromaService:
                 include=["documents", "metadatas", "distances"]
             , where=where)
             
-            # Process results
-            similar_topics = []
-            for i in range(len(results["ids"][0])):
-                topic_id = results["ids"][0][i]
-                document = results["documents"][0][i]
-                metadata = results["metadatas"][0][i]
-                distance = results["distances"][0][i]
-                
-                # Convert distance to similarity score (cosine similarity)
-                similarity_score = 1 - distance
-                
-                # Apply threshold if specified
-                if similarity_threshold and similarity_score < similarity_threshold:
-                    continue
-                
-                similar_topic = {
-                    "id": topic_id,
-                    "title": metadata.get("title", ""),
-                    "content": document,
-                    "similarity_score": similarity_score,
-                    "metadata": metadata
-                }
-                similar_topics.append(similar_topic)
-            
-            self.logger.debug(f"Found {len(similar_topics)} similar topics")
+            similar_topics = self._process_query_row(
+                ids=results["ids"][0],
+                documents=results["documents"][0],
+                metadatas=results["metadatas"][0],
+                distances=results["distances"][0],
+                similarity_threshold=similarity_threshold
+            )
+            
+            self.logger.debug("Found %s similar topics", len(similar_topics))
             return similar_topics
             
         except Exception as e:
-            self.logger.error(f"Error searching similar topics: {e}")
+            self.logger.error("Error searching similar topics: %s", e)
+            return []
+    
+    def search_similar_topics_batch(
+        self,
+        query_contents: List[str],
+        n_results: int = 10,
+        similarity_threshold: float = None,
+        where: Optional[Dict[str, Any]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Search similar topics for several queries with a single collection query.
+        
+        Args:
+            query_contents: Contents to search for (one result list per entry)
+            n_results: Maximum number of results per query
+            similarity_threshold: Minimum similarity score (optional)
+            where: Metadata filter shared by all queries
+            
+        Returns:
+            List of similar-topic lists, aligned with query_contents
+        
+        Raises:
+            Exception: Propagated so callers can fall back to per-query search
+        """
+        if not query_contents:
             return []
+        
+        query_embeddings = [embedding.tolist() for embedding in self._create_embeddings(query_contents)]
+        results = self.collection.query(
+            query_embeddings=query_embeddings,
+            n_results=n_results,
+            include=["documents", "metadatas", "distances"],
+            where=where
+        )
+        
+        batch_results = [
+            self._process_query_row(
+                ids=results["ids"][row],
+                documents=results["documents"][row],
+                metadatas=results["metadatas"][row],
+                distances=results["distances"][row],
+                similarity_threshold=similarity_threshold
+            )
+            for row in range(len(query_contents))
+        ]
+        self.logger.debug("Batched similarity search for %s queries", len(query_contents))
+        return batch_results
+    
+    def _process_query_row(
+        self,
+        ids: List[str],
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        distances: List[float],
+        similarity_threshold: float = None
+    ) -> List[Dict[str, Any]]:
+        """Convert one row of Chroma query results into similar-topic dicts."""
+        # Convert distances to similarity scores and apply threshold in one vectorized pass
+        similarity_scores = 1.0 - np.asarray(distances, dtype=np.float64)
+        if similarity_threshold:
+            keep_indices = np.flatnonzero(similarity_scores >= similarity_threshold)
+        else:
+            keep_indices = np.arange(similarity_scores.shape[0])
+        
+        similar_topics = []
+        for i in keep_indices.tolist():
+            metadata = metadatas[i]
+            similar_topic = {
+                "id": ids[i],
+                "title": metadata.get("title", ""),
+                "content": documents[i],
+                "similarity_score": float(similarity_scores[i]),
+                "metadata": metadata
+            }
+            similar_topics.append(similar_topic)
+        return similar_topics
     
     def update_topic(self, topic_id: str, title: str = None, content: str = None, metadata: Dict[str, Any] = None) -> bool:
         """Update an existing topic in the collection.
@@ -297,11 +395,12 @@ class ChromaService:
                 **update_data
             )
             
-            self.logger.debug(f"Updated topic {topic_id}")
+            self._notify_write()
+            self.logger.debug("Updated topic %s", topic_id)
             return True
             
         except Exception as e:
-            self.logger.error(f"Error updating topic {topic_id}: {e}")
+            self.logger.error("Error updating topic %s: %s", topic_id, e)
             return False
     
     def delete_topic(self, topic_id: str) -> bool:
@@ -315,11 +414,12 @@ class ChromaService:
         """
         try:
             self.collection.delete(ids=[topic_id])
-            self.logger.debug(f"Deleted topic {topic_id}")
+            self._notify_write()
+            self.logger.debug("Deleted topic %s", topic_id)
             return True
             
         except Exception as e:
-            self.logger.error(f"Error deleting topic {topic_id}: {e}")
+            self.logger.error("Error deleting topic %s: %s", topic_id, e)
             return False
 
     def upsert_topic(self, topic_id: str, title: str, content: str, metadata: Dict[str, Any] = None) -> bool:
@@ -346,10 +446,11 @@ class ChromaService:
                     metadatas=[doc_metadata],
                     ids=[topic_id]
                 )
-            self.logger.debug(f"Upserted topic {topic_id} into collection")
+            self._notify_write()
+            self.logger.debug("Upserted topic %s into collection", topic_id)
             return True
         except Exception as e:
-            self.logger.error(f"Error upserting topic {topic_id}: {e}")
+            self.logger.error("Error upserting topic %s: %s", topic_id, e)
             return False
 
     def upsert_topics_batch(self, topics: List[Dict[str, Any]]) -> int:
@@ -395,7 +496,7 @@ class ChromaService:
             )
             return results
         except Exception as e:
-            self.logger.error(f"Error listing collection items: {e}")
+            self.logger.error("Error listing collection items: %s", e)
             return {"ids": [], "metadatas": [], "documents": [], "embeddings": []}
         try:
             ids: List[str] = []
@@ -423,10 +524,11 @@ class ChromaService:
             else:
                 self.collection.add(ids=ids, documents=documents, embeddings=embeddings, metadatas=metadatas)
 
-            self.logger.info(f"Upserted {len(topics)} topics to collection in batch")
+            self._notify_write()
+            self.logger.info("Upserted %s topics to collection in batch", len(topics))
             return len(topics)
         except Exception as e:
-            self.logger.error(f"Error upserting topics batch: {e}")
+            self.logger.error("Error upserting topics batch: %s", e)
             return 0
     
     def get_collection_stats(self) -> Dict[str, Any]:
@@ -440,10 +542,11 @@ class ChromaService:
             return {
                 "total_topics": count,
                 "collection_name": self.collection_name,
-                "db_path": self.db_path
+                "db_path": self.db_path,
+                "embedding_cache": self.embedding_cache.stats()
             }
         except Exception as e:
-            self.logger.error(f"Error getting collection stats: {e}")
+            self.logger.error("Error getting collection stats: %s", e)
             return {"error": str(e)}
     
     def reset_collection(self) -> bool:
@@ -462,11 +565,12 @@ class ChromaService:
                 metadata={"description": "Topics collection for similarity search"}
             )
             
-            self.logger.info(f"Reset collection: {self.collection_name}")
+            self._notify_write()
+            self.logger.info("Reset collection: %s", self.collection_name)
             return True
             
         except Exception as e:
-            self.logger.error(f"Error resetting collection: {e}")
+            self.logger.error("Error resetting collection: %s", e)
             return False
     
     def _create_embedding(self, text: str) -> np.ndarray:
@@ -484,29 +588,89 @@ class ChromaService:
             if not text:
                 text = "empty"
             
-            if self.embedding_provider == "sentence":
-                embedding = self.embedding_model.encode(text, normalize_embeddings=True)
-                return embedding
-            elif self.embedding_provider == "google":
-                # Use Google Embeddings API (text-embedding-004) which returns 768-dim
-                result = genai.embed_content(model=self.embedding_model, content=text)
-                values = result.get("embedding") or result.get("data", {}).get("embedding")
-                if values is None:
-                    raise RuntimeError("Google embedding response missing 'embedding'")
-                embedding = np.array(values, dtype=np.float32)
-                # Normalize to unit vector for cosine similarity
-                norm = np.linalg.norm(embedding)
-                if norm > 0:
-                    embedding = embedding / norm
-                return embedding
-            else:
-                raise RuntimeError("Embedding provider not initialized")
+            cache_key = self.embedding_cache.make_key(self.embedding_model_name, text)
+            cached = self.embedding_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            
+            embedding = self._compute_embedding(text)
+            self.embedding_cache.put(cache_key, embedding)
+            return embedding
             
         except Exception as e:
-            self.logger.error(f"Error creating embedding: {e}")
+            self.logger.error("Error creating embedding: %s", e)
             # Return zero embedding as fallback (use common 768 dim to fit both backends like all-mpnet-base-v2/text-embedding-004)
+            # Not cached, so the next call retries the provider
             return np.zeros(768, dtype=np.float32)
     
+    def _compute_embedding(self, text: str) -> np.ndarray:
+        """Embed already-normalized text with the configured backend (raises on failure)."""
+        if self.embedding_provider == "sentence":
+            embedding = self.embedding_model.encode(text, normalize_embeddings=True)
+            return embedding
+        elif self.embedding_provider == "google":
+            # Use Google Embeddings API (text-embedding-004) which returns 768-dim
+            result = genai.embed_content(model=self.embedding_model, content=text)
+            values = result.get("embedding") or result.get("data", {}).get("embedding")
+            if values is None:
+                raise RuntimeError("Google embedding response missing 'embedding'")
+            embedding = np.array(values, dtype=np.float32)
+            # Normalize to unit vector for cosine similarity
+            norm = np.linalg.norm(embedding)
+            if norm > 0:
+                embedding = embedding / norm
+            return embedding
+        else:
+            raise RuntimeError("Embedding provider not initialized")
+    
+    def _create_embeddings(self, texts: List[str]) -> List[np.ndarray]:
+        """Create embeddings for several texts, computing all cache misses in one backend call.
+        
+        Args:
+            texts: Texts to embed
+            
+        Returns:
+            Embeddings aligned with texts (same fallbacks as _create_embedding)
+        """
+        normalized = [text.strip() or "empty" for text in texts]
+        keys = [self.embedding_cache.make_key(self.embedding_model_name, text) for text in normalized]
+        embeddings: List[Optional[np.ndarray]] = [self.embedding_cache.get(key) for key in keys]
+        
+        # Unique texts still missing (dict keeps first-seen order)
+        missing = list(dict.fromkeys(text for text, emb in zip(normalized, embeddings) if emb is None))
+        if missing:
+            try:
+                computed = dict(zip(missing, self._compute_embeddings(missing)))
+            except Exception as e:
+                self.logger.error("Error creating batch embeddings, embedding one by one: %s", e)
+                computed = {text: self._create_embedding(text) for text in missing}
+            else:
+                for text, embedding in computed.items():
+                    self.embedding_cache.put(self.embedding_cache.make_key(self.embedding_model_name, text), embedding)
+            embeddings = [emb if emb is not None else computed[text] for text, emb in zip(normalized, embeddings)]
+        return embeddings
+    
+    def _compute_embeddings(self, texts: List[str]) -> List[np.ndarray]:
+        """Embed already-normalized texts with one backend call (raises on failure)."""
+        if self.embedding_provider == "sentence":
+            matrix = self.embedding_model.encode(texts, normalize_embeddings=True)
+        elif self.embedding_provider == "google":
+            result = genai.embed_content(model=self.embedding_model, content=texts)
+            values = result.get("embedding") or result.get("data", {}).get("embedding")
+            if values is None or len(values) != len(texts):
+                raise RuntimeError("Google batch embedding response missing 'embedding'")
+            matrix = np.asarray(values, dtype=np.float32)
+            # Normalize rows to unit vectors for cosine similarity
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix = matrix / np.where(norms > 0, norms, 1.0)
+        else:
+            raise RuntimeError("Embedding provider not initialized")
+        return [np.array(row) for row in matrix]
+    
+    def get_embedding(self, text: str) -> np.ndarray:
+        """Return the (cached) embedding for text, as used for queries."""
+        return self._create_embedding(text)
+
     def calculate_similarity(self, text1: str, text2: str) -> float:
         """Calculate cosine similarity between two texts.
         
@@ -519,8 +683,7 @@ class ChromaService:
         """
         try:
             # Create embeddings
-            embedding1 = self._create_embedding(text1)
-            embedding2 = self._create_embedding(text2)
+            embedding1, embedding2 = self._create_embeddings([text1, text2])
             
             # Calculate cosine similarity
             similarity = np.dot(embedding1, embedding2) / (
@@ -530,7 +693,7 @@ class ChromaService:
             return float(similarity)
             
         except Exception as e:
-            self.logger.error(f"Error calculating similarity: {e}")
+            self.logger.error("Error calculating similarity: %s", e)
             return 0.0
 
     def upsert_topic(self, topic_id: str, title: str, content: str, metadata: Dict[str, Any] = None) -> bool:
@@ -556,10 +719,11 @@ class ChromaService:
                     metadatas=[doc_metadata],
                     ids=[topic_id]
                 )
-            self.logger.debug(f"Upserted topic {topic_id} into collection")
+            self._notify_write()
+            self.logger.debug("Upserted topic %s into collection", topic_id)
             return True
         except Exception as e:
-            self.logger.error(f"Error upserting topic {topic_id}: {e}")
+            self.logger.error("Error upserting topic %s: %s", topic_id, e)
             return False
 
     def upsert_topics_batch(self, topics: List[Dict[str, Any]]) -> int:
@@ -567,12 +731,12 @@ class ChromaService:
             return 0
         try:
             ids, documents, embeddings, metadatas = [], [], [], []
-            for topic in topics:
+            topic_embeddings = self._create_embeddings([topic["content"] for topic in topics])
+            for topic, embedding in zip(topics, topic_embeddings):
                 topic_id = str(topic["id"])
                 content = topic["content"]
                 title = topic["title"]
                 metadata = self._sanitize_metadata(topic.get("metadata", {}))
-                embedding = self._create_embedding(content)
                 doc_metadata = metadata.copy()
                 doc_metadata.update({
                     "title": title,
@@ -592,10 +756,11 @@ class ChromaService:
                     ids=ids, documents=documents, embeddings=embeddings, metadatas=metadatas
                 )
 
-            self.logger.info(f"Upserted {len(topics)} topics to collection in batch")
+            self._notify_write()
+            self.logger.info("Upserted %s topics to collection in batch", len(topics))
             return len(topics)
         except Exception as e:
-            self.logger.error(f"Error upserting topics batch: {e}")
+            self.logger.error("Error upserting topics batch: %s", e)
             return 0
 
     def _sanitize_metadata(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
@@ -617,3 +782,12 @@ class ChromaService:
                     continue
         return sanitized
 
+
+@lru_cache(maxsize=None)
+def get_chroma_service() -> ChromaService:
+    """Get the process-wide ChromaService.
+
+    The persistent client and embedding model are created once and shared by
+    all agents and routers instead of being re-opened per instance.
+    """
+    return ChromaService()
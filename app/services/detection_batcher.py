@@ -0,0 +1,163 @@
+"""Micro-batcher for duplicate-detection similarity searches.
+
+Concurrent duplicate checks each need one ChromaDB query. Instead of issuing
+them one at a time, queries arriving within a short window are coalesced and
+sent as a single multi-vector ``collection.query`` per group of identical
+search parameters (n_results, threshold, where). Results are scattered back to
+the waiting coroutines.
+
+The batcher runs as a background task started on application startup. When it
+is not running, callers should search directly.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from app.services.chroma_service import ChromaService, get_chroma_service
+from config import config
+import asyncio
+import json
+import logging
+
+# (query_content, n_results, similarity_threshold, where, future)
+_PendingSearch = Tuple[str, int, Optional[float], Optional[Dict[str, Any]], asyncio.Future]
+
+
+class DetectionBatcher:
+    """Coalesces concurrent similarity searches into batched ChromaDB queries."""
+
+    def __init__(
+        self,
+        chroma_service: Optional[ChromaService] = None,
+        window_ms: float = config.DETECTION_BATCH_WINDOW_MS,
+        max_batch_size: int = config.DETECTION_BATCH_MAX_SIZE
+    ):
+        self.logger = logging.getLogger("detection_batcher")
+        self._chroma_service = chroma_service
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def chroma_service(self) -> ChromaService:
+        if self._chroma_service is None:
+            self._chroma_service = get_chroma_service()
+        return self._chroma_service
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the background batching loop (call from app startup)."""
+        if self.is_running:
+            return
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+        self.logger.info("Detection batcher started (window=%.0fms, max=%s)", self.window * 1000, self.max_batch_size)
+
+    async def stop(self) -> None:
+        """Stop the batching loop and fail any searches still queued."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        while self._queue is not None and not self._queue.empty():
+            *_, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Detection batcher stopped"))
+        self._queue = None
+
+    async def submit(
+        self,
+        query_content: str,
+        n_results: int = 10,
+        similarity_threshold: Optional[float] = None,
+        where: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Queue a similarity search and wait for its batched result."""
+        if not self.is_running:
+            raise RuntimeError("Detection batcher is not running")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((query_content, n_results, similarity_threshold, where, future))
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch: List[_PendingSearch] = [await self._queue.get()]
+            # Items are off the queue from here on, so stop()'s drain can't reach them
+            try:
+                deadline = loop.time() + self.window
+                while len(batch) < self.max_batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+                groups: Dict[Tuple[int, Optional[float], str], List[_PendingSearch]] = {}
+                for item in batch:
+                    _, n_results, threshold, where, _ = item
+                    key = (n_results, threshold, json.dumps(where, sort_keys=True, default=str))
+                    groups.setdefault(key, []).append(item)
+
+                for items in groups.values():
+                    await self._dispatch(items)
+            except asyncio.CancelledError:
+                _fail_unresolved(batch, RuntimeError("Detection batcher stopped"))
+                raise
+            except Exception as e:
+                self.logger.error("Detection batch failed: %s", e)
+                _fail_unresolved(batch, e)
+
+    async def _dispatch(self, items: List[_PendingSearch]) -> None:
+        """Run one batched query for items sharing search parameters."""
+        _, n_results, threshold, where, _ = items[0]
+        # Identical queries (e.g. repeated "check" clicks) share one query vector
+        contents = list(dict.fromkeys(item[0] for item in items))
+        errors: Dict[str, BaseException] = {}
+        try:
+            results = await asyncio.to_thread(
+                self.chroma_service.search_similar_topics_batch,
+                contents, n_results, threshold, where
+            )
+            result_by_content = dict(zip(contents, results))
+        except Exception as e:
+            # Fall back to per-item searches so one bad batch doesn't fail every caller
+            self.logger.error("Batched similarity search failed, falling back to single queries: %s", e)
+            result_by_content = {}
+            for content in contents:
+                try:
+                    result_by_content[content] = await asyncio.to_thread(
+                        self.chroma_service.search_similar_topics,
+                        content, n_results, threshold, where
+                    )
+                except Exception as item_error:
+                    errors[content] = item_error
+
+        for item in items:
+            future = item[4]
+            if future.done():
+                continue
+            if item[0] in errors:
+                future.set_exception(errors[item[0]])
+            else:
+                # Copy so callers sharing a query never see each other's mutations
+                future.set_result([dict(topic) for topic in result_by_content[item[0]]])
+
+
+def _fail_unresolved(batch: List[_PendingSearch], error: BaseException) -> None:
+    """Fail every future in batch that has not been resolved yet."""
+    for *_, future in batch:
+        if not future.done():
+            future.set_exception(error)
+
+
+# Shared batcher instance
+detection_batcher = DetectionBatcher()
@@ -0,0 +1,89 @@
+"""In-process TTL cache for duplicate-check responses.
+
+Identical duplicate-check requests (same normalized content and search
+parameters) within the TTL are answered without calling the detection or
+modification agents. The cache is cleared whenever the ChromaDB collection is
+written to, so results never outlive the index they were computed against.
+
+Identical requests that arrive while the first is still running are coalesced:
+they await the in-flight computation instead of starting their own.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+from cachetools import TTLCache
+from config import config
+import asyncio
+import hashlib
+import threading
+
+_KEY_PREFIX = "dup:v1:"
+
+_cache: TTLCache = TTLCache(maxsize=config.DUPLICATE_CACHE_MAXSIZE, ttl=config.DUPLICATE_CACHE_TTL)
+_lock = threading.Lock()
+_inflight: Dict[str, asyncio.Future] = {}
+
+
+def make_key(parts: Iterable[Any]) -> str:
+    """Build a stable cache key from request parts.
+
+    Text parts are stripped and lowercased; parts are joined with NUL so field
+    boundaries cannot collide.
+    """
+    normalized = "\x00".join(
+        "" if part is None else str(part).strip().lower() for part in parts
+    )
+    digest = hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+    return f"{_KEY_PREFIX}{digest}"
+
+
+def lookup(key: str) -> Optional[Dict[str, Any]]:
+    """Return the cached response for key, or None."""
+    with _lock:
+        return _cache.get(key)
+
+
+def store(key: str, value: Dict[str, Any]) -> None:
+    """Cache a response."""
+    with _lock:
+        _cache[key] = value
+
+
+def clear() -> None:
+    """Drop all cached responses (called on index writes)."""
+    with _lock:
+        _cache.clear()
+
+
+async def coalesce(key: str, compute: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+    """Run compute once for concurrent callers sharing key.
+
+    The first caller runs compute; callers arriving before it finishes await the
+    same result (or exception). If the first caller is cancelled, waiters run
+    compute themselves.
+    """
+    future = _inflight.get(key)
+    if future is not None:
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                raise
+        return await compute()
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        result = await compute()
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except BaseException as e:
+        future.set_exception(e)
+        # Mark retrieved so a failure with no waiters is not logged as unhandled
+        future.exception()
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        _inflight.pop(key, None)
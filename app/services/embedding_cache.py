@@ -0,0 +1,61 @@
+"""LRU cache of text embeddings keyed by content hash.
+
+Users frequently re-check the same topic, so identical texts are embedded
+once per process. Keys are blake2b digests of the model name and text, so the
+cache holds only 16-byte keys plus the vectors.
+"""
+
+from typing import Any, Dict, Optional
+from cachetools import LRUCache
+import hashlib
+import threading
+import numpy as np
+
+
+class EmbeddingCache:
+    """Thread-safe LRU cache of embedding vectors with hit/miss counters."""
+
+    def __init__(self, maxsize: int = 4096):
+        self._cache: LRUCache = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model_name: str, text: str) -> bytes:
+        """Hash model name and text into a compact cache key."""
+        h = hashlib.blake2b(digest_size=16)
+        h.update(model_name.encode("utf-8"))
+        h.update(b"\x00")
+        h.update(text.encode("utf-8"))
+        return h.digest()
+
+    def get(self, key: bytes) -> Optional[np.ndarray]:
+        with self._lock:
+            embedding = self._cache.get(key)
+            if embedding is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return embedding
+
+    def put(self, key: bytes, embedding: np.ndarray) -> None:
+        # Shared between callers, so make it read-only
+        embedding.setflags(write=False)
+        with self._lock:
+            self._cache[key] = embedding
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._cache),
+                "maxsize": self._cache.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0
+            }
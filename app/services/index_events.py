@@ -0,0 +1,119 @@
+"""Cross-process notification of ChromaDB index writes over Redis pub/sub.
+
+The API and the arq worker both write to the shared Chroma server. Caches that
+depend on the index (duplicate-check responses, the semantic query cache) live
+in each process and are cleared by ChromaService write listeners, which only
+see writes made in the same process. Every write is therefore also published
+on a Redis channel, and each process clears its own caches when another process
+reports a write.
+
+Without ``REDIS_URL`` (or without the ``redis`` package) publishing and
+listening are no-ops, which is correct for a single process.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+from config import config
+import asyncio
+import logging
+import uuid
+
+try:
+    import redis
+    import redis.asyncio as redis_asyncio
+except Exception:
+    redis = None  # Optional if running without Redis
+    redis_asyncio = None
+
+logger = logging.getLogger("index_events")
+
+_CHANNEL = "capbot:chroma:index-written"
+# Identifies this process so it ignores its own announcements
+_ORIGIN = uuid.uuid4().hex
+_RECONNECT_DELAY = 5.0
+
+_publisher: Optional["redis.Redis"] = None
+_remote_listeners: List[Callable[[], None]] = []
+_listener_task: Optional[asyncio.Task] = None
+
+
+def is_enabled() -> bool:
+    """Whether index writes are shared with other processes."""
+    return bool(config.REDIS_URL) and redis is not None
+
+
+def add_remote_listener(listener: Callable[[], None]) -> None:
+    """Register a callback invoked when another process writes to the index."""
+    if listener not in _remote_listeners:
+        _remote_listeners.append(listener)
+
+
+def publish_write() -> None:
+    """Announce an index write to other processes (blocking; call from write paths)."""
+    global _publisher
+    if not is_enabled():
+        return
+    try:
+        if _publisher is None:
+            _publisher = redis.Redis.from_url(config.REDIS_URL)
+        _publisher.publish(_CHANNEL, _ORIGIN)
+    except Exception as e:
+        logger.error("Error publishing index write: %s", e)
+
+
+def _handle_message(message: Dict[str, Any]) -> None:
+    """Run the remote listeners for another process's write announcement."""
+    if message.get("type") != "message":
+        return
+    origin = message.get("data")
+    if isinstance(origin, bytes):
+        origin = origin.decode("utf-8", "replace")
+    if origin == _ORIGIN:
+        return
+    for listener in _remote_listeners:
+        try:
+            listener()
+        except Exception as e:
+            logger.error("Error in remote index write listener: %s", e)
+
+
+async def _listen() -> None:
+    while True:
+        client = redis_asyncio.from_url(config.REDIS_URL)
+        try:
+            async with client.pubsub() as pubsub:
+                await pubsub.subscribe(_CHANNEL)
+                async for message in pubsub.listen():
+                    _handle_message(message)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("Index write subscription lost, reconnecting: %s", e)
+            # A write may have been missed while disconnected
+            _handle_message({"type": "message", "data": None})
+            await asyncio.sleep(_RECONNECT_DELAY)
+        finally:
+            await client.aclose()
+
+
+def start_listener() -> None:
+    """Subscribe to other processes' index writes (call from app startup)."""
+    global _listener_task
+    if not is_enabled() or (_listener_task is not None and not _listener_task.done()):
+        return
+    _listener_task = asyncio.create_task(_listen())
+    logger.info("Listening for index writes on %s", _CHANNEL)
+
+
+async def stop_listener() -> None:
+    """Stop the subscription and close the publisher (call from app shutdown)."""
+    global _listener_task, _publisher
+    if _listener_task is not None:
+        _listener_task.cancel()
+        try:
+            await _listener_task
+        except asyncio.CancelledError:
+            pass
+        _listener_task = None
+    if _publisher is not None:
+        _publisher.close()
+        _publisher = None
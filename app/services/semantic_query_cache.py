@@ -0,0 +1,168 @@
+"""Semantic cache of duplicate-detection results keyed by query embedding.
+
+Users often resubmit a topic with small wording changes. A near-identical
+query (cosine similarity >= tau) within the same search bucket (semester
+filter, threshold, ...) reuses the earlier result instead of running another
+vector search. Entries expire after a TTL, the least recently used entry is
+evicted when full, and the cache is cleared whenever the index is written to.
+
+Vectors live in one float32 matrix that grows on demand up to maxsize, so a
+lookup is a single matrix-vector product over the live entries of the bucket.
+
+A hit returns another query's verdict, so the cache is off unless
+SEMANTIC_CACHE_MAXSIZE is set. All agents share the module-level instance.
+"""
+
+from typing import Any, Dict, Hashable, List, Optional
+import copy
+import threading
+import time
+import numpy as np
+from config import config
+
+# Slots allocated on the first put; capacity then doubles up to maxsize
+_INITIAL_CAPACITY = 64
+
+
+class SemanticQueryCache:
+    """Thread-safe brute-force inner-product cache over L2-normalized embeddings."""
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 300, tau: float = 0.97):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.tau = tau
+        self._lock = threading.Lock()
+        self._vectors: Optional[np.ndarray] = None  # allocated on first put (dim unknown until then)
+        self._buckets = np.empty(0, dtype=np.int64)
+        self._expires = np.empty(0, dtype=np.float64)
+        self._last_used = np.empty(0, dtype=np.float64)
+        self._values: List[Optional[Dict[str, Any]]] = []
+        self._bucket_ids: Dict[Hashable, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    @staticmethod
+    def _normalize(embedding: np.ndarray) -> Optional[np.ndarray]:
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(vector))
+        if norm == 0.0:
+            # Zero vectors come from failed embeddings; never cache or match them
+            return None
+        return vector / norm
+
+    def lookup(self, embedding: np.ndarray, bucket: Hashable) -> Optional[Dict[str, Any]]:
+        """Return a copy of the best cached value in bucket with similarity >= tau, or None."""
+        if not self.enabled:
+            return None
+        query = self._normalize(embedding)
+        with self._lock:
+            bucket_id = self._bucket_ids.get(bucket)
+            if (
+                query is None or bucket_id is None or self._vectors is None
+                or self._vectors.shape[1] != query.shape[0]
+            ):
+                self.misses += 1
+                return None
+
+            now = time.monotonic()
+            slots = np.flatnonzero((self._buckets == bucket_id) & (self._expires > now))
+            if slots.size == 0:
+                self.misses += 1
+                return None
+
+            scores = self._vectors[slots] @ query
+            best = int(np.argmax(scores))
+            if scores[best] < self.tau:
+                self.misses += 1
+                return None
+
+            slot = int(slots[best])
+            self._last_used[slot] = now
+            self.hits += 1
+            value = self._values[slot]
+        # Callers mutate results (processing_time etc.), so hand out a copy
+        return copy.deepcopy(value)
+
+    def put(self, embedding: np.ndarray, bucket: Hashable, value: Dict[str, Any]) -> None:
+        """Store value for the embedding in bucket, evicting expired or LRU entries when full."""
+        if not self.enabled:
+            return
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+        value = copy.deepcopy(value)
+        with self._lock:
+            if self._vectors is None or self._vectors.shape[1] != vector.shape[0]:
+                self._reset(vector.shape[0])
+            now = time.monotonic()
+            free = np.flatnonzero((self._buckets < 0) | (self._expires <= now))
+            if free.size:
+                slot = int(free[0])
+            elif len(self._values) < self.maxsize:
+                slot = self._grow()
+            else:
+                slot = int(np.argmin(self._last_used))
+
+            bucket_id = self._bucket_ids.setdefault(bucket, len(self._bucket_ids))
+            self._vectors[slot] = vector
+            self._buckets[slot] = bucket_id
+            self._expires[slot] = now + self.ttl
+            self._last_used[slot] = now
+            self._values[slot] = value
+
+    def _reset(self, dim: int) -> None:
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._buckets = np.empty(0, dtype=np.int64)
+        self._expires = np.empty(0, dtype=np.float64)
+        self._last_used = np.empty(0, dtype=np.float64)
+        self._values = []
+        self._bucket_ids.clear()
+
+    def _grow(self) -> int:
+        """Double capacity (capped at maxsize) and return the first new slot."""
+        size = len(self._values)
+        extra = min(self.maxsize, max(_INITIAL_CAPACITY, size * 2)) - size
+        self._vectors = np.concatenate(
+            (self._vectors, np.zeros((extra, self._vectors.shape[1]), dtype=np.float32))
+        )
+        self._buckets = np.concatenate((self._buckets, np.full(extra, -1, dtype=np.int64)))
+        self._expires = np.concatenate((self._expires, np.zeros(extra, dtype=np.float64)))
+        self._last_used = np.concatenate((self._last_used, np.zeros(extra, dtype=np.float64)))
+        self._values.extend([None] * extra)
+        return size
+
+    def _clear_entries(self) -> None:
+        self._buckets.fill(-1)
+        self._expires.fill(0.0)
+        self._last_used.fill(0.0)
+        self._values = [None] * len(self._values)
+        self._bucket_ids.clear()
+
+    def clear(self) -> None:
+        """Drop all entries (called on index writes)."""
+        with self._lock:
+            self._clear_entries()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": int(np.count_nonzero(self._buckets >= 0)),
+                "maxsize": self.maxsize,
+                "tau": self.tau,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0
+            }
+
+
+# Shared instance; every DuplicateDetectionAgent uses this one
+semantic_query_cache = SemanticQueryCache(
+    maxsize=config.SEMANTIC_CACHE_MAXSIZE,
+    ttl=config.SEMANTIC_CACHE_TTL,
+    tau=config.SEMANTIC_CACHE_THRESHOLD
+)
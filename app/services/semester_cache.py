@@ -0,0 +1,215 @@
+"""In-process cache of the semester list used to scope duplicate searches.
+
+Semesters change a few times a year, yet every duplicate check needs the base
+semester and the N semesters before it. The full list (ordered by StartDate
+descending) is cached with a TTL and the window is resolved in Python.
+
+This service never writes semesters (they are managed outside it), so there is
+no write path to invalidate from; the background refresher bounds staleness to
+SEMESTER_REFRESH_INTERVAL.
+"""
+
+from itertools import islice
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from datetime import datetime
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import desc, select
+from app.models.database import SessionScoped, AsyncSessionLocal, Semester
+from config import config
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger("semester_cache")
+
+
+class SemesterRow(NamedTuple):
+    """Minimal semester data needed for window resolution."""
+    Id: int
+    StartDate: Optional[datetime]
+    EndDate: Optional[datetime]
+
+
+class SemesterSnapshot(NamedTuple):
+    """Semesters ordered by StartDate descending plus an Id -> position index."""
+    ordered: List[SemesterRow]
+    id_to_pos: Dict[int, int]
+
+
+def _build_snapshot(ordered: List[SemesterRow]) -> SemesterSnapshot:
+    return SemesterSnapshot(ordered, {s.Id: i for i, s in enumerate(ordered)})
+
+
+_SEMESTER_CACHE = {"ts": 0.0, "snapshot": _build_snapshot([])}
+# Resolved windows for the current snapshot: (base_id, last_n, minute) -> ids
+_resolved: Dict[Tuple[Optional[int], int, int], Tuple[int, ...]] = {}
+_RESOLVED_MAXSIZE = 512
+_lock = asyncio.Lock()
+_refresh_task: Optional[asyncio.Task] = None
+
+# One round-trip, only the columns window resolution needs (no ORM entities)
+_SEMESTER_ROWS_STMT = (
+    select(Semester.Id, Semester.StartDate, Semester.EndDate)
+    .order_by(desc(Semester.StartDate))
+)
+
+
+def _load_semesters() -> List[SemesterRow]:
+    """Load all semesters ordered by StartDate descending."""
+    db = SessionScoped()
+    try:
+        return [SemesterRow(*row) for row in db.execute(_SEMESTER_ROWS_STMT).all()]
+    finally:
+        SessionScoped.remove()
+
+
+async def _load_semesters_async() -> List[SemesterRow]:
+    """Load all semesters ordered by StartDate descending using the async engine."""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(_SEMESTER_ROWS_STMT)
+        return [SemesterRow(*row) for row in result.all()]
+
+
+async def _load() -> List[SemesterRow]:
+    """Load semesters with the async engine when configured, else in the threadpool."""
+    if AsyncSessionLocal is not None:
+        return await _load_semesters_async()
+    return await run_in_threadpool(_load_semesters)
+
+
+def _is_fresh(ttl: float) -> bool:
+    return bool(_SEMESTER_CACHE["ts"]) and (time.monotonic() - _SEMESTER_CACHE["ts"]) < ttl
+
+
+async def _reload() -> None:
+    snapshot = _build_snapshot(await _load())
+    _SEMESTER_CACHE["snapshot"] = snapshot
+    _SEMESTER_CACHE["ts"] = time.monotonic()
+    _resolved.clear()
+    logger.info("Loaded %s semesters into cache", len(snapshot.ordered))
+
+
+async def get_semesters_cached(ttl: float = config.SEMESTER_CACHE_TTL) -> SemesterSnapshot:
+    """Return the cached semester snapshot, reloading it when older than ttl."""
+    if _is_fresh(ttl):
+        return _SEMESTER_CACHE["snapshot"]
+    async with _lock:
+        # Another request may have refreshed while we waited
+        if not _is_fresh(ttl):
+            await _reload()
+    return _SEMESTER_CACHE["snapshot"]
+
+
+async def refresh() -> None:
+    """Reload the semester list now (startup warm-up and periodic refresh)."""
+    async with _lock:
+        await _reload()
+
+
+async def _refresh_loop(interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await refresh()
+        except Exception as e:
+            logger.error("Error refreshing semester cache: %s", e)
+
+
+async def start_refresher(interval: float = config.SEMESTER_REFRESH_INTERVAL) -> None:
+    """Warm the cache and keep it refreshed in the background (called on app startup).
+
+    Requests then never wait on a semester reload; the TTL path only applies
+    if the refresher stops or the warm-up failed.
+    """
+    global _refresh_task
+    try:
+        await refresh()
+    except Exception as e:
+        # Don't block startup on the DB; requests will load on demand
+        logger.error("Error warming semester cache: %s", e)
+    if _refresh_task is None or _refresh_task.done():
+        _refresh_task = asyncio.create_task(_refresh_loop(interval))
+
+
+async def stop_refresher() -> None:
+    """Stop the background refresh task (called on app shutdown)."""
+    global _refresh_task
+    if _refresh_task is not None:
+        _refresh_task.cancel()
+        try:
+            await _refresh_task
+        except asyncio.CancelledError:
+            pass
+        _refresh_task = None
+
+
+def resolve_semester_ids(
+    snapshot: SemesterSnapshot,
+    base_semester_id: Optional[int],
+    last_n_semesters: int,
+    now: Optional[datetime] = None
+) -> List[int]:
+    """Resolve the base semester (by id, else current by date) and return it plus the previous N-1 semester ids.
+
+    Args:
+        snapshot: Cached semesters (ordered by StartDate descending) with Id index
+        base_semester_id: Explicit base semester, if any
+        last_n_semesters: Number of semesters to include
+        now: Reference time for current-semester detection (defaults to utcnow)
+
+    Returns:
+        Semester ids, newest first
+    """
+    ordered = snapshot.ordered
+    now = now or datetime.utcnow()
+
+    # Resolve base semester by id or current date
+    base_pos = snapshot.id_to_pos.get(base_semester_id) if base_semester_id is not None else None
+    if base_pos is None:
+        base_pos = next(
+            (
+                i for i, s in enumerate(ordered)
+                if s.StartDate is not None and s.EndDate is not None
+                and s.StartDate <= now <= s.EndDate
+            ),
+            None
+        )
+
+    if base_pos is not None:
+        cutoff = ordered[base_pos].StartDate
+        if cutoff is None:
+            return []
+        # Include semesters sharing the base StartDate that sort ahead of it
+        start_idx = base_pos
+        while start_idx > 0 and ordered[start_idx - 1].StartDate == cutoff:
+            start_idx -= 1
+    else:
+        # Fallback: latest N by StartDate up to now
+        start_idx = next(
+            (i for i, s in enumerate(ordered) if s.StartDate is not None and s.StartDate <= now),
+            len(ordered)
+        )
+
+    return [
+        s.Id for s in islice(
+            (s for s in islice(ordered, start_idx, None) if s.StartDate is not None),
+            last_n_semesters
+        )
+    ]
+
+
+async def get_semester_ids(base_semester_id: Optional[int], last_n_semesters: int) -> List[int]:
+    """Resolve the semester window against the cached snapshot, memoizing the result.
+
+    Results are kept per snapshot and per minute (the "current semester"
+    fallback depends on the clock), so repeated checks skip the scan.
+    """
+    snapshot = await get_semesters_cached()
+    key = (base_semester_id, last_n_semesters, int(time.time() // 60))
+    ids = _resolved.get(key)
+    if ids is None:
+        if len(_resolved) >= _RESOLVED_MAXSIZE:
+            _resolved.clear()
+        ids = tuple(resolve_semester_ids(snapshot, base_semester_id, last_n_semesters))
+        _resolved[key] = ids
+    return list(ids)
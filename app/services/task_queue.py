@@ -0,0 +1,100 @@
+"""Background job queue backed by Redis (arq).
+
+Long-running jobs such as ChromaDB initialization are pushed to a Redis queue
+so they survive API worker restarts and can run on a dedicated worker:
+
+    arq app.services.task_queue.WorkerSettings
+
+The worker writes the index, so both processes must use one Chroma server
+(``CHROMA_SERVER_HOST``); an on-disk Chroma directory cannot be shared between
+processes. If ``REDIS_URL`` or ``CHROMA_SERVER_HOST`` is not configured, or
+``arq`` is not installed, callers fall back to in-process execution.
+"""
+
+from typing import Any, Dict, Optional
+from config import config
+import logging
+
+try:
+    from arq import create_pool
+    from arq.connections import ArqRedis, RedisSettings
+except Exception:
+    create_pool = None  # Optional if running without a Redis worker
+    ArqRedis = None
+    RedisSettings = None
+
+logger = logging.getLogger("task_queue")
+
+_pool: Optional["ArqRedis"] = None
+
+
+def is_enabled() -> bool:
+    """Whether jobs can be enqueued to an external worker."""
+    return bool(config.REDIS_URL) and bool(config.CHROMA_SERVER_HOST) and create_pool is not None
+
+
+async def get_pool() -> Optional["ArqRedis"]:
+    """Get (lazily creating) the shared arq Redis pool."""
+    global _pool
+    if not is_enabled():
+        return None
+    if _pool is None:
+        _pool = await create_pool(RedisSettings.from_dsn(config.REDIS_URL))
+    return _pool
+
+
+async def close_pool() -> None:
+    """Close the shared arq Redis pool if it was opened."""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
+async def enqueue_initialize_system() -> Optional[str]:
+    """Enqueue system initialization.
+
+    Returns:
+        Job id, or None if the queue is unavailable and the caller should run
+        the job in-process.
+    """
+    try:
+        pool = await get_pool()
+        if pool is None:
+            return None
+        # Fixed job id so repeated calls do not stack duplicate initializations
+        job = await pool.enqueue_job("initialize_system", _job_id="initialize_system")
+        if job is None:
+            logger.info("System initialization already queued")
+            return "initialize_system"
+        return job.job_id
+    except Exception as e:
+        logger.error("Error enqueueing system initialization: %s", e)
+        return None
+
+
+# ---- Worker side ----
+
+async def initialize_system(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    """Worker job: index approved topics into ChromaDB."""
+    from app.services.topic_service import TopicService
+
+    return await TopicService().initialize_system()
+
+
+async def _check_shared_index(ctx: Dict[str, Any]) -> None:
+    """Refuse to start a worker that would open its own on-disk copy of the index."""
+    if not config.CHROMA_SERVER_HOST:
+        raise RuntimeError("CHROMA_SERVER_HOST is required for the worker (the API must use the same Chroma server)")
+
+
+class WorkerSettings:
+    """arq worker settings."""
+
+    functions = [initialize_system]
+    on_startup = _check_shared_index
+    redis_settings = RedisSettings.from_dsn(config.REDIS_URL) if (RedisSettings and config.REDIS_URL) else None
+    max_tries = 3
+    job_timeout = 3600
+    # Do not retain results so the fixed job id can be re-enqueued once done
+    keep_result = 0
@@ -1,25 +1,73 @@
 """Service layer for topic-related business logic."""
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from cachetools import TTLCache
+from functools import lru_cache
 from sqlalchemy.orm import Session
-from app.models.database import get_db
+from app.models.database import SessionLocal, get_db
 from app.repositories.topic_repository import TopicRepository
 from app.agents.main_agent import MainAgent
 from app.agents.check_rubric_agent import CheckRubricAgent
 from app.schemas.schemas import (
     TopicRequest, TopicResponse, TopicVersionRequest, TopicVersionResponse,
-    AgentProcessRequest, DuplicateCheckResult, TopicSuggestionsResponse,
+    TopicVersionListItem, TopicVersionSummaryResponse, AgentProcessRequest, DuplicateCheckResult, TopicSuggestionsResponse,
     RubricEvaluationRequest
 )
+from config import config
+from datetime import datetime
 import logging
+import orjson
+import threading
+
+# Approved versions are read repeatedly by duplicate detection and change only on
+# approve/reject/create, which clear both caches
+_approved_version_cache: TTLCache = TTLCache(
+    maxsize=config.APPROVED_VERSION_CACHE_MAXSIZE, ttl=config.APPROVED_VERSION_CACHE_TTL
+)
+_approved_list_cache: TTLCache = TTLCache(
+    maxsize=config.APPROVED_VERSION_CACHE_MAXSIZE, ttl=config.APPROVED_VERSION_CACHE_TTL
+)
+_approved_cache_lock = threading.Lock()
+
+
+def _invalidate_approved_versions() -> None:
+    with _approved_cache_lock:
+        _approved_version_cache.clear()
+        _approved_list_cache.clear()
+
+
+# Agents are process-wide so a request-scoped TopicService stays cheap to build
+@lru_cache(maxsize=1)
+def _get_main_agent() -> MainAgent:
+    return MainAgent()
+
+
+@lru_cache(maxsize=1)
+def _get_rubric_agent() -> CheckRubricAgent:
+    return CheckRubricAgent()
+
 
 class TopicService:
-    """Service layer for topic operations."""
+    """Service layer for topic operations.
+
+    Pass db to bind the service to one request's session (see version_router);
+    without it every call opens and closes its own session.
+    """
     
-    def __init__(self):
+    def __init__(self, db: Optional[Session] = None):
         self.logger = logging.getLogger("topic_service")
-        self.main_agent = MainAgent()
-        self.rubric_agent = CheckRubricAgent()
+        self.db = db
+        self.main_agent = _get_main_agent()
+        self.rubric_agent = _get_rubric_agent()
+
+    def _open_session(self) -> Session:
+        """The injected request session, or a new one the caller must release."""
+        return self.db if self.db is not None else SessionLocal()
+
+    def _release_session(self, db: Session) -> None:
+        """Close db unless it is the injected session (its dependency closes it)."""
+        if db is not self.db:
+            db.close()
     
     async def submit_topic_with_ai_support(
         self,
@@ -40,7 +88,7 @@ class TopicService:
             Complete processing result
         """
         try:
-            self.logger.info(f"Submitting topic with AI support: {topic_request.title}")
+            self.logger.info("Submitting topic with AI support: %s", topic_request.title)
             
             # Prepare agent process request
             agent_request = AgentProcessRequest(
@@ -53,11 +101,11 @@ class TopicService:
             # Process through main agent
             result = await self.main_agent.process(agent_request.dict())
             
-            self.logger.info(f"Topic submission processed: {result.get('success', False)}")
+            self.logger.info("Topic submission processed: %s", result.get('success', False))
             return result
             
         except Exception as e:
-            self.logger.error(f"Error in submit_topic_with_ai_support: {e}")
+            self.logger.error("Error in submit_topic_with_ai_support: %s", e)
             return {
                 "success": False,
                 "error": str(e),
@@ -74,7 +122,7 @@ class TopicService:
             Duplicate check results
         """
         try:
-            self.logger.info(f"Checking duplicates for topic: {topic_request.title}")
+            self.logger.info("Checking duplicates for topic: %s", topic_request.title)
             
             topic_data = {
                 "topic_title": topic_request.title,
@@ -86,11 +134,11 @@ class TopicService:
             
             result = await self.main_agent.process_duplicate_check_only(topic_data)
             
-            self.logger.info(f"Duplicate check completed: {result.get('success', False)}")
+            self.logger.info("Duplicate check completed: %s", result.get('success', False))
             return result
             
         except Exception as e:
-            self.logger.error(f"Error in check_topic_duplicates: {e}")
+            self.logger.error("Error in check_topic_duplicates: %s", e)
             return {
                 "success": False,
                 "error": str(e)
@@ -118,7 +166,7 @@ class TopicService:
             Topic suggestions based on trends
         """
         try:
-            self.logger.info(f"Getting trending suggestions for semester: {semester_id}")
+            self.logger.info("Getting trending suggestions for semester: %s", semester_id)
             
             suggestion_data = {
                 "semester_id": semester_id,
@@ -131,11 +179,11 @@ class TopicService:
             
             result = await self.main_agent.process_suggestion_only(suggestion_data)
             
-            self.logger.info(f"Suggestions generated: {result.get('success', False)}")
+            self.logger.info("Suggestions generated: %s", result.get('success', False))
             return result
             
         except Exception as e:
-            self.logger.error(f"Error in get_trending_suggestions: {e}")
+            self.logger.error("Error in get_trending_suggestions: %s", e)
             return {
                 "success": False,
                 "error": str(e)
@@ -158,10 +206,10 @@ class TopicService:
             Modified topic suggestions
         """
         try:
-            self.logger.info(f"Modifying topic for uniqueness: {topic_request.title}")
+            self.logger.info("Modifying topic for uniqueness: %s", topic_request.title)
             
             modification_data = {
-                "original_topic": topic_request.dict(),
+                "original_topic": topic_request.model_dump(exclude_none=True),
                 "duplicate_results": duplicate_results,
                 "modification_preferences": {},
                 "preserve_core_idea": preserve_core_idea
@@ -169,11 +217,11 @@ class TopicService:
             
             result = await self.main_agent.process_modification_only(modification_data)
             
-            self.logger.info(f"Topic modification completed: {result.get('success', False)}")
+            self.logger.info("Topic modification completed: %s", result.get('success', False))
             return result
             
         except Exception as e:
-            self.logger.error(f"Error in modify_topic_for_uniqueness: {e}")
+            self.logger.error("Error in modify_topic_for_uniqueness: %s", e)
             return {
                 "success": False,
                 "error": str(e)
@@ -183,10 +231,10 @@ class TopicService:
         """Evaluate a topic proposal using the rubric agent."""
         try:
             self.logger.info("Evaluating topic rubric")
-            result = await self.rubric_agent.process(req.dict())
+            result = await self.rubric_agent.process(req)
             return result
         except Exception as e:
-            self.logger.error(f"Error in evaluate_topic_rubric: {e}")
+            self.logger.error("Error in evaluate_topic_rubric: %s", e)
             return {"success": False, "error": str(e)}
     
     def create_topic_simple(self, topic_request: TopicRequest) -> Dict[str, Any]:
@@ -199,11 +247,10 @@ class TopicService:
             Creation result
         """
         try:
-            self.logger.info(f"Creating topic simple: {topic_request.title}")
+            self.logger.info("Creating topic simple: %s", topic_request.title)
             
             # Get database session
-            db_gen = get_db()
-            db: Session = next(db_gen)
+            db: Session = self._open_session()
             
             try:
                 repository = TopicRepository(db)
@@ -234,7 +281,7 @@ class TopicService:
                     created_at=topic.CreatedAt
                 )
                 
-                self.logger.info(f"Topic created successfully: {topic.Id}")
+                self.logger.info("Topic created successfully: %s", topic.Id)
                 
                 return {
                     "success": True,
@@ -245,10 +292,46 @@ class TopicService:
                 }
                 
             finally:
-                db.close()
+                self._release_session(db)
+                
+        except Exception as e:
+            self.logger.error("Error in create_topic_simple: %s", e)
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    def bulk_create_topics(self, topic_requests: List[TopicRequest], batch_size: int = 250) -> Dict[str, Any]:
+        """Create many topics (with their initial versions) in one transaction.
+        
+        Intended for imports: the per-topic duplicate title check is skipped.
+        
+        Args:
+            topic_requests: Topics to create
+            batch_size: Rows per INSERT statement
+            
+        Returns:
+            Creation result with the new topic IDs in request order
+        """
+        try:
+            self.logger.info("Bulk creating %s topics", len(topic_requests))
+            
+            db: Session = self._open_session()
+            
+            try:
+                repository = TopicRepository(db)
+                topic_ids = repository.bulk_create_topics(topic_requests, batch_size)
+                
+                return {
+                    "success": True,
+                    "data": {"topic_ids": topic_ids}
+                }
+                
+            finally:
+                self._release_session(db)
                 
         except Exception as e:
-            self.logger.error(f"Error in create_topic_simple: {e}")
+            self.logger.error("Error in bulk_create_topics: %s", e)
             return {
                 "success": False,
                 "error": str(e)
@@ -265,8 +348,7 @@ class TopicService:
         """
         try:
             # Get database session
-            db_gen = get_db()
-            db: Session = next(db_gen)
+            db: Session = self._open_session()
             
             try:
                 repository = TopicRepository(db)
@@ -291,57 +373,74 @@ class TopicService:
                 )
                 
             finally:
-                db.close()
+                self._release_session(db)
                 
         except Exception as e:
-            self.logger.error(f"Error getting topic {topic_id}: {e}")
+            self.logger.error("Error getting topic %s: %s", topic_id, e)
             return None
     
-    def get_topics_by_semester(self, semester_id: int, limit: int = 100, approved_only: bool = False) -> List[TopicResponse]:
+    def get_topics_by_semester(
+        self,
+        semester_id: int,
+        limit: int = 100,
+        approved_only: bool = False,
+        after_id: Optional[int] = None,
+        include_versions: bool = False
+    ) -> List[TopicResponse]:
         """Get topics by semester.
         
         Args:
             semester_id: Semester ID
             limit: Maximum number of topics to return
             approved_only: Whether to return only approved topics
+            after_id: Cursor; return only topics with Id greater than this
+            include_versions: Also fill latest_version/approved_version (one extra query for the page)
             
         Returns:
-            List of topics
+            List of topics ordered by Id
         """
         try:
             # Get database session
-            db_gen = get_db()
-            db: Session = next(db_gen)
+            db: Session = self._open_session()
             
             try:
                 repository = TopicRepository(db)
-                topics = repository.get_topics_by_semester(semester_id, limit, approved_only)
+                topics = repository.get_topics_by_semester(semester_id, limit, approved_only, after_id)
+                versions = (
+                    repository.get_latest_and_approved_versions_for([topic.Id for topic in topics])
+                    if include_versions else {}
+                )
                 
                 return [
-                    TopicResponse(
-                        id=topic.Id,
-                        title=topic.Title,
-                        eN_Title=topic.Title,
-                        abbreviation=getattr(topic, "Abbreviation", None),
-                        description=topic.Description,
-                        objectives=topic.Objectives,
-                        supervisor_id=topic.SupervisorId,
-                        category_id=topic.CategoryId,
-                        semester_id=topic.SemesterId,
-                        max_students=topic.MaxStudents,
-                        is_approved=topic.IsApproved,
-                        created_at=topic.CreatedAt
-                    )
+                    self._topic_response(topic, *versions.get(topic.Id, (None, None)))
                     for topic in topics
                 ]
                 
             finally:
-                db.close()
+                self._release_session(db)
                 
         except Exception as e:
-            self.logger.error(f"Error getting topics for semester {semester_id}: {e}")
+            self.logger.error("Error getting topics for semester %s: %s", semester_id, e)
             return []
     
+    def _topic_response(self, topic, latest=None, approved=None) -> TopicResponse:
+        return TopicResponse(
+            id=topic.Id,
+            title=topic.Title,
+            eN_Title=topic.Title,
+            abbreviation=getattr(topic, "Abbreviation", None),
+            description=topic.Description,
+            objectives=topic.Objectives,
+            supervisor_id=topic.SupervisorId,
+            category_id=topic.CategoryId,
+            semester_id=topic.SemesterId,
+            max_students=topic.MaxStudents,
+            is_approved=topic.IsApproved,
+            created_at=topic.CreatedAt,
+            latest_version=self._version_response(latest) if latest else None,
+            approved_version=self._version_response(approved) if approved else None
+        )
+    
     def search_topics(self, title_keywords: List[str], semester_id: Optional[int] = None) -> List[TopicResponse]:
         """Search topics by title keywords.
         
@@ -354,8 +453,7 @@ class TopicService:
         """
         try:
             # Get database session
-            db_gen = get_db()
-            db: Session = next(db_gen)
+            db: Session = self._open_session()
             
             try:
                 repository = TopicRepository(db)
@@ -380,10 +478,10 @@ class TopicService:
                 ]
                 
             finally:
-                db.close()
+                self._release_session(db)
                 
         except Exception as e:
-            self.logger.error(f"Error searching topics: {e}")
+            self.logger.error("Error searching topics: %s", e)
             return []
     
     async def initialize_system(self) -> Dict[str, Any]:
@@ -398,11 +496,11 @@ class TopicService:
             # Initialize topic index in ChromaDB
             result = await self.main_agent.initialize_topic_index()
             
-            self.logger.info(f"AI system initialization: {result.get('success', False)}")
+            self.logger.info("AI system initialization: %s", result.get('success', False))
             return result
             
         except Exception as e:
-            self.logger.error(f"Error initializing system: {e}")
+            self.logger.error("Error initializing system: %s", e)
             return {
                 "success": False,
                 "error": str(e)
@@ -417,7 +515,7 @@ class TopicService:
         try:
             return self.main_agent.get_agent_stats()
         except Exception as e:
-            self.logger.error(f"Error getting system stats: {e}")
+            self.logger.error("Error getting system stats: %s", e)
             return {"error": str(e)}
     
     # Topic Version Management Methods
@@ -425,8 +523,7 @@ class TopicService:
     def get_topic_versions(self, topic_id: int) -> List[TopicVersionResponse]:
         """Get all versions of a topic."""
         try:
-            db_gen = get_db()
-            db: Session = next(db_gen)
+            db: Session = self._open_session()
             
             try:
                 repository = TopicRepository(db)
@@ -452,17 +549,43 @@ class TopicService:
                 ]
                 
             finally:
-                db.close()
+                self._release_session(db)
                 
         except Exception as e:
-            self.logger.error(f"Error getting topic versions for topic {topic_id}: {e}")
+            self.logger.error("Error getting topic versions for topic %s: %s", topic_id, e)
+            return []
+    
+    def get_topic_version_history(self, topic_id: int) -> List[TopicVersionListItem]:
+        """Get the version history of a topic without the content columns."""
+        try:
+            db: Session = self._open_session()
+            
+            try:
+                repository = TopicRepository(db)
+                versions = repository.get_topic_version_history(topic_id)
+                
+                return [
+                    TopicVersionListItem(
+                        id=version.Id,
+                        version_number=version.VersionNumber,
+                        title=version.Title,
+                        status=version.Status,
+                        created_at=version.CreatedAt
+                    )
+                    for version in versions
+                ]
+                
+            finally:
+                self._release_session(db)
+                
+        except Exception as e:
+            self.logger.error("Error getting version history for topic %s: %s", topic_id, e)
             return []
     
     def get_latest_topic_version(self, topic_id: int) -> Optional[TopicVersionResponse]:
         """Get latest version of a topic."""
         try:
-            db_gen = get_db()
-            db: Session = next(db_gen)
+            db: Session = self._open_session()
             
             try:
                 repository = TopicRepository(db)
@@ -488,17 +611,21 @@ class TopicService:
                 )
                 
             finally:
-                db.close()
+                self._release_session(db)
                 
         except Exception as e:
-            self.logger.error(f"Error getting latest version for topic {topic_id}: {e}")
+            self.logger.error("Error getting latest version for topic %s: %s", topic_id, e)
             return None
     
     def get_approved_topic_version(self, topic_id: int) -> Optional[TopicVersionResponse]:
         """Get approved version of a topic."""
+        with _approved_cache_lock:
+            cached = _approved_version_cache.get(topic_id)
+        if cached is not None:
+            return cached
+
         try:
-            db_gen = get_db()
-            db: Session = next(db_gen)
+            db: Session = self._open_session()
             
             try:
                 repository = TopicRepository(db)
@@ -507,7 +634,7 @@ class TopicService:
                 if not version:
                     return None
                 
-                return TopicVersionResponse(
+                response = TopicVersionResponse(
                     id=version.Id,
                     topic_id=version.TopicId,
                     version_number=version.VersionNumber,
@@ -522,25 +649,69 @@ class TopicService:
                     submitted_by=version.SubmittedBy,
                     created_at=version.CreatedAt
                 )
+                with _approved_cache_lock:
+                    _approved_version_cache[topic_id] = response
+                return response
                 
             finally:
-                db.close()
+                self._release_session(db)
                 
         except Exception as e:
-            self.logger.error(f"Error getting approved version for topic {topic_id}: {e}")
+            self.logger.error("Error getting approved version for topic %s: %s", topic_id, e)
             return None
     
+    def get_topic_version_summary(self, topic_id: int) -> Optional[TopicVersionSummaryResponse]:
+        """Get the latest and approved versions of a topic with one query."""
+        try:
+            db: Session = self._open_session()
+            
+            try:
+                repository = TopicRepository(db)
+                latest, approved = repository.get_latest_and_approved_topic_versions(topic_id)
+                
+                if not latest:
+                    return None
+                
+                return TopicVersionSummaryResponse(
+                    latest=self._version_response(latest),
+                    approved=self._version_response(approved) if approved else None
+                )
+                
+            finally:
+                self._release_session(db)
+                
+        except Exception as e:
+            self.logger.error("Error getting version summary for topic %s: %s", topic_id, e)
+            return None
+    
+    @staticmethod
+    def _version_response(version) -> TopicVersionResponse:
+        return TopicVersionResponse(
+            id=version.Id,
+            topic_id=version.TopicId,
+            version_number=version.VersionNumber,
+            title=version.Title,
+            description=version.Description,
+            objectives=version.Objectives,
+            methodology=version.Methodology,
+            expected_outcomes=version.ExpectedOutcomes,
+            requirements=version.Requirements,
+            status=version.Status,
+            submitted_at=version.SubmittedAt,
+            submitted_by=version.SubmittedBy,
+            created_at=version.CreatedAt
+        )
+    
     def create_topic_version(self, topic_id: int, version_request: TopicVersionRequest) -> Optional[TopicVersionResponse]:
         """Create a new version of a topic."""
         try:
-            db_gen = get_db()
-            db: Session = next(db_gen)
+            db: Session = self._open_session()
             
             try:
                 repository = TopicRepository(db)
                 
                 # Get existing versions to determine next version number
-                existing_versions = repository.get_topic_versions_by_topic_id(topic_id)
+                existing_versions = repository.get_topic_version_history(topic_id)
                 next_version_number = len(existing_versions) + 1
                 
                 # Convert version request to topic request format
@@ -563,6 +734,8 @@ class TopicService:
                     version_number=next_version_number,
                     status=version_request.status
                 )
+                if version.Status == 4:  # Created already approved
+                    _invalidate_approved_versions()
                 
                 return TopicVersionResponse(
                     id=version.Id,
@@ -581,21 +754,42 @@ class TopicService:
                 )
                 
             finally:
-                db.close()
+                self._release_session(db)
                 
         except Exception as e:
-            self.logger.error(f"Error creating version for topic {topic_id}: {e}")
+            self.logger.error("Error creating version for topic %s: %s", topic_id, e)
             return None
     
+    def create_topic_versions(self, topic_id: int, version_requests: List[TopicVersionRequest]) -> List[TopicVersionResponse]:
+        """Create several versions of a topic in one batched insert."""
+        try:
+            db: Session = self._open_session()
+            
+            try:
+                repository = TopicRepository(db)
+                versions = repository.create_topic_versions(topic_id, version_requests)
+                
+                if any(version.Status == 4 for version in versions):  # Created already approved
+                    _invalidate_approved_versions()
+                
+                return [self._version_response(version) for version in versions]
+                
+            finally:
+                self._release_session(db)
+                
+        except Exception as e:
+            self.logger.error("Error bulk creating versions for topic %s: %s", topic_id, e)
+            return []
+    
     def approve_topic_version(self, version_id: int) -> bool:
         """Approve a topic version."""
         try:
-            db_gen = get_db()
-            db: Session = next(db_gen)
+            db: Session = self._open_session()
             
             try:
                 repository = TopicRepository(db)
                 success = repository.approve_topic_version(version_id)
+                _invalidate_approved_versions()
                 
                 # If approved, index this version in ChromaDB
                 if success:
@@ -604,44 +798,52 @@ class TopicService:
                 return success
                 
             finally:
-                db.close()
+                self._release_session(db)
                 
         except Exception as e:
-            self.logger.error(f"Error approving version {version_id}: {e}")
+            self.logger.error("Error approving version %s: %s", version_id, e)
             return False
     
     def reject_topic_version(self, version_id: int, reason: str = None) -> bool:
         """Reject a topic version."""
         try:
-            db_gen = get_db()
-            db: Session = next(db_gen)
+            db: Session = self._open_session()
             
             try:
                 repository = TopicRepository(db)
-                return repository.reject_topic_version(version_id, reason)
+                success = repository.reject_topic_version(version_id, reason)
+                # The rejected version may have been the approved one
+                _invalidate_approved_versions()
+                return success
                 
             finally:
-                db.close()
+                self._release_session(db)
                 
         except Exception as e:
-            self.logger.error(f"Error rejecting version {version_id}: {e}")
+            self.logger.error("Error rejecting version %s: %s", version_id, e)
             return False
     
-    def get_approved_topic_versions(self, semester_id: Optional[int] = None, limit: int = 100) -> List[TopicVersionResponse]:
-        """Get all approved topic versions."""
+    def get_approved_topic_versions(
+        self,
+        semester_id: Optional[int] = None,
+        limit: int = 100,
+        after: Optional[Tuple[datetime, int]] = None
+    ) -> List[TopicVersionResponse]:
+        """Get approved topic versions, newest first, starting after the (created_at, id) cursor if given."""
+        cache_key = (semester_id, limit, after)
+        with _approved_cache_lock:
+            cached = _approved_list_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+
         try:
-            db_gen = get_db()
-            db: Session = next(db_gen)
+            db: Session = self._open_session()
             
             try:
                 repository = TopicRepository(db)
-                versions_data = repository.get_approved_topic_versions(limit)
-                
-                # Filter by semester if provided
-                if semester_id:
-                    versions_data = [v for v in versions_data if v["semester_id"] == semester_id]
+                versions_data = repository.get_approved_topic_versions(limit, semester_id, after)
                 
-                return [
+                versions = [
                     TopicVersionResponse(
                         id=data["version_id"],
                         topic_id=data["topic_id"],
@@ -659,14 +861,56 @@ class TopicService:
                     )
                     for data in versions_data
                 ]
+                with _approved_cache_lock:
+                    _approved_list_cache[cache_key] = tuple(versions)
+                return versions
                 
             finally:
-                db.close()
+                self._release_session(db)
                 
         except Exception as e:
-            self.logger.error(f"Error getting approved versions: {e}")
+            self.logger.error("Error getting approved versions: %s", e)
             return []
     
+    def stream_approved_topic_versions(self, semester_id: Optional[int] = None) -> Iterator[bytes]:
+        """Yield every approved topic version as an NDJSON line without buffering the result set.
+
+        A failure mid-stream yields a final {"error": ...} line and re-raises.
+        Close the generator when the response ends so its session is released.
+        Always uses its own session: the body is sent after request dependencies are closed.
+        """
+        db_gen = get_db()
+        db: Session = next(db_gen)
+
+        try:
+            repository = TopicRepository(db)
+            for version in repository.iter_approved_topic_versions(semester_id):
+                yield orjson.dumps({
+                    "id": version.Id,
+                    "topic_id": version.TopicId,
+                    "version_number": version.VersionNumber,
+                    "title": version.Title,
+                    "description": version.Description,
+                    "objectives": version.Objectives,
+                    "methodology": version.Methodology,
+                    "expected_outcomes": version.ExpectedOutcomes,
+                    "requirements": version.Requirements,
+                    "status": version.Status,
+                    "submitted_at": version.SubmittedAt,
+                    "submitted_by": version.SubmittedBy,
+                    "created_at": version.CreatedAt
+                }, option=orjson.OPT_APPEND_NEWLINE)
+
+        except Exception as e:
+            # Headers are already sent: write a terminal error record, then re-raise so
+            # the chunked body is aborted instead of looking like a complete stream
+            self.logger.error("Error streaming approved versions: %s", e)
+            yield orjson.dumps({"error": str(e)}, option=orjson.OPT_APPEND_NEWLINE)
+            raise
+
+        finally:
+            db.close()
+    
     async def _index_approved_version(self, version_id: int):
         """Index an approved version in ChromaDB."""
         try:
@@ -741,4 +985,4 @@ class TopicService:
                 db.close()
                 
         except Exception as e:
-            self.logger.error(f"Error indexing approved version {version_id}: {e}")
+            self.logger.error("Error indexing approved version %s: %s", version_id, e)
@@ -2,17 +2,71 @@
 
 import uvicorn
 from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from app.api.endpoints import router
+from app.api import system_router
+from app.services import task_queue, semester_cache, index_events
+from app.services.detection_batcher import detection_batcher
+from app.models.database import warm_up_pool, warm_up_async_pool, dispose_engines
 from config import config
+import atexit
 import logging
+import logging.config
+import logging.handlers
+import orjson
+import queue
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+
+class JsonFormatter(logging.Formatter):
+    """Render log records as single-line JSON (LOG_FORMAT=json)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return orjson.dumps(payload).decode()
+
+
+# Configure logging once for the whole process; modules only call getLogger()
+logging.config.dictConfig({
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "text": {"format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s"},
+        "json": {"()": JsonFormatter}
+    },
+    "handlers": {
+        "console": {
+            "class": "logging.StreamHandler",
+            "formatter": "json" if config.LOG_FORMAT == "json" else "text"
+        }
+    },
+    "root": {"level": config.LOG_LEVEL, "handlers": ["console"]}
+})
+
+
+def _install_queue_logging() -> logging.handlers.QueueListener:
+    """Move root handlers behind a queue so request handlers never block on log I/O."""
+    root = logging.getLogger()
+    handlers = root.handlers[:]
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    for handler in handlers:
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+_log_listener = _install_queue_logging()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
 # Create FastAPI application
@@ -23,6 +77,7 @@ app = FastAPI(
 
     """,
     version="2.0.0",
+    default_response_class=ORJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc",
     contact={
@@ -62,7 +117,7 @@ app.include_router(router)
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Global exception handler for unhandled errors."""
-    logger.error(f"Unhandled exception: {exc}", exc_info=True)
+    logger.error("Unhandled exception on %s %s: %s", request.method, request.url.path, exc, exc_info=True)
     return JSONResponse(
         status_code=500,
         content={
@@ -82,15 +137,36 @@ async def startup_event():
         config.validate()
         logger.info("Configuration validated successfully")
     except Exception as e:
-        logger.error(f"Configuration validation failed: {e}")
+        logger.error("Configuration validation failed: %s", e)
         raise
     
+    # Open pooled DB connections up front
+    try:
+        await run_in_threadpool(warm_up_pool)
+        await warm_up_async_pool()
+    except Exception as e:
+        # Don't block startup on the DB; connections open on demand
+        logger.error("Database pool warm-up failed: %s", e)
+    
+    # Start background workers
+    system_router.start_stats_refresher()
+    detection_batcher.start()
+    await semester_cache.start_refresher()
+    # Clear index-dependent caches when the worker (or another replica) writes the index
+    index_events.start_listener()
+    
     logger.info("System startup completed")
 
 @app.on_event("shutdown") 
 async def shutdown_event():
     """Application shutdown event."""
     logger.info("Shutting down AI Agent Topic Submission System")
+    await system_router.stop_stats_refresher()
+    await detection_batcher.stop()
+    await semester_cache.stop_refresher()
+    await index_events.stop_listener()
+    await task_queue.close_pool()
+    await dispose_engines()
 
 @app.get("/")
 async def root():
@@ -0,0 +1,15 @@
+"""Test configuration.
+
+The app builds its database engine at import time, so point it at a throwaway
+SQLite file before any app module is imported. Nothing here connects unless a
+test asks for a session.
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'capbot_test.db')}")
+os.environ.setdefault("ASYNC_DATABASE_URL", "")
@@ -0,0 +1,119 @@
+"""Tests for the duplicate-detection micro-batcher."""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.services.detection_batcher import DetectionBatcher
+
+
+class FakeChroma:
+    """Records batched and single searches; optionally blocks or fails them."""
+
+    def __init__(self, batch_error=None, single_errors=(), block=None):
+        self.batch_calls = []
+        self.single_calls = []
+        self.batch_error = batch_error
+        self.single_errors = set(single_errors)
+        self.block = block
+
+    def search_similar_topics_batch(self, contents, n_results, threshold, where):
+        self.batch_calls.append(list(contents))
+        if self.block is not None:
+            self.block.wait(5)
+        if self.batch_error is not None:
+            raise self.batch_error
+        return [[{"id": content}] for content in contents]
+
+    def search_similar_topics(self, content, n_results, threshold, where):
+        self.single_calls.append(content)
+        if content in self.single_errors:
+            raise RuntimeError(f"search failed for {content}")
+        return [{"id": content}]
+
+
+def _run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 5))
+
+
+def test_concurrent_searches_share_one_batch():
+    chroma = FakeChroma()
+
+    async def scenario():
+        batcher = DetectionBatcher(chroma, window_ms=50)
+        batcher.start()
+        try:
+            return await asyncio.gather(
+                batcher.submit("a", 3, 0.8),
+                batcher.submit("b", 3, 0.8),
+                batcher.submit("a", 3, 0.8),
+            )
+        finally:
+            await batcher.stop()
+
+    results = _run(scenario())
+
+    assert results == [[{"id": "a"}], [{"id": "b"}], [{"id": "a"}]]
+    assert chroma.batch_calls == [["a", "b"]]
+    # Callers sharing a query get independent copies
+    assert results[0][0] is not results[2][0]
+
+
+def test_stop_fails_searches_in_a_running_batch():
+    release = threading.Event()
+    chroma = FakeChroma(block=release)
+
+    async def scenario():
+        batcher = DetectionBatcher(chroma, window_ms=1)
+        batcher.start()
+        pending = asyncio.ensure_future(batcher.submit("a", 3, 0.8))
+        while not chroma.batch_calls:
+            await asyncio.sleep(0.01)
+        await batcher.stop()
+        try:
+            return await pending
+        finally:
+            release.set()
+
+    with pytest.raises(RuntimeError, match="stopped"):
+        _run(scenario())
+
+
+def test_stop_fails_queued_searches():
+    async def scenario():
+        batcher = DetectionBatcher(FakeChroma(), window_ms=1000)
+        batcher.start()
+        pending = asyncio.ensure_future(batcher.submit("a", 3, 0.8))
+        await asyncio.sleep(0.05)
+        await batcher.stop()
+        return await pending
+
+    with pytest.raises(RuntimeError, match="stopped"):
+        _run(scenario())
+
+
+def test_failing_fallback_only_fails_its_own_callers():
+    chroma = FakeChroma(batch_error=RuntimeError("batch failed"), single_errors={"bad"})
+
+    async def scenario():
+        batcher = DetectionBatcher(chroma, window_ms=50)
+        batcher.start()
+        try:
+            results = await asyncio.gather(
+                batcher.submit("good", 3, 0.8),
+                batcher.submit("bad", 3, 0.8),
+                return_exceptions=True,
+            )
+            # The loop survives the failed batch
+            after = await batcher.submit("later", 3, 0.8)
+            return results, after, batcher.is_running
+        finally:
+            await batcher.stop()
+
+    (good, bad), after, running = _run(scenario())
+
+    assert good == [{"id": "good"}]
+    assert isinstance(bad, RuntimeError)
+    assert after == [{"id": "later"}]
+    assert running
@@ -0,0 +1,64 @@
+"""Tests for duplicate-check response caching and request coalescing."""
+
+import asyncio
+
+import pytest
+
+from app.services import duplicate_cache
+
+
+def _run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 5))
+
+
+def test_coalesced_callers_share_one_result():
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"status": "no_duplicate"}
+
+    async def scenario():
+        key = duplicate_cache.make_key(["share"])
+        return await asyncio.gather(*(duplicate_cache.coalesce(key, compute) for _ in range(3)))
+
+    results = _run(scenario())
+
+    assert calls == [1]
+    assert results == [{"status": "no_duplicate"}] * 3
+    assert not duplicate_cache._inflight
+
+
+def test_coalesced_callers_see_the_exception():
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        raise ValueError("detection failed")
+
+    async def scenario():
+        key = duplicate_cache.make_key(["fail"])
+        return await asyncio.gather(
+            *(duplicate_cache.coalesce(key, compute) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+    results = _run(scenario())
+
+    assert calls == [1]
+    assert all(isinstance(result, ValueError) for result in results)
+    assert not duplicate_cache._inflight
+
+
+def test_make_key_normalizes_text_parts():
+    assert duplicate_cache.make_key(["  Topic ", None]) == duplicate_cache.make_key(["topic", ""])
+    assert duplicate_cache.make_key(["a", "bc"]) != duplicate_cache.make_key(["ab", "c"])
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    duplicate_cache.clear()
+    yield
+    duplicate_cache.clear()
@@ -0,0 +1,65 @@
+"""Tests for conditional-GET (ETag) helpers and keyset cursors."""
+
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException, Response
+from starlette.requests import Request
+
+from app.api.topic_router import _etag_matches
+from app.api.version_router import _conditional_get, _decode_version_cursor, _encode_version_cursor
+from app.schemas.schemas import TopicVersionListItem, TopicVersionResponse
+
+
+def _request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match is not None else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, False),
+    ('"abc"', True),
+    ('"other"', False),
+    ('"other", "abc"', True),
+    ('"other",W/"abc"', True),
+    ('W/"abc"', True),
+    ("*", True),
+])
+def test_etag_matches(header, expected):
+    assert _etag_matches(_request(header), '"abc"') is expected
+
+
+def _version(**overrides):
+    fields = {"id": 7, "version_number": 1, "title": "Topic", "status": 4,
+              "created_at": datetime(2024, 5, 1, 12, 30, 15, 250000)}
+    fields.update(overrides)
+    return TopicVersionListItem(**fields)
+
+
+def test_conditional_get_tags_then_returns_304():
+    response = Response()
+    assert _conditional_get(_request(), response, _version()) is None
+    etag = response.headers["ETag"]
+
+    not_modified = _conditional_get(_request(f'"stale", W/{etag}'), Response(), _version())
+    assert not_modified is not None and not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == etag
+
+
+def test_conditional_get_changes_tag_with_status():
+    first, second = Response(), Response()
+    _conditional_get(_request(), first, _version(status=2))
+    _conditional_get(_request(first.headers["ETag"]), second, _version(status=4))
+    assert second.headers["ETag"] != first.headers["ETag"]
+
+
+def test_version_cursor_round_trip():
+    version = TopicVersionResponse.model_construct(id=42, created_at=datetime(2024, 5, 1, 12, 30, 15, 250000))
+    assert _decode_version_cursor(_encode_version_cursor(version)) == (version.created_at, 42)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "2024-05-01T12:30:15_x"])
+def test_invalid_version_cursor_is_a_400(cursor):
+    with pytest.raises(HTTPException) as excinfo:
+        _decode_version_cursor(cursor)
+    assert excinfo.value.status_code == 400
@@ -0,0 +1,63 @@
+"""Tests for cross-process index-write notifications and the worker queue gate."""
+
+import asyncio
+
+import pytest
+
+from app.services import index_events, task_queue
+
+
+@pytest.fixture
+def listener(monkeypatch):
+    calls = []
+    monkeypatch.setattr(index_events, "_remote_listeners", [])
+    index_events.add_remote_listener(lambda: calls.append(1))
+    return calls
+
+
+def test_other_process_write_runs_listeners(listener):
+    index_events._handle_message({"type": "message", "data": b"another-process"})
+    assert listener == [1]
+
+
+def test_own_write_is_ignored(listener):
+    index_events._handle_message({"type": "message", "data": index_events._ORIGIN.encode()})
+    index_events._handle_message({"type": "subscribe", "data": 1})
+    assert listener == []
+
+
+def test_failing_listener_does_not_stop_the_others(monkeypatch):
+    calls = []
+    monkeypatch.setattr(index_events, "_remote_listeners", [])
+
+    def broken():
+        raise RuntimeError("listener failed")
+    index_events.add_remote_listener(broken)
+    index_events.add_remote_listener(lambda: calls.append(1))
+
+    index_events._handle_message({"type": "message", "data": b"another-process"})
+    assert calls == [1]
+
+
+def test_publish_is_a_no_op_without_redis(monkeypatch):
+    monkeypatch.setattr(index_events.config, "REDIS_URL", "")
+    index_events.publish_write()
+    assert index_events._publisher is None
+
+
+@pytest.mark.parametrize("redis_url, chroma_host, expected", [
+    ("", "", False),
+    ("redis://redis:6379/0", "", False),
+    ("", "chroma", False),
+    ("redis://redis:6379/0", "chroma", True),
+])
+def test_worker_queue_needs_redis_and_a_shared_chroma_server(monkeypatch, redis_url, chroma_host, expected):
+    monkeypatch.setattr(task_queue.config, "REDIS_URL", redis_url)
+    monkeypatch.setattr(task_queue.config, "CHROMA_SERVER_HOST", chroma_host)
+    assert task_queue.is_enabled() is (expected and task_queue.create_pool is not None)
+
+
+def test_worker_refuses_to_start_without_a_chroma_server(monkeypatch):
+    monkeypatch.setattr(task_queue.config, "CHROMA_SERVER_HOST", "")
+    with pytest.raises(RuntimeError, match="CHROMA_SERVER_HOST"):
+        asyncio.run(task_queue._check_shared_index({}))
@@ -0,0 +1,33 @@
+"""Tests for semester window resolution over the cached snapshot."""
+
+from datetime import datetime
+
+from app.services.semester_cache import SemesterRow, _build_snapshot, resolve_semester_ids
+
+# Newest first, as loaded by the cache
+_SNAPSHOT = _build_snapshot([
+    SemesterRow(4, datetime(2025, 1, 1), datetime(2025, 4, 30)),
+    SemesterRow(3, datetime(2024, 9, 1), datetime(2024, 12, 31)),
+    SemesterRow(2, datetime(2024, 5, 1), datetime(2024, 8, 31)),
+    SemesterRow(1, datetime(2024, 1, 1), datetime(2024, 4, 30)),
+])
+
+
+def test_explicit_base_semester_and_previous_ones():
+    assert resolve_semester_ids(_SNAPSHOT, 3, 3) == [3, 2, 1]
+
+
+def test_current_semester_by_date():
+    assert resolve_semester_ids(_SNAPSHOT, None, 2, now=datetime(2024, 6, 15)) == [2, 1]
+
+
+def test_unknown_base_falls_back_to_current_semester():
+    assert resolve_semester_ids(_SNAPSHOT, 99, 2, now=datetime(2024, 10, 1)) == [3, 2]
+
+
+def test_between_semesters_takes_latest_started():
+    gap = _build_snapshot([
+        SemesterRow(2, datetime(2024, 9, 1), datetime(2024, 12, 31)),
+        SemesterRow(1, datetime(2024, 1, 1), datetime(2024, 4, 30)),
+    ])
+    assert resolve_semester_ids(gap, None, 3, now=datetime(2024, 6, 1)) == [1]
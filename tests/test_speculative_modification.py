@@ -0,0 +1,112 @@
+"""Tests for starting the topic modification from the duplicate-detection verdict."""
+
+import asyncio
+
+import pytest
+
+from app.agents.duplicate_detection_agent import DuplicateDetectionAgent
+from app.api import topic_router
+from app.api.topic_router import DuplicateAdvancedRequest, check_duplicate_advanced
+from app.schemas.schemas import DuplicationStatus
+from app.services import duplicate_cache, semester_cache
+
+_SIMILAR = [{"id": "1_1", "similarity_score": 0.93, "metadata": {"en_title": "Smart campus parking"}}]
+
+
+class FakeDetection:
+    """Reports a verdict through on_verdict, then spends time on 'enhanced analysis'."""
+
+    def __init__(self, status):
+        self.status = status
+        self.events = []
+
+    async def process(self, input_data):
+        verdict = {"status": self.status, "similarity_score": 0.93, "similar_topics": [{"eN_Title": "Smart campus parking"}]}
+        if input_data.get("on_verdict"):
+            input_data["on_verdict"](dict(verdict))
+        self.events.append("analysis-start")
+        await asyncio.sleep(0.05)
+        self.events.append("analysis-end")
+        return {"success": True, "data": {**verdict, "message": "done", "recommendations": []}}
+
+
+class FakeModification:
+    def __init__(self, events):
+        self.events = events
+        self.inputs = []
+
+    async def process(self, input_data):
+        self.inputs.append(input_data["duplicate_results"])
+        self.events.append("modification")
+        return {"success": True, "data": {"title": "Reworked topic"}}
+
+
+@pytest.fixture
+def agents(monkeypatch):
+    def install(status, speculative=True):
+        detection = FakeDetection(status)
+        modification = FakeModification(detection.events)
+        monkeypatch.setattr(topic_router, "get_duplicate_agent", lambda: detection)
+        monkeypatch.setattr(topic_router, "get_modification_agent", lambda: modification)
+        monkeypatch.setattr(topic_router.config, "SPECULATIVE_MODIFICATION", speculative)
+
+        async def no_semesters(*args):
+            return []
+        monkeypatch.setattr(semester_cache, "get_semester_ids", no_semesters)
+        duplicate_cache.clear()
+        return detection, modification
+    yield install
+    duplicate_cache.clear()
+
+
+def _check():
+    req = DuplicateAdvancedRequest(eN_Title="Smart parking", description="A parking assistant for the campus lots")
+    return asyncio.run(check_duplicate_advanced(req, threshold=0.8, semester_id=None, last_n_semesters=3))
+
+
+def test_modification_starts_from_the_verdict_and_is_reused(agents):
+    detection, modification = agents(DuplicationStatus.DUPLICATE_FOUND)
+
+    response = _check()
+
+    assert response["modification_proposal"] == {"title": "Reworked topic"}
+    # One modification run, grounded on the real similar topics, overlapping the analysis
+    assert len(modification.inputs) == 1
+    assert modification.inputs[0]["similar_topics"] == [{"eN_Title": "Smart campus parking"}]
+    assert detection.events.index("modification") < detection.events.index("analysis-end")
+
+
+def test_unique_topic_starts_no_modification(agents):
+    detection, modification = agents(DuplicationStatus.NO_DUPLICATE)
+
+    response = _check()
+
+    assert "modification_proposal" not in response
+    assert modification.inputs == []
+
+
+def test_without_speculation_modification_runs_after_detection(agents):
+    detection, modification = agents(DuplicationStatus.POTENTIAL_DUPLICATE, speculative=False)
+
+    response = _check()
+
+    assert response["modification_proposal"] == {"title": "Reworked topic"}
+    assert detection.events == ["analysis-start", "analysis-end", "modification"]
+
+
+def test_agent_reports_verdict_before_enhanced_analysis(monkeypatch):
+    agent = DuplicateDetectionAgent.__new__(DuplicateDetectionAgent)
+    events = []
+
+    async def enhanced(original_content, candidates):
+        events.append("analysis")
+        return ""
+    monkeypatch.setattr(agent, "_perform_enhanced_analysis", enhanced, raising=False)
+
+    result = asyncio.run(agent._analyze_similarity_results(
+        _SIMILAR, threshold=0.8, original_content="Smart parking",
+        on_verdict=lambda verdict: events.append(("verdict", verdict["status"], verdict["similar_topics"][0]["eN_Title"]))
+    ))
+
+    assert events == [("verdict", DuplicationStatus.DUPLICATE_FOUND, "Smart campus parking"), "analysis"]
+    assert result["status"] is DuplicationStatus.DUPLICATE_FOUND
@@ -0,0 +1,18 @@
+"""Tests that timestamps are stamped by the database clock inside the INSERT itself."""
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.dialects import mssql
+
+from app.models.database import Base
+
+
+@pytest.mark.parametrize("table", sorted(
+    name for name, table in Base.metadata.tables.items() if "CreatedAt" in table.c
+))
+def test_created_at_renders_inline_without_a_column_default(table):
+    # Existing tables have no DEFAULT constraint, so the INSERT must carry the value
+    sql = str(insert(Base.metadata.tables[table]).compile(dialect=mssql.dialect(), column_keys=[]))
+    columns, values = sql.split(" VALUES ", 1)
+    assert "[CreatedAt]" in columns
+    assert "GETUTCDATE()" in values